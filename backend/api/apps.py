@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class ApiConfig(AppConfig):
     name = "api"
+
+    def ready(self):
+        from . import checks  # noqa: F401
+        from .signals import register_signal_handlers
+
+        register_signal_handlers()
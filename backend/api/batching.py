@@ -0,0 +1,161 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from graphql.language import FieldNode, FragmentSpreadNode, InlineFragmentNode
+from graphql.type import GraphQLInterfaceType
+from grapple.registry import registry
+
+
+# Collection arguments that can still be served from a prefetched result cache.
+# Anything else (order, id, search_query, ...) makes grapple build a new query,
+# so prefetching that relation from the parent would be wasted work.
+CACHE_SAFE_ARGUMENTS = {"limit", "offset"}
+
+
+def to_snake_case(name):
+    """Convert a camelCase GraphQL field name back to its Python field name."""
+    return "".join(f"_{char.lower()}" if char.isupper() else char for char in name)
+
+
+@lru_cache(maxsize=None)
+def get_graphql_sources(model):
+    """
+    Map each field declared in a model's graphql_fields to the attribute it reads.
+
+    Returns:
+        dict: GraphQL field name (snake_case) -> model attribute name.
+    """
+    sources = {}
+    for field in getattr(model, "graphql_fields", []):
+        if callable(field):
+            field = field()
+        if isinstance(field, tuple):
+            field = field[0]
+            if callable(field):
+                field = field()
+        sources[field.field_name] = field.field_source
+    return sources
+
+
+def get_type_name(model):
+    node_type = registry.models.get(model)
+    return node_type._meta.name if node_type is not None else None
+
+
+def iter_selected_fields(selection_set, info, model):
+    """Yield the field nodes selected on a model, flattening fragments."""
+    if selection_set is None:
+        return
+
+    type_name = get_type_name(model)
+    for selection in selection_set.selections:
+        if isinstance(selection, FieldNode):
+            yield selection
+            continue
+
+        if isinstance(selection, FragmentSpreadNode):
+            fragment = info.fragments.get(selection.name.value)
+            if fragment is None:
+                continue
+            type_condition, nested = fragment.type_condition, fragment.selection_set
+        elif isinstance(selection, InlineFragmentNode):
+            type_condition, nested = selection.type_condition, selection.selection_set
+        else:
+            continue
+
+        if type_condition is not None:
+            condition = type_condition.name.value
+            if condition != type_name and not isinstance(
+                info.schema.get_type(condition), GraphQLInterfaceType
+            ):
+                continue
+        yield from iter_selected_fields(nested, info, model)
+
+
+def collect_prefetch_lookups(model, selection_set, info, prefix=""):
+    """
+    Walk a GraphQL selection set and return the prefetch_related() lookups
+    needed to resolve every nested relation with one query per level.
+
+    Args:
+        model: The Django model the selection set is resolved against.
+        selection_set: The GraphQL selection set for that model.
+        info: The Graphene info object (used for fragments and the schema).
+        prefix (str): The lookup path leading to this model.
+
+    Returns:
+        list: prefetch_related() lookups (strings, or Prefetch objects from a
+        model's graphql_prefetch), parents before children.
+    """
+    sources = get_graphql_sources(model)
+    extra_lookups = getattr(model, "graphql_prefetch", {})
+    lookups = []
+
+    for field_node in iter_selected_fields(selection_set, info, model):
+        field_name = to_snake_case(field_node.name.value)
+
+        for lookup in extra_lookups.get(field_name, []):
+            if isinstance(lookup, Prefetch):
+                lookups.append(
+                    Prefetch(
+                        f"{prefix}{lookup.prefetch_through}", queryset=lookup.queryset
+                    )
+                )
+            else:
+                lookups.append(f"{prefix}{lookup}")
+
+        source = sources.get(field_name)
+        if source is None:
+            continue
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation or model_field.related_model is None:
+            continue
+
+        arguments = {argument.name.value for argument in field_node.arguments or []}
+        if not arguments <= CACHE_SAFE_ARGUMENTS:
+            continue
+
+        path = f"{prefix}{source}"
+        lookups.append(path)
+        lookups.extend(
+            collect_prefetch_lookups(
+                model_field.related_model,
+                field_node.selection_set,
+                info,
+                prefix=f"{path}__",
+            )
+        )
+
+    return lookups
+
+
+class BatchingMiddleware:
+    """
+    Graphene middleware that batches nested relation lookups.
+
+    Whenever a resolver returns an unevaluated queryset, the selection set below
+    it is inspected and every foreign key or reverse relation requested by the
+    query is added as a prefetch_related() lookup. Sibling objects at each level
+    are then loaded with a single ``IN (...)`` query instead of one query per
+    parent. Nested collections resolve from the prefetched cache, so only the
+    outermost queryset of a request triggers the prefetch.
+    """
+
+    def resolve(self, next, root, info, **kwargs):
+        result = next(root, info, **kwargs)
+        if not isinstance(result, QuerySet) or result._result_cache is not None:
+            return result
+
+        lookups = []
+        for field_node in info.field_nodes:
+            lookups.extend(
+                collect_prefetch_lookups(result.model, field_node.selection_set, info)
+            )
+
+        if lookups:
+            result = result.prefetch_related(*dict.fromkeys(lookups))
+        return result
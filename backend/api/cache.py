@@ -0,0 +1,90 @@
+import hashlib
+import json
+import re
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = "graphql:response:version"
+KEY_PREFIX = "graphql:response"
+
+# Mutations must always execute, and preview queries pass a token argument
+# because they need to see the latest draft rather than published content.
+UNCACHEABLE_PATTERN = re.compile(r"\b(?:mutation|subscription)\b|\btoken\s*:")
+
+
+def get_cache_version(key=VERSION_KEY):
+    """
+    Return the current generation stored under ``key``, the response cache
+    generation by default.
+
+    Every cached response is stored under the generation that was current when
+    it was rendered. Invalidating the cache starts a new generation, so stale
+    entries are simply never read again and expire on their own. If the
+    generation key itself has been evicted, a new one is started, which can
+    only ever cause a miss, never a stale hit.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(key):
+    """Start a new generation under ``key``, so data keyed on it is rebuilt."""
+    cache.set(key, uuid.uuid4().hex, timeout=None)
+
+
+def invalidate_graphql_cache():
+    """Drop every cached GraphQL response by starting a new cache generation."""
+    bump_cache_version(VERSION_KEY)
+
+
+def normalize_query(query):
+    """Collapse insignificant whitespace so formatting does not split the cache."""
+    return " ".join(query.split())
+
+
+def is_cacheable(query, variables):
+    if not query:
+        return False
+    if variables and "token" in variables:
+        return False
+    return UNCACHEABLE_PATTERN.search(query) is None
+
+
+def get_cache_key(query, variables, operation_name, *, pretty=False):
+    """
+    Build the cache key for a GraphQL request.
+
+    Args:
+        query (str): The GraphQL document.
+        variables (dict): The operation variables, if any.
+        operation_name (str): The operation to run, if any.
+        pretty (bool): Whether the response is pretty-printed.
+
+    Returns:
+        str: A key scoped to the current cache generation.
+    """
+    payload = json.dumps(
+        {
+            "query": normalize_query(query),
+            "variables": variables or {},
+            "operation_name": operation_name,
+            "pretty": pretty,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    digest = hashlib.sha256(payload.encode()).hexdigest()
+    return f"{KEY_PREFIX}:{get_cache_version()}:{digest}"
+
+
+def get_cached_response(key):
+    return cache.get(key)
+
+
+def set_cached_response(key, response):
+    cache.set(key, response, timeout=settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT)
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+IMMEDIATE_TASKS_BACKEND = "django_tasks.backends.immediate.ImmediateBackend"
+PER_PROCESS_CACHE_BACKENDS = ["django.core.cache.backends.locmem.LocMemCache"]
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Require a shared cache when import tasks run in a separate worker.
+
+    Imports invalidate the GraphQL response cache (see api.cache) from the
+    process that runs them. With a per-process cache, a db_worker's
+    invalidation never reaches the web server, which would keep serving stale
+    responses until GRAPHQL_RESPONSE_CACHE_TIMEOUT.
+    """
+    backend = settings.TASKS.get("imports", {}).get("BACKEND")
+    cache_backend = settings.CACHES["default"]["BACKEND"]
+    if backend == IMMEDIATE_TASKS_BACKEND or (
+        cache_backend not in PER_PROCESS_CACHE_BACKENDS
+    ):
+        return []
+    return [
+        Error(
+            f"The imports task backend {backend} runs in a separate worker, but "
+            f"the default cache ({cache_backend}) is not shared with it.",
+            hint=(
+                "Set REDIS_URL to share the cache, or set IMPORT_TASKS_BACKEND to "
+                f"{IMMEDIATE_TASKS_BACKEND} to run imports inline."
+            ),
+            id="api.E001",
+        )
+    ]
@@ -0,0 +1,117 @@
+import os
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from graphql import print_ast
+
+from api.models import PersistedOperation
+from api.persisted import InvalidOperation, compile_operation, get_document_hash
+
+
+GQL_TEMPLATE = re.compile(r"gql`(.*?)`", re.DOTALL)
+SOURCE_EXTENSIONS = (".ts", ".tsx", ".graphql", ".gql")
+
+
+class Command(BaseCommand):
+    help = "Register GraphQL operation documents as persisted operations"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            help="Files or directories to read (.ts, .tsx, .graphql). "
+            "Defaults to the frontend's graphql directory.",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Delete persisted operations that were not found in the given paths",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate and hash the operations without saving them",
+        )
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or [
+            os.path.join(settings.BASE_DIR, os.pardir, "frontend", "graphql")
+        ]
+
+        operations = {}
+        failed = 0
+        for source, text in self.collect_documents(paths):
+            try:
+                document, operation_name = compile_operation(text)
+            except InvalidOperation as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"{source}: {e}"))
+                continue
+
+            normalized = print_ast(document)
+            sha256 = get_document_hash(normalized)
+            operations[sha256] = (operation_name, normalized, source)
+            self.stdout.write(f"{sha256}  {operation_name or 'anonymous'}  ({source})")
+
+        if options["dry_run"]:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Dry run: {len(operations)} valid operations, {failed} invalid."
+                )
+            )
+            return
+
+        with transaction.atomic():
+            existing = set(
+                PersistedOperation.objects.filter(
+                    sha256__in=operations.keys()
+                ).values_list("sha256", flat=True)
+            )
+            PersistedOperation.objects.bulk_create(
+                [
+                    PersistedOperation(
+                        sha256=sha256,
+                        operation_name=operation_name,
+                        document=document,
+                        source=source,
+                    )
+                    for sha256, (operation_name, document, source) in operations.items()
+                    if sha256 not in existing
+                ]
+            )
+            pruned = 0
+            if options["prune"]:
+                pruned, _ = PersistedOperation.objects.exclude(
+                    sha256__in=operations.keys()
+                ).delete()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Registered {len(operations) - len(existing)} new operations "
+                f"({len(existing)} already known, {pruned} pruned, {failed} invalid)."
+            )
+        )
+
+    def collect_documents(self, paths):
+        """Yield (source, document) pairs from GraphQL and TypeScript files."""
+        for path in paths:
+            if os.path.isdir(path):
+                filenames = sorted(
+                    os.path.join(path, name)
+                    for name in os.listdir(path)
+                    if name.endswith(SOURCE_EXTENSIONS)
+                )
+            else:
+                filenames = [path]
+
+            for filename in filenames:
+                with open(filename, encoding="utf-8") as f:
+                    content = f.read()
+                source = os.path.basename(filename)
+                if filename.endswith((".graphql", ".gql")):
+                    yield source, content
+                else:
+                    for match in GQL_TEMPLATE.finditer(content):
+                        yield source, match.group(1)
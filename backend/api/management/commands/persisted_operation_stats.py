@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from api.models import PersistedOperation
+
+
+class Command(BaseCommand):
+    help = "Report how often each persisted GraphQL operation has been requested"
+
+    def handle(self, *args, **options):
+        operations = PersistedOperation.objects.order_by("-hit_count", "operation_name")
+        if not operations.exists():
+            self.stdout.write(self.style.WARNING("No persisted operations registered."))
+            return
+
+        for operation in operations:
+            last_used = (
+                operation.last_used_at.strftime("%Y-%m-%d %H:%M")
+                if operation.last_used_at
+                else "never"
+            )
+            self.stdout.write(
+                f"{operation.hit_count:>10}  {last_used:<16}  "
+                f"{operation.sha256[:12]}  {operation.operation_name or 'anonymous'}"
+            )
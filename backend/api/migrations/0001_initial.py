@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-18 08:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersistedOperation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(help_text='SHA-256 of the normalized operation document', max_length=64, unique=True)),
+                ('operation_name', models.CharField(blank=True, max_length=255)),
+                ('document', models.TextField(help_text='Normalized GraphQL document')),
+                ('source', models.CharField(blank=True, help_text='File the operation was ingested from', max_length=255)),
+                ('hit_count', models.PositiveBigIntegerField(default=0)),
+                ('last_used_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Persisted Operation',
+                'verbose_name_plural': 'Persisted Operations',
+                'ordering': ['operation_name'],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import models
+
+
+class PersistedOperation(models.Model):
+    """A GraphQL operation document the API accepts by its SHA-256 hash."""
+
+    sha256 = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="SHA-256 of the normalized operation document",
+    )
+    operation_name = models.CharField(max_length=255, blank=True)
+    document = models.TextField(help_text="Normalized GraphQL document")
+    source = models.CharField(
+        max_length=255, blank=True, help_text="File the operation was ingested from"
+    )
+    hit_count = models.PositiveBigIntegerField(default=0)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.operation_name or 'anonymous'} ({self.sha256[:12]})"
+
+    class Meta:
+        verbose_name = "Persisted Operation"
+        verbose_name_plural = "Persisted Operations"
+        ordering = ["operation_name"]
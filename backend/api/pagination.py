@@ -0,0 +1,181 @@
+import base64
+import datetime
+import json
+
+import graphene
+from django.db.models import F, Q
+from grapple.settings import grapple_settings
+
+
+class InvalidPagination(Exception):
+    pass
+
+
+class InvalidCursor(InvalidPagination):
+    pass
+
+
+def encode_cursor_value(value):
+    # Full-precision isoformat(): DjangoJSONEncoder truncates microseconds, which
+    # would break the equality step of the keyset filter on tied timestamps.
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor.")
+
+
+def encode_cursor(values):
+    payload = json.dumps(
+        list(values), default=encode_cursor_value, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, model, ordering):
+    """
+    Decode an opaque cursor back into the ordering key values it was built from.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed or does not match the ordering.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursor("Invalid cursor.")
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor("Invalid cursor.")
+
+    try:
+        return [
+            model._meta.get_field(field.lstrip("-")).to_python(value)
+            for field, value in zip(ordering, values)
+        ]
+    except Exception:
+        raise InvalidCursor("Invalid cursor.")
+
+
+def get_nullable_fields(model, ordering):
+    return {
+        field.lstrip("-")
+        for field in ordering
+        if model._meta.get_field(field.lstrip("-")).null
+    }
+
+
+def get_order_by(ordering, nullable=()):
+    """
+    Return order_by() arguments for an ordering, sorting NULLs last.
+
+    Databases disagree on where NULLs sort by default, so nullable fields
+    state it explicitly to match get_keyset_filter().
+    """
+    order_by = []
+    for field in ordering:
+        name = field.lstrip("-")
+        if name not in nullable:
+            order_by.append(field)
+        elif field.startswith("-"):
+            order_by.append(F(name).desc(nulls_last=True))
+        else:
+            order_by.append(F(name).asc(nulls_last=True))
+    return order_by
+
+
+def get_keyset_filter(ordering, values, nullable=()):
+    """
+    Build the filter selecting rows that sort strictly after ``values``.
+
+    For an ordering of (a, b) this is ``a > x OR (a = x AND b > y)``, which
+    the database can answer with a range scan on a composite (a, b) index.
+    Fields in ``nullable`` sort NULLs last (see get_order_by()): NULL follows
+    every value, and nothing follows NULL but another NULL.
+    """
+    condition = Q()
+    for position, field in enumerate(ordering):
+        name = field.lstrip("-")
+        value = values[position]
+        if value is None:
+            # Nothing sorts after NULL on this field
+            continue
+        lookup = "lt" if field.startswith("-") else "gt"
+        step = Q(**{f"{name}__{lookup}": value})
+        if name in nullable:
+            step |= Q(**{f"{name}__isnull": True})
+        for previous, previous_value in zip(ordering[:position], values):
+            previous_name = previous.lstrip("-")
+            if previous_value is None:
+                step &= Q(**{f"{previous_name}__isnull": True})
+            else:
+                step &= Q(**{previous_name: previous_value})
+        condition |= step
+    return condition
+
+
+def keyset_paginate(queryset, ordering, first=None, after=None):
+    """
+    Return one page of a queryset using keyset (cursor) pagination.
+
+    Unlike limit/offset, the cost of a page does not grow with its position and
+    rows inserted or deleted mid-scan cannot shift later pages. One extra row is
+    fetched to determine hasNextPage, so no COUNT(*) is issued.
+
+    Args:
+        queryset (QuerySet): The rows to paginate.
+        ordering (list): Ordering fields; the last one must be unique (e.g. id).
+        first (int): The page size, capped at Grapple's MAX_PAGE_SIZE.
+        after (str): The endCursor of the previous page, if any.
+
+    Returns:
+        dict: ``items`` and ``page_info`` for a connection type.
+
+    Raises:
+        InvalidPagination: If ``first`` is below 1 or the cursor is invalid.
+    """
+    if first is None:
+        first = grapple_settings.PAGE_SIZE
+    elif first < 1:
+        raise InvalidPagination("first must be at least 1.")
+    first = min(first, grapple_settings.MAX_PAGE_SIZE)
+    nullable = get_nullable_fields(queryset.model, ordering)
+    queryset = queryset.order_by(*get_order_by(ordering, nullable))
+    if after:
+        values = decode_cursor(after, queryset.model, ordering)
+        queryset = queryset.filter(get_keyset_filter(ordering, values, nullable))
+
+    items = list(queryset[: first + 1])
+    has_next_page = len(items) > first
+    items = items[:first]
+
+    end_cursor = None
+    if items:
+        last = items[-1]
+        end_cursor = encode_cursor(
+            getattr(last, field.lstrip("-")) for field in ordering
+        )
+
+    return {
+        "items": items,
+        "page_info": {"has_next_page": has_next_page, "end_cursor": end_cursor},
+    }
+
+
+class PageInfo(graphene.ObjectType):
+    has_next_page = graphene.Boolean(required=True)
+    end_cursor = graphene.String()
+
+
+def create_connection_type(name, node_type):
+    """
+    Create a GraphQL connection type holding one page of ``node_type`` items.
+
+    ``node_type`` may be a callable so Grapple's lazily registered model types
+    can be referenced before they exist.
+    """
+    return type(
+        name,
+        (graphene.ObjectType,),
+        {
+            "items": graphene.List(graphene.NonNull(node_type), required=True),
+            "page_info": graphene.Field(PageInfo, required=True),
+        },
+    )
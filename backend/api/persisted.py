@@ -0,0 +1,140 @@
+import hashlib
+import json
+import threading
+import time
+from collections import Counter, namedtuple
+
+from graphene_django.settings import graphene_settings
+from graphql import OperationType, get_operation_ast, parse, validate
+
+from .models import PersistedOperation
+from .tasks import save_persisted_operation_hits
+
+
+# Hit counts are buffered in memory and handed to a background task at most
+# this often, from the request that finds the interval elapsed, so a persisted
+# request never has to wait on an UPDATE. Hits still buffered when a worker
+# exits are dropped: the counts are a usage signal, not an audit log.
+HIT_FLUSH_INTERVAL = 60
+
+CompiledOperation = namedtuple(
+    "CompiledOperation", ["sha256", "query", "document", "operation_name"]
+)
+
+
+class InvalidOperation(Exception):
+    pass
+
+
+def get_document_hash(text):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def compile_operation(query):
+    """
+    Parse and validate a GraphQL document against the API schema.
+
+    Args:
+        query (str): The GraphQL document.
+
+    Returns:
+        tuple: The parsed document and the name of its operation.
+
+    Raises:
+        InvalidOperation: If the document is invalid or not a single query.
+    """
+    try:
+        document = parse(query)
+    except Exception as e:
+        raise InvalidOperation(str(e))
+
+    operation = get_operation_ast(document)
+    if operation is None:
+        raise InvalidOperation("Document must contain exactly one operation.")
+    if operation.operation != OperationType.QUERY:
+        raise InvalidOperation("Only query operations can be persisted.")
+
+    errors = validate(graphene_settings.SCHEMA.graphql_schema, document)
+    if errors:
+        raise InvalidOperation("; ".join(error.message for error in errors))
+
+    return document, operation.name.value if operation.name else ""
+
+
+class PersistedOperationRegistry:
+    """
+    Per-process store of persisted operations, parsed and validated once.
+
+    Operations are loaded from the database the first time their hash is
+    requested, so new ingests are picked up without a restart.
+    """
+
+    def __init__(self):
+        self._operations = {}
+        self._hits = Counter()
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def get(self, sha256):
+        operation = self._operations.get(sha256)
+        if operation is not None:
+            return operation
+
+        stored = PersistedOperation.objects.filter(sha256=sha256).first()
+        if stored is None:
+            return None
+
+        document, operation_name = compile_operation(stored.document)
+        operation = CompiledOperation(
+            sha256, stored.document, document, operation_name
+        )
+        self._operations[sha256] = operation
+        return operation
+
+    def record_hit(self, sha256):
+        with self._lock:
+            self._hits[sha256] += 1
+            if time.monotonic() - self._last_flush < HIT_FLUSH_INTERVAL:
+                return
+        self.flush_hits()
+
+    def flush_hits(self):
+        """
+        Queue the buffered hit counts to be written back by the import worker
+        (see api.tasks), which only costs the request a task insert.
+        """
+        with self._lock:
+            hits, self._hits = self._hits, Counter()
+            self._last_flush = time.monotonic()
+        if hits:
+            save_persisted_operation_hits.enqueue(dict(hits))
+
+    def clear(self):
+        self._operations.clear()
+
+
+operation_registry = PersistedOperationRegistry()
+
+
+def get_operation_id(request, data):
+    """
+    Return the persisted operation hash sent with a request, if any.
+
+    Accepts ``id`` or ``sha256`` (query string or body) as well as the Apollo
+    ``extensions.persistedQuery.sha256Hash`` format.
+    """
+    for param in ("id", "sha256"):
+        value = request.GET.get(param) or data.get(param)
+        if value:
+            return value
+
+    extensions = request.GET.get("extensions") or data.get("extensions")
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return None
+    if isinstance(extensions, dict):
+        persisted_query = extensions.get("persistedQuery") or {}
+        return persisted_query.get("sha256Hash")
+    return None
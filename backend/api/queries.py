@@ -0,0 +1,219 @@
+import graphene
+from graphql import GraphQLError
+from grapple.registry import registry
+
+from core.airport_search import search_airports
+from core.models import Airport, PortPair
+from core.port_pairs import get_port_pairs_from
+from news.models import NewsArticle, NewsCategoryPage
+from schedules.models import Flight
+from schedules.availability import get_available_port_pairs
+from schedules.itineraries import MAX_STOPS, find_itineraries
+from schedules.operating_dates import MAX_MONTHS, get_operating_dates
+from schedules.timetable import get_timetable
+from .pagination import InvalidPagination, create_connection_type, keyset_paginate
+
+FLIGHT_ORDERING = ["schedule_id", "id"]
+NEWS_ARTICLE_ORDERING = ["-first_published_at", "-id"]
+
+FlightConnection = create_connection_type(
+    "FlightConnection", lambda: registry.models[Flight]
+)
+NewsArticleConnection = create_connection_type(
+    "NewsArticleConnection", lambda: registry.models[NewsArticle]
+)
+
+
+def paginate(queryset, ordering, first, after):
+    try:
+        return keyset_paginate(queryset, ordering, first=first, after=after)
+    except InvalidPagination as e:
+        raise GraphQLError(str(e))
+
+
+class CursorPaginationQuery:
+    """
+    Cursor-paginated alternatives to the limit/offset collections Grapple
+    generates, for collections large enough that deep offsets hurt.
+
+    Pass the previous page's ``pageInfo.endCursor`` as ``after`` to continue.
+    """
+
+    flights_connection = graphene.Field(
+        graphene.NonNull(FlightConnection),
+        schedule_id=graphene.ID(),
+        first=graphene.Int(),
+        after=graphene.String(),
+    )
+    news_articles_connection = graphene.Field(
+        graphene.NonNull(NewsArticleConnection),
+        category_slug=graphene.String(),
+        first=graphene.Int(),
+        after=graphene.String(),
+    )
+
+    def resolve_flights_connection(
+        self, info, schedule_id=None, first=None, after=None
+    ):
+        queryset = Flight.objects.all()
+        if schedule_id is not None:
+            queryset = queryset.filter(schedule_id=schedule_id)
+        return paginate(queryset, FLIGHT_ORDERING, first, after)
+
+    def resolve_news_articles_connection(
+        self, info, category_slug=None, first=None, after=None
+    ):
+        queryset = NewsArticle.objects.live().public()
+        if category_slug:
+            category = NewsCategoryPage.objects.filter(slug=category_slug).first()
+            if category is None:
+                queryset = queryset.none()
+            else:
+                queryset = queryset.child_of(category)
+        return paginate(queryset, NEWS_ARTICLE_ORDERING, first, after)
+
+
+class TimetableQuery:
+    """Flights between two ports on a date, served from the in-memory timetable."""
+
+    timetable = graphene.List(
+        graphene.NonNull(lambda: registry.models[Flight]),
+        required=True,
+        origin=graphene.String(required=True),
+        destination=graphene.String(required=True),
+        date=graphene.Date(required=True),
+    )
+
+    def resolve_timetable(self, info, origin, destination, date):
+        return get_timetable().get_flights(origin, destination, date)
+
+
+class ItineraryLeg(graphene.ObjectType):
+    flight = graphene.Field(graphene.NonNull(lambda: registry.models[Flight]))
+    date = graphene.Date(required=True)
+    departure = graphene.DateTime(required=True)
+    arrival = graphene.DateTime(required=True)
+
+
+class Itinerary(graphene.ObjectType):
+    legs = graphene.List(graphene.NonNull(ItineraryLeg), required=True)
+    stops = graphene.Int(required=True)
+    connections = graphene.List(graphene.NonNull(graphene.String), required=True)
+    departure = graphene.DateTime(required=True)
+    arrival = graphene.DateTime(required=True)
+    duration_minutes = graphene.Int(required=True)
+
+
+class ItineraryQuery:
+    """
+    Direct flights and one- or two-stop connections between two ports,
+    shortest journey first.
+    """
+
+    itineraries = graphene.List(
+        graphene.NonNull(Itinerary),
+        required=True,
+        origin=graphene.String(required=True),
+        destination=graphene.String(required=True),
+        date=graphene.Date(required=True),
+        max_stops=graphene.Int(default_value=MAX_STOPS),
+        min_connection_minutes=graphene.Int(),
+        limit=graphene.Int(default_value=20),
+    )
+
+    def resolve_itineraries(
+        self,
+        info,
+        origin,
+        destination,
+        date,
+        max_stops=MAX_STOPS,
+        min_connection_minutes=None,
+        limit=20,
+    ):
+        if limit is not None and limit < 1:
+            raise GraphQLError("limit must be at least 1.")
+        if min_connection_minutes is not None and min_connection_minutes < 0:
+            raise GraphQLError("minConnectionMinutes must not be negative.")
+        return find_itineraries(
+            get_timetable(),
+            origin,
+            destination,
+            date,
+            max_stops=max_stops,
+            min_connection_minutes=min_connection_minutes,
+            limit=limit,
+        )
+
+
+class OperatingDateQuery:
+    """Dates with flights on a route (or for one flight number), for date pickers."""
+
+    operating_dates = graphene.List(
+        graphene.NonNull(graphene.Date),
+        required=True,
+        origin=graphene.String(),
+        destination=graphene.String(),
+        flight_number=graphene.String(),
+        months=graphene.Int(default_value=MAX_MONTHS),
+    )
+
+    def resolve_operating_dates(
+        self,
+        info,
+        origin=None,
+        destination=None,
+        flight_number=None,
+        months=MAX_MONTHS,
+    ):
+        if not (origin and destination) and not flight_number:
+            raise GraphQLError("Pass both origin and destination, or a flight number.")
+        return get_operating_dates(origin, destination, flight_number, months)
+
+
+class PortPairQuery:
+    """
+    The port pairs departing from an origin, served from the in-memory port
+    pair index instead of the search backend.
+    """
+
+    origin_port_pairs = graphene.List(
+        graphene.NonNull(lambda: registry.models[PortPair]),
+        required=True,
+        origin=graphene.String(required=True),
+    )
+
+    def resolve_origin_port_pairs(self, info, origin):
+        return get_port_pairs_from(origin)
+
+
+class AvailablePortPairQuery:
+    """
+    Port pairs from an origin with at least one flight in a travel window,
+    for the booking widget's destination list.
+    """
+
+    available_port_pairs = graphene.List(
+        graphene.NonNull(lambda: registry.models[PortPair]),
+        required=True,
+        origin=graphene.String(required=True),
+        start_date=graphene.Date(required=True),
+        end_date=graphene.Date(),
+    )
+
+    def resolve_available_port_pairs(self, info, origin, start_date, end_date=None):
+        return get_available_port_pairs(origin, start_date, end_date)
+
+
+class AirportSearchQuery:
+    """Typeahead over airport code, city, name and country, best match first."""
+
+    airport_search = graphene.List(
+        graphene.NonNull(lambda: registry.models[Airport]),
+        required=True,
+        query=graphene.String(required=True),
+        limit=graphene.Int(default_value=10),
+    )
+
+    def resolve_airport_search(self, info, query, limit=10):
+        return search_airports(query, limit=min(max(limit, 1), 50))
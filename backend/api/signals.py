@@ -0,0 +1,44 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+from grapple.settings import grapple_settings
+from wagtail.images import get_image_model
+from wagtail.signals import page_published, page_unpublished
+
+from .cache import invalidate_graphql_cache
+
+
+def invalidate_on_change(sender, **kwargs):
+    invalidate_graphql_cache()
+
+
+def register_signal_handlers():
+    """
+    Invalidate the GraphQL response cache whenever exposed content changes.
+
+    Pages invalidate on publish/unpublish. Every other model in the apps exposed
+    through Grapple (snippets such as Fare, Schedule, Airport, TravelAlert and
+    HeaderMenu, plus the ranking and inline models hanging off pages) and the
+    image model invalidate on save and delete. Bulk writes bypass these signals
+    and must call invalidate_graphql_cache() themselves (importers do so
+    through imports.importers.invalidate_imported_content()).
+    """
+    page_published.connect(invalidate_on_change, dispatch_uid="graphql_cache_publish")
+    page_unpublished.connect(
+        invalidate_on_change, dispatch_uid="graphql_cache_unpublish"
+    )
+
+    models = [get_image_model()]
+    for app_label in grapple_settings.APPS:
+        models.extend(apps.get_app_config(app_label).get_models())
+
+    for model in models:
+        post_save.connect(
+            invalidate_on_change,
+            sender=model,
+            dispatch_uid=f"graphql_cache_save_{model._meta.label_lower}",
+        )
+        post_delete.connect(
+            invalidate_on_change,
+            sender=model,
+            dispatch_uid=f"graphql_cache_delete_{model._meta.label_lower}",
+        )
@@ -0,0 +1,22 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django_tasks import task
+
+from .models import PersistedOperation
+
+
+@task(backend="imports")
+def save_persisted_operation_hits(hits):
+    """
+    Add buffered hit counts to their persisted operations.
+
+    Args:
+        hits (dict): Operation hash -> number of requests since the last flush.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        for sha256, count in hits.items():
+            PersistedOperation.objects.filter(sha256=sha256).update(
+                hit_count=F("hit_count") + count, last_used_at=now
+            )
@@ -0,0 +1,718 @@
+import datetime
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from wagtail.models import Page
+
+from core.models import Airport, Currency, PortPair
+from explore.models import (
+    Destination,
+    DestinationIndexPage,
+    ExploreIndexPage,
+    Route,
+    Special,
+    SpecialRoute,
+)
+from fares.models import Fare
+from home.models import AllYouNeedPage, HomePage
+from news.models import NewsArticle, NewsCategoryPage
+from schedules.models import Flight, Schedule, parse_days
+from schedules.operating_dates import add_months
+from .cache import is_cacheable
+from .checks import check_shared_cache
+from .models import PersistedOperation
+from .pagination import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    get_keyset_filter,
+)
+from .persisted import get_document_hash, operation_registry
+
+
+def create_page(parent, page_class, title, **fields):
+    if page_class is not HomePage:
+        fields.setdefault("hero_title", title)
+    return parent.add_child(instance=page_class(title=title, **fields))
+
+
+class GraphQLTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def query(self, query, variables=None):
+        response = self.client.post(
+            "/api/graphql/",
+            json.dumps({"query": query, "variables": variables or {}}),
+            content_type="application/json",
+        )
+        result = response.json()
+        self.assertNotIn("errors", result)
+        return result["data"]
+
+    def count_queries(self, query, variables=None):
+        """Run a query against a cold response cache and return its query count."""
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.query(query, variables)
+        return len(queries)
+
+    def assertFlatQueries(self, query, add_parents, variables=None):
+        """
+        Assert a query costs as many queries for many parents as for one.
+
+        ``add_parents(count)`` is called to go from one parent to ``count``.
+        """
+        expected = self.count_queries(query, variables)
+        add_parents(5)
+        cache.clear()
+        with self.assertNumQueries(expected):
+            self.query(query, variables)
+
+
+class ResponseCacheTests(GraphQLTestCase):
+    currencies_query = "{ currencies { currencyCode } }"
+
+    def setUp(self):
+        super().setUp()
+        self.currency = Currency.objects.create(
+            country_name="Solomon Islands",
+            country_code="SB",
+            currency_name="Dollar",
+            currency_code="SBD",
+            currency_symbol="$",
+        )
+
+    def post(self, query, variables=None):
+        return self.client.post(
+            "/api/graphql/",
+            json.dumps({"query": query, "variables": variables or {}}),
+            content_type="application/json",
+        )
+
+    def get_codes(self, response):
+        return [
+            currency["currencyCode"]
+            for currency in response.json()["data"]["currencies"]
+        ]
+
+    def test_miss_then_hit(self):
+        response = self.post(self.currencies_query)
+        self.assertEqual(response["X-GraphQL-Cache"], "MISS")
+        # Formatting does not split the cache
+        with self.assertNumQueries(0):
+            response = self.post("{ currencies {\n    currencyCode\n} }")
+        self.assertEqual(response["X-GraphQL-Cache"], "HIT")
+        self.assertEqual(self.get_codes(response), ["SBD"])
+
+    def test_snippet_save_invalidates(self):
+        self.post(self.currencies_query)
+        # A queryset update sends no signal, so the cached response is served
+        Currency.objects.update(currency_code="AUD")
+        self.assertEqual(self.get_codes(self.post(self.currencies_query)), ["SBD"])
+
+        self.currency.refresh_from_db()
+        self.currency.save()
+        response = self.post(self.currencies_query)
+        self.assertEqual(response["X-GraphQL-Cache"], "MISS")
+        self.assertEqual(self.get_codes(response), ["AUD"])
+
+    def test_snippet_delete_invalidates(self):
+        self.post(self.currencies_query)
+        self.currency.delete()
+        self.assertEqual(self.get_codes(self.post(self.currencies_query)), [])
+
+    def test_page_publish_invalidates(self):
+        home = create_page(Page.get_first_root_node(), HomePage, "Home")
+        query = "query ($id: ID) { page(id: $id) { title } }"
+        variables = {"id": home.pk}
+        self.post(query, variables)
+
+        home.title = "Welcome"
+        revision = home.save_revision()
+        self.post(query, variables)
+        response = self.post(query, variables)
+        self.assertEqual(response["X-GraphQL-Cache"], "HIT")
+        self.assertEqual(response.json()["data"]["page"]["title"], "Home")
+
+        revision.publish()
+        response = self.post(query, variables)
+        self.assertEqual(response["X-GraphQL-Cache"], "MISS")
+        self.assertEqual(response.json()["data"]["page"]["title"], "Welcome")
+
+    def test_preview_tokens_bypass_the_cache(self):
+        query = "query ($token: String) { currencies { currencyCode } }"
+        for _ in range(2):
+            response = self.post(query, {"token": "preview"})
+            self.assertNotIn("X-GraphQL-Cache", response)
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            response = self.post("{ currencies { noSuchField } }")
+            self.assertEqual(response["X-GraphQL-Cache"], "MISS")
+
+    def test_uncacheable_operations(self):
+        self.assertFalse(is_cacheable("mutation { logout { ok } }", None))
+        self.assertFalse(is_cacheable("subscription { alerts { id } }", None))
+        self.assertFalse(is_cacheable('{ page(token: "abc") { title } }', None))
+        self.assertFalse(is_cacheable("{ page { title } }", {"token": "abc"}))
+        self.assertTrue(is_cacheable("{ page { title } }", {"id": 1}))
+
+
+class BatchingTests(GraphQLTestCase):
+    def setUp(self):
+        super().setUp()
+        root = Page.get_first_root_node()
+        self.home = create_page(root, HomePage, "Home")
+        explore = create_page(self.home, ExploreIndexPage, "Explore")
+        self.index = create_page(explore, DestinationIndexPage, "Destinations")
+        self.destination = create_page(
+            self.index, Destination, "Australia", country="Australia"
+        )
+        self.brisbane = Airport.objects.create(
+            code="BNE", name="Brisbane", city="Brisbane", country="Australia"
+        )
+        self.currency = Currency.objects.create(
+            country_name="Solomon Islands",
+            country_code="SB",
+            currency_name="Dollar",
+            currency_code="SBD",
+            currency_symbol="$",
+        )
+        self.special = create_page(
+            self.home,
+            Special,
+            "Sale",
+            name="Sale",
+            special_code="SALE",
+            discount="10%",
+            booking_class="Y",
+            trip_type="return",
+            start_date=datetime.date(2025, 1, 1),
+            end_date=datetime.date(2099, 1, 1),
+        )
+        self.routes = 0
+        self.add_routes(1)
+
+    def add_routes(self, count):
+        for number in range(self.routes, self.routes + count):
+            origin = Airport.objects.create(
+                code=f"O{number:02d}",
+                name=f"Port {number}",
+                city=f"City {number}",
+                country="Solomon Islands",
+            )
+            route = create_page(
+                self.destination,
+                Route,
+                f"Route {number}",
+                origin_port=origin,
+                destination_port=self.brisbane,
+            )
+            for fare_family in ("Economy", "Business"):
+                Fare.objects.create(
+                    fare_family=fare_family,
+                    price=100 + number,
+                    currency="SBD",
+                    origin=origin.code,
+                    destination="BNE",
+                    route=route,
+                )
+            SpecialRoute.objects.create(
+                special=self.special,
+                route=route,
+                starting_price=99,
+                trip_type="return",
+                currency=self.currency,
+            )
+        self.routes += count
+
+    def test_nested_route_relations(self):
+        query = """
+            query ($id: ID) {
+                destination(id: $id) {
+                    ... on Destination {
+                        routes {
+                            title
+                            fares { fareFamily price }
+                            specialRoutes {
+                                startingPrice
+                                isExpired
+                                currency { currencyCode }
+                            }
+                        }
+                    }
+                }
+            }
+        """
+        self.assertFlatQueries(
+            query, self.add_routes, variables={"id": self.destination.pk}
+        )
+
+    def test_related_route_rankings(self):
+        # A single route has no related routes, so start from two
+        self.add_routes(1)
+        query = """
+            query ($id: ID) {
+                destination(id: $id) {
+                    ... on Destination {
+                        rankedRoutes {
+                            route {
+                                title
+                                rankedRelatedRoutes { relatedRoute { title } }
+                            }
+                        }
+                    }
+                }
+            }
+        """
+        self.assertFlatQueries(
+            query, self.add_routes, variables={"id": self.destination.pk}
+        )
+
+    def test_port_pair_airports(self):
+        ports = [self.brisbane]
+
+        def add_port_pairs(count):
+            for number in range(len(ports), len(ports) + count):
+                port = Airport.objects.create(
+                    code=f"P{number:02d}",
+                    name=f"Pair {number}",
+                    city=f"Pair {number}",
+                    country="Solomon Islands",
+                )
+                ports.append(port)
+                PortPair.objects.create(origin_port=ports[0], destination_port=port)
+
+        add_port_pairs(1)
+        query = """
+            {
+                portPairs {
+                    originPortCode
+                    originPortName
+                    destinationPortCode
+                    destinationPortName
+                }
+            }
+        """
+        self.assertFlatQueries(query, add_port_pairs)
+
+    def test_all_you_need_pages(self):
+        pages = [self.destination]
+
+        def add_items(count):
+            for number in range(count):
+                pages.append(
+                    create_page(
+                        self.index, Destination, f"Country {number}", country="Other"
+                    )
+                )
+            for page in pages[-count:]:
+                AllYouNeedPage.objects.create(homepage=self.home, page=page)
+
+        AllYouNeedPage.objects.create(homepage=self.home, page=self.destination)
+        query = """
+            query ($id: ID) {
+                page(id: $id) {
+                    ... on HomePage {
+                        allYouNeedItems { pageHeroTitle pageDescription }
+                    }
+                }
+            }
+        """
+        self.assertFlatQueries(query, add_items, variables={"id": self.home.pk})
+
+
+class KeysetPaginationTests(GraphQLTestCase):
+    flights_query = """
+        query ($scheduleId: ID, $after: String) {
+            flightsConnection(scheduleId: $scheduleId, first: 2, after: $after) {
+                items { flightNumber }
+                pageInfo { hasNextPage endCursor }
+            }
+        }
+    """
+    news_query = """
+        query ($after: String) {
+            newsArticlesConnection(first: 2, after: $after) {
+                items { articleTitle }
+                pageInfo { hasNextPage endCursor }
+            }
+        }
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.schedule = Schedule.objects.create(
+            start_date=datetime.date(2025, 1, 1), end_date=datetime.date(2025, 3, 31)
+        )
+        # Another schedule's flights sort in between and must be filtered out
+        other = Schedule.objects.create(
+            start_date=datetime.date(2025, 4, 1), end_date=datetime.date(2025, 6, 30)
+        )
+        for number in range(5):
+            for schedule in (self.schedule, other):
+                Flight.objects.create(
+                    schedule=schedule,
+                    days=1,
+                    aircraft="Dash 8",
+                    flight_number=f"IE{number}",
+                    departure_port="HIR",
+                    arrival_port="GZO",
+                    departure_minutes=480,
+                    arrival_minutes=570,
+                    flight_scope="Domestic",
+                )
+
+    def read_pages(self, query, field, title, variables=None):
+        """Follow endCursor to the last page, returning each page's titles."""
+        pages = []
+        after = None
+        while True:
+            connection = self.query(query, {**(variables or {}), "after": after})[field]
+            pages.append([item[title] for item in connection["items"]])
+            if not connection["pageInfo"]["hasNextPage"]:
+                return pages
+            after = connection["pageInfo"]["endCursor"]
+
+    def test_flight_pages(self):
+        pages = self.read_pages(
+            self.flights_query,
+            "flightsConnection",
+            "flightNumber",
+            {"scheduleId": self.schedule.pk},
+        )
+        self.assertEqual(pages, [["IE0", "IE1"], ["IE2", "IE3"], ["IE4"]])
+
+    def test_deep_page_costs_the_same(self):
+        variables = {"scheduleId": self.schedule.pk}
+        first_page = self.count_queries(self.flights_query, variables)
+        cursor = encode_cursor(
+            Flight.objects.filter(schedule=self.schedule)
+            .order_by("id")
+            .values_list("schedule_id", "id")[3]
+        )
+        self.assertEqual(
+            self.count_queries(self.flights_query, {**variables, "after": cursor}),
+            first_page,
+        )
+
+    def create_articles(self, offsets):
+        """Create an article per offset in seconds before now (None: unset)."""
+        root = Page.get_first_root_node()
+        home = create_page(root, HomePage, "Home")
+        category = create_page(home, NewsCategoryPage, "News")
+        published = timezone.now().replace(microsecond=123456)
+        for number, offset in enumerate(offsets):
+            create_page(
+                category,
+                NewsArticle,
+                f"Article {number}",
+                article_title=f"Article {number}",
+                body="<p>News</p>",
+                first_published_at=(
+                    None
+                    if offset is None
+                    else published - datetime.timedelta(seconds=offset)
+                ),
+            )
+
+    def test_news_articles_with_tied_timestamps(self):
+        # Microseconds matter: three articles share one timestamp
+        self.create_articles([0, 0, 0, 1, 2])
+        pages = self.read_pages(
+            self.news_query, "newsArticlesConnection", "articleTitle"
+        )
+        self.assertEqual(
+            pages,
+            [
+                ["Article 2", "Article 1"],
+                ["Article 0", "Article 3"],
+                ["Article 4"],
+            ],
+        )
+
+    def test_news_articles_without_a_publish_date_come_last(self):
+        self.create_articles([None, 0, None, 1, None])
+        pages = self.read_pages(
+            self.news_query, "newsArticlesConnection", "articleTitle"
+        )
+        self.assertEqual(
+            pages,
+            [
+                ["Article 1", "Article 3"],
+                ["Article 4", "Article 2"],
+                ["Article 0"],
+            ],
+        )
+
+    def test_first_must_be_positive(self):
+        query = """
+            query ($first: Int) {
+                flightsConnection(first: $first) { items { flightNumber } }
+            }
+        """
+        for first in [0, -1]:
+            response = self.client.post(
+                "/api/graphql/",
+                json.dumps({"query": query, "variables": {"first": first}}),
+                content_type="application/json",
+            )
+            self.assertEqual(
+                response.json()["errors"][0]["message"], "first must be at least 1."
+            )
+
+    def test_invalid_cursor(self):
+        response = self.client.post(
+            "/api/graphql/",
+            json.dumps(
+                {
+                    "query": self.flights_query,
+                    "variables": {"after": encode_cursor([1])},
+                }
+            ),
+            content_type="application/json",
+        )
+        self.assertEqual(response.json()["errors"][0]["message"], "Invalid cursor.")
+
+    def test_cursor_round_trip(self):
+        published = timezone.now().replace(microsecond=123456)
+        ordering = ["-first_published_at", "-id"]
+        cursor = encode_cursor([published, 7])
+        self.assertEqual(decode_cursor(cursor, NewsArticle, ordering), [published, 7])
+        with self.assertRaises(InvalidCursor):
+            decode_cursor("not a cursor", NewsArticle, ordering)
+
+    def test_keyset_filter(self):
+        ids = Flight.objects.order_by("schedule_id", "id").values_list(
+            "schedule_id", "id"
+        )
+        after = ids[3]
+        self.assertEqual(
+            list(
+                Flight.objects.filter(get_keyset_filter(["schedule_id", "id"], after))
+                .order_by("schedule_id", "id")
+                .values_list("schedule_id", "id")
+            ),
+            list(ids[4:]),
+        )
+
+
+IMMEDIATE_TASKS = {
+    alias: {"BACKEND": "django_tasks.backends.immediate.ImmediateBackend"}
+    for alias in ["default", "imports"]
+}
+
+
+class ItineraryQueryTests(GraphQLTestCase):
+    query_text = """
+        query ($limit: Int, $minConnectionMinutes: Int) {
+            itineraries(
+                origin: "HIR"
+                destination: "GZO"
+                date: "2025-01-06"
+                limit: $limit
+                minConnectionMinutes: $minConnectionMinutes
+            ) { stops connections }
+        }
+    """
+
+    def setUp(self):
+        super().setUp()
+        schedule = Schedule.objects.create(
+            start_date=datetime.date(2025, 1, 1), end_date=datetime.date(2025, 3, 31)
+        )
+        for flight_number, route, departure, arrival in [
+            ("IE100", "HIR-GZO", 8 * 60, 9 * 60 + 30),
+            ("IE200", "HIR-MUA", 7 * 60, 8 * 60),
+            ("IE201", "MUA-GZO", 8 * 60 + 30, 9 * 60 + 30),
+        ]:
+            departure_port, arrival_port = route.split("-")
+            Flight.objects.create(
+                schedule=schedule,
+                flight_number=flight_number,
+                departure_port=departure_port,
+                arrival_port=arrival_port,
+                days=parse_days("Monday"),
+                aircraft="Dash 8",
+                departure_minutes=departure,
+                arrival_minutes=arrival,
+                flight_scope="Domestic",
+            )
+
+    def get_error(self, variables):
+        response = self.client.post(
+            "/api/graphql/",
+            json.dumps({"query": self.query_text, "variables": variables}),
+            content_type="application/json",
+        )
+        return response.json()["errors"][0]["message"]
+
+    def test_limit_and_connection_time(self):
+        data = self.query(self.query_text, {"minConnectionMinutes": 0, "limit": 1})
+        self.assertEqual(data["itineraries"], [{"stops": 0, "connections": []}])
+        data = self.query(self.query_text, {"minConnectionMinutes": 0})
+        self.assertEqual(len(data["itineraries"]), 2)
+
+    def test_negative_arguments_are_rejected(self):
+        for limit in [0, -1]:
+            self.assertEqual(
+                self.get_error({"limit": limit}), "limit must be at least 1."
+            )
+        self.assertEqual(
+            self.get_error({"minConnectionMinutes": -30}),
+            "minConnectionMinutes must not be negative.",
+        )
+
+
+class OperatingDateQueryTests(GraphQLTestCase):
+    query_text = """
+        query ($origin: String, $destination: String, $flightNumber: String) {
+            operatingDates(
+                origin: $origin
+                destination: $destination
+                flightNumber: $flightNumber
+                months: 1
+            )
+        }
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+        schedule = Schedule.objects.create(
+            start_date=self.today - datetime.timedelta(days=7),
+            end_date=self.today + datetime.timedelta(days=90),
+        )
+        for flight_number, departure_port, arrival_port, days in [
+            ("IE100", "HIR", "GZO", "Monday"),
+            ("IE101", "hir", "gzo", "Friday"),
+            ("IE200", "HIR", "MUA", "Tuesday"),
+        ]:
+            Flight.objects.create(
+                schedule=schedule,
+                flight_number=flight_number,
+                departure_port=departure_port,
+                arrival_port=arrival_port,
+                days=parse_days(days),
+                aircraft="Dash 8",
+                departure_minutes=8 * 60,
+                arrival_minutes=9 * 60 + 30,
+                flight_scope="Domestic",
+            )
+
+    def get_dates(self, weekdays):
+        end = add_months(self.today, 1)
+        dates = []
+        date = self.today
+        while date < end:
+            if date.weekday() in weekdays:
+                dates.append(date.isoformat())
+            date += datetime.timedelta(days=1)
+        return dates
+
+    def test_route_dates(self):
+        data = self.query(self.query_text, {"origin": "hir", "destination": "GZO"})
+        self.assertEqual(data["operatingDates"], self.get_dates({0, 4}))
+
+    def test_flight_number_dates(self):
+        data = self.query(self.query_text, {"flightNumber": "IE200"})
+        self.assertEqual(data["operatingDates"], self.get_dates({1}))
+
+    def test_route_or_flight_number_is_required(self):
+        response = self.client.post(
+            "/api/graphql/",
+            json.dumps({"query": self.query_text, "variables": {"origin": "HIR"}}),
+            content_type="application/json",
+        )
+        self.assertEqual(
+            response.json()["errors"][0]["message"],
+            "Pass both origin and destination, or a flight number.",
+        )
+
+
+class PersistedOperationTests(GraphQLTestCase):
+    document = "{ currencies { currencyCode } }"
+
+    def setUp(self):
+        super().setUp()
+        self.operation = PersistedOperation.objects.create(
+            sha256=get_document_hash(self.document), document=self.document
+        )
+        Currency.objects.create(
+            country_name="Solomon Islands",
+            country_code="SB",
+            currency_name="Dollar",
+            currency_code="SBD",
+            currency_symbol="$",
+        )
+
+    def post_hash(self):
+        return self.client.post(
+            "/api/graphql/",
+            json.dumps({"id": self.operation.sha256}),
+            content_type="application/json",
+        )
+
+    def test_query_by_hash(self):
+        response = self.post_hash()
+        self.assertEqual(
+            response.json(), {"data": {"currencies": [{"currencyCode": "SBD"}]}}
+        )
+
+    def test_unknown_hash(self):
+        response = self.client.post(
+            "/api/graphql/",
+            json.dumps({"id": "0" * 64}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(TASKS=IMMEDIATE_TASKS)
+    def test_hits_are_written_back_in_one_flush(self):
+        for _ in range(3):
+            self.post_hash()
+        self.operation.refresh_from_db()
+        self.assertEqual(self.operation.hit_count, 0)
+
+        # Immediate tasks are enqueued on commit, which TestCase never does
+        with self.captureOnCommitCallbacks(execute=True):
+            operation_registry.flush_hits()
+        self.operation.refresh_from_db()
+        self.assertEqual(self.operation.hit_count, 3)
+        self.assertIsNotNone(self.operation.last_used_at)
+
+
+@override_settings(
+    TASKS={"imports": {"BACKEND": "django_tasks.backends.database.DatabaseBackend"}}
+)
+class SharedCacheCheckTests(TestCase):
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_worker_with_local_cache(self):
+        self.assertEqual([error.id for error in check_shared_cache(None)], ["api.E001"])
+
+    @override_settings(
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache",
+                "LOCATION": "redis://localhost:6379/0",
+            }
+        }
+    )
+    def test_worker_with_shared_cache(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(
+        TASKS=IMMEDIATE_TASKS,
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        },
+    )
+    def test_inline_imports_with_local_cache(self):
+        self.assertEqual(check_shared_cache(None), [])
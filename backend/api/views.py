@@ -0,0 +1,113 @@
+from django.conf import settings
+from graphene_django.views import GraphQLView
+from graphql import ExecutionResult, execute
+
+from .cache import (
+    get_cache_key,
+    get_cached_response,
+    is_cacheable,
+    set_cached_response,
+)
+from .persisted import InvalidOperation, get_operation_id, operation_registry
+
+
+class CachedGraphQLView(GraphQLView):
+    """
+    GraphQL endpoint that serves repeat queries from the response cache.
+
+    Content only changes when an editor publishes a page or saves a snippet, so
+    successful query results are cached on the normalized operation and its
+    variables until one of the signal handlers in api.signals invalidates them.
+
+    Requests may also reference a persisted operation by hash instead of
+    sending the query text; those skip parsing and validation entirely.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        response = super().dispatch(request, *args, **kwargs)
+        cache_status = getattr(request, "graphql_cache_status", None)
+        if cache_status:
+            response["X-GraphQL-Cache"] = cache_status
+        return response
+
+    @staticmethod
+    def get_graphql_params(request, data):
+        query, variables, operation_name, id = GraphQLView.get_graphql_params(
+            request, data
+        )
+        operation = getattr(request, "persisted_operation", None)
+        if operation is not None:
+            query = operation.query
+            operation_name = operation_name or operation.operation_name
+        return query, variables, operation_name, id
+
+    def get_response(self, request, data, show_graphiql=False):
+        operation_id = get_operation_id(request, data)
+        if operation_id:
+            try:
+                operation = operation_registry.get(operation_id)
+            except InvalidOperation as e:
+                return self.error_response(request, str(e))
+            if operation is None:
+                return self.error_response(request, "PersistedQueryNotFound")
+            operation_registry.record_hit(operation_id)
+            request.persisted_operation = operation
+        elif settings.GRAPHQL_PERSISTED_OPERATIONS_STRICT and not show_graphiql:
+            return self.error_response(
+                request, "Only persisted operations are accepted."
+            )
+
+        query, variables, operation_name, _ = self.get_graphql_params(request, data)
+        if show_graphiql or not is_cacheable(query, variables):
+            return super().get_response(request, data, show_graphiql)
+
+        key = get_cache_key(
+            query,
+            variables,
+            operation_name,
+            pretty=bool(self.pretty or request.GET.get("pretty")),
+        )
+        cached = get_cached_response(key)
+        if cached is not None:
+            request.graphql_cache_status = "HIT"
+            return cached, 200
+
+        request.graphql_cache_status = "MISS"
+        result, status_code = super().get_response(request, data, show_graphiql)
+        if status_code == 200 and not getattr(request, "graphql_has_errors", True):
+            set_cached_response(key, result)
+        return result, status_code
+
+    def error_response(self, request, message):
+        return self.json_encode(request, {"errors": [{"message": message}]}), 400
+
+    def execute_graphql_request(self, request, data, query, variables, *args, **kwargs):
+        operation = getattr(request, "persisted_operation", None)
+        if operation is None:
+            execution_result = super().execute_graphql_request(
+                request, data, query, variables, *args, **kwargs
+            )
+        else:
+            execution_result = self.execute_persisted_operation(
+                request, operation, variables
+            )
+        # Partial results with field errors are not worth caching
+        request.graphql_has_errors = bool(
+            execution_result is None or execution_result.errors
+        )
+        return execution_result
+
+    def execute_persisted_operation(self, request, operation, variables):
+        # The document was parsed and validated when it was first loaded
+        try:
+            return execute(
+                self.schema.graphql_schema,
+                operation.document,
+                root_value=self.get_root_value(request),
+                context_value=self.get_context(request),
+                variable_values=variables,
+                operation_name=operation.operation_name or None,
+                middleware=self.get_middleware(request),
+            )
+        except Exception as e:
+            return ExecutionResult(errors=[e])
@@ -0,0 +1,50 @@
+from wagtail import hooks
+
+
+@hooks.register("register_schema_query")
+def register_cursor_pagination_query(query_mixins):
+    from .queries import CursorPaginationQuery
+
+    query_mixins.append(CursorPaginationQuery)
+
+
+@hooks.register("register_schema_query")
+def register_timetable_query(query_mixins):
+    from .queries import TimetableQuery
+
+    query_mixins.append(TimetableQuery)
+
+
+@hooks.register("register_schema_query")
+def register_itinerary_query(query_mixins):
+    from .queries import ItineraryQuery
+
+    query_mixins.append(ItineraryQuery)
+
+
+@hooks.register("register_schema_query")
+def register_operating_date_query(query_mixins):
+    from .queries import OperatingDateQuery
+
+    query_mixins.append(OperatingDateQuery)
+
+
+@hooks.register("register_schema_query")
+def register_port_pair_query(query_mixins):
+    from .queries import PortPairQuery
+
+    query_mixins.append(PortPairQuery)
+
+
+@hooks.register("register_schema_query")
+def register_available_port_pair_query(query_mixins):
+    from .queries import AvailablePortPairQuery
+
+    query_mixins.append(AvailablePortPairQuery)
+
+
+@hooks.register("register_schema_query")
+def register_airport_search_query(query_mixins):
+    from .queries import AirportSearchQuery
+
+    query_mixins.append(AirportSearchQuery)
@@ -34,6 +34,7 @@ BASE_DIR = os.path.dirname(PROJECT_DIR)
 
 INSTALLED_APPS = [
     "api",
+    "imports",
     "home",
     "search",
     "core",
@@ -72,6 +73,8 @@ INSTALLED_APPS = [
     "alerts",
     "contact",
     "storages",
+    "django_tasks",
+    "django_tasks.backends.database",
 ]
 
 MIDDLEWARE = [
@@ -124,6 +127,78 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Local memory by default (one cache per process). Set REDIS_URL to share the
+# cache between workers, so publish-driven invalidation reaches all of them.
+# A shared cache is required when imports run in a worker (see api.checks).
+
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "aerocode",
+        }
+    }
+
+# How long a cached GraphQL response may live before it is re-rendered, even
+# if nothing has been published in the meantime.
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = int(
+    os.environ.get("GRAPHQL_RESPONSE_CACHE_TIMEOUT", 60 * 60 * 24)
+)
+
+# Only accept operations registered with `manage.py ingest_persisted_operations`.
+# The frontend still sends full query text rather than operation hashes, so this
+# must stay off until it does; turning it on rejects every request it makes.
+GRAPHQL_PERSISTED_OPERATIONS_STRICT = (
+    os.environ.get("GRAPHQL_PERSISTED_OPERATIONS_STRICT") == "True"
+)
+
+# Itineraries: the shortest and longest layover allowed between two flights
+ITINERARY_MIN_CONNECTION_MINUTES = int(
+    os.environ.get("ITINERARY_MIN_CONNECTION_MINUTES", 45)
+)
+ITINERARY_MAX_CONNECTION_MINUTES = int(
+    os.environ.get("ITINERARY_MAX_CONNECTION_MINUTES", 12 * 60)
+)
+
+# Currency preferred for "fares from" prices when a route's fares are quoted
+# in several currencies
+FARES_DEFAULT_CURRENCY = os.environ.get("FARES_DEFAULT_CURRENCY", "SBD")
+
+# Background tasks
+# With a shared cache (REDIS_URL), Excel uploads are imported by a worker
+# (`manage.py db_worker --backend imports`, run as its own process) instead of
+# inside the request, and the same worker writes back persisted GraphQL
+# operation hit counts. The worker invalidates the GraphQL cache, which a
+# per-process cache would never see (the api.E001 system check enforces this),
+# so without REDIS_URL these tasks run inline. IMPORT_TASKS_BACKEND overrides
+# the choice.
+
+TASKS = {
+    "default": {
+        "BACKEND": "django_tasks.backends.immediate.ImmediateBackend",
+    },
+    "imports": {
+        "BACKEND": os.environ.get(
+            "IMPORT_TASKS_BACKEND",
+            (
+                "django_tasks.backends.database.DatabaseBackend"
+                if os.environ.get("REDIS_URL")
+                else "django_tasks.backends.immediate.ImmediateBackend"
+            ),
+        ),
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -218,7 +293,11 @@ WAGTAILDOCS_EXTENSIONS = ["pdf", "mp4", "webm", "ogg"]
 # GRAPHENE = {
 #     "SCHEMA": "api.schema.schema",
 # }
-GRAPHENE = {"SCHEMA": "grapple.schema.schema"}
+GRAPHENE = {
+    "SCHEMA": "grapple.schema.schema",
+    # Batch nested foreign key / reverse relation lookups per request
+    "MIDDLEWARE": ["api.batching.BatchingMiddleware"],
+}
 GRAPPLE = {
     "APPS": [
         "core",
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.urls import include, path
 from django.contrib import admin
+from django.views.decorators.csrf import csrf_exempt
 
 from grapple import urls as grapple_urls
 
@@ -10,6 +11,9 @@ from wagtail import urls as wagtail_urls
 from wagtail.documents import urls as wagtaildocs_urls
 
 from search import views as search_views
+from api import views as api_views
+from schedules import views as schedule_views
+from fares import views as fare_views
 
 urlpatterns = [
     path("django-admin/", admin.site.urls),
@@ -28,10 +32,26 @@ if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
 urlpatterns = urlpatterns + [
+    path(
+        "api/graphql/",
+        csrf_exempt(api_views.CachedGraphQLView.as_view()),
+        name="graphql",
+    ),
+    path(
+        "api/schedules/<int:schedule_id>/flights/",
+        schedule_views.schedule_flights,
+        name="schedule_flights",
+    ),
+    path("api/fares/matrix/", fare_views.fare_matrix, name="fare_matrix"),
+    path(
+        "api/fares/matrix/<str:origin>/",
+        fare_views.origin_fare_matrix,
+        name="origin_fare_matrix",
+    ),
+    path("api/", include(grapple_urls)),
     # For anything not caught by a more specific rule above, hand over to
     # Wagtail's page serving mechanism. This should be the last pattern in
     # the list:
-    path("api/", include(grapple_urls)),
     path("", include(wagtail_urls)),
     # Alternatively, if you want Wagtail pages to be served from a subpath
     # of your site, rather than the site root:
@@ -0,0 +1,140 @@
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+
+from api.cache import bump_cache_version, get_cache_version
+from .models import Airport
+
+# Advanced whenever an Airport changes (see core.signals)
+VERSION_KEY = "core:airports:version"
+
+# Match tiers, best first
+EXACT_CODE, CODE_PREFIX, CITY_PREFIX, WORD_PREFIX, SUBSTRING, FUZZY = range(6)
+
+# Share of the query's trigrams a fuzzy match must contain
+MIN_TRIGRAM_SIMILARITY = 0.6
+
+
+def invalidate_airports():
+    bump_cache_version(VERSION_KEY)
+
+
+def normalize(text):
+    """Lower-case text and strip accents, so "Nouméa" matches "noumea"."""
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(char for char in text if not unicodedata.combining(char)).lower()
+
+
+def get_trigrams(text):
+    """Return the trigrams of each word, padded like PostgreSQL's pg_trgm."""
+    trigrams = set()
+    for word in re.findall(r"\w+", text):
+        padded = f"  {word} "
+        trigrams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+class AirportIndex:
+    """
+    In-memory typeahead over airport code, city, name and country.
+
+    Prefix and substring tiers scan the normalized fields of every airport,
+    which for a few hundred airports is well under a millisecond; fuzzy
+    matches go through an inverted trigram index.
+    """
+
+    def __init__(self, airports):
+        self._entries = []
+        self._trigrams = defaultdict(list)
+        for position, airport in enumerate(airports):
+            code = normalize(airport.code)
+            city = normalize(airport.city)
+            text = " ".join(
+                [code, city, normalize(airport.name), normalize(airport.country)]
+            )
+            self._entries.append((airport, code, city, text, text.split()))
+            for trigram in get_trigrams(text):
+                self._trigrams[trigram].append(position)
+
+    def get_tier(self, query, entry):
+        airport, code, city, text, words = entry
+        if code == query:
+            return EXACT_CODE
+        if code.startswith(query):
+            return CODE_PREFIX
+        if city.startswith(query):
+            return CITY_PREFIX
+        if any(word.startswith(query) for word in words):
+            return WORD_PREFIX
+        if query in text:
+            return SUBSTRING
+        return None
+
+    def search(self, query, limit=10):
+        """
+        Return the airports matching a typed query, best match first.
+
+        Exact code matches rank first, then code prefixes, city prefixes,
+        prefixes of any word (name, country, ...), substrings and finally
+        fuzzy trigram matches, each tier ordered by city.
+
+        Args:
+            query (str): The text typed so far.
+            limit (int): The number of airports to return.
+
+        Returns:
+            list: Airport objects.
+        """
+        query = normalize(query).strip()
+        if not query:
+            return []
+
+        ranked = []
+        for position, entry in enumerate(self._entries):
+            tier = self.get_tier(query, entry)
+            if tier is not None:
+                ranked.append((tier, 0, entry[2], position))
+
+        if len(ranked) < limit:
+            matched = {position for *_, position in ranked}
+            trigrams = get_trigrams(query)
+            shared = Counter(
+                position
+                for trigram in trigrams
+                for position in self._trigrams.get(trigram, [])
+                if position not in matched
+            )
+            for position, count in shared.items():
+                similarity = count / len(trigrams)
+                if similarity >= MIN_TRIGRAM_SIMILARITY:
+                    ranked.append(
+                        (FUZZY, -similarity, self._entries[position][2], position)
+                    )
+
+        ranked.sort()
+        return [self._entries[position][0] for *_, position in ranked[:limit]]
+
+
+_index = None
+_index_version = None
+_lock = threading.Lock()
+
+
+def get_airport_index():
+    """Return this process's airport index, rebuilding it after changes."""
+    global _index, _index_version
+
+    version = get_cache_version(VERSION_KEY)
+    if _index is not None and _index_version == version:
+        return _index
+
+    with _lock:
+        if _index is None or _index_version != version:
+            _index = AirportIndex(Airport.objects.select_related("destination_image"))
+            _index_version = version
+        return _index
+
+
+def search_airports(query, limit=10):
+    return get_airport_index().search(query, limit)
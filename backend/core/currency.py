@@ -0,0 +1,96 @@
+import graphene
+import numpy as np
+from django.conf import settings
+from grapple.models import GraphQLField
+
+from api.cache import bump_cache_version, get_cache_version
+from .models import ExchangeRate
+
+# Advanced whenever an exchange rate changes (see core.signals and
+# core.importer)
+VERSION_KEY = "core:exchange_rates:version"
+
+# The last rates this process loaded, as (cache generation, rates)
+_loaded = (None, None)
+
+
+def invalidate_exchange_rates():
+    bump_cache_version(VERSION_KEY)
+
+
+def get_rates():
+    """
+    Return the exchange rates as currency code -> units per base currency.
+
+    The base currency (settings.FARES_DEFAULT_CURRENCY) is always 1. Rates
+    are reloaded after an exchange rate changes, so every process sees edits
+    on its next lookup.
+    """
+    global _loaded
+
+    version = get_cache_version(VERSION_KEY)
+    loaded_version, rates = _loaded
+    if loaded_version == version:
+        return rates
+
+    rates = {
+        code.upper(): float(rate)
+        for code, rate in ExchangeRate.objects.values_list("currency_code", "rate")
+    }
+    rates[settings.FARES_DEFAULT_CURRENCY.upper()] = 1.0
+    _loaded = (version, rates)
+    return rates
+
+
+def convert_prices(prices, currencies, to_currency, rates=None):
+    """
+    Convert a list of prices, each in its own currency, into one currency.
+
+    The conversion factor is worked out once per distinct currency and
+    applied to every price in a single NumPy operation.
+
+    Args:
+        prices (iterable): Prices, as numbers or Decimals.
+        currencies (iterable): The currency code of each price.
+        to_currency (str): The currency code to convert to.
+        rates (dict): Exchange rates; defaults to get_rates().
+
+    Returns:
+        ndarray: The converted prices rounded to cents, NaN where either
+        currency has no (or a zero) rate.
+    """
+    rates = get_rates() if rates is None else rates
+    prices = np.asarray(prices, dtype=float)
+    if not len(prices):
+        return prices
+
+    codes, positions = np.unique(
+        np.char.upper(np.asarray(currencies, dtype=str)), return_inverse=True
+    )
+    # A missing or zero rate converts to NaN rather than failing
+    target = rates.get(to_currency.upper()) or np.nan
+    factors = np.array([target / (rates.get(code) or np.nan) for code in codes])
+    return np.round(prices * factors[positions], 2)
+
+
+def GraphQLConvertible(field_name, field_type, source, **kwargs):
+    """
+    A Grapple field taking an optional ``currency`` argument.
+
+    It resolves by calling the model method ``source`` as
+    ``method(info, currency=None)``.
+    """
+
+    def Mixin():
+        return (
+            GraphQLField(field_name, field_type, source=source, **kwargs),
+            lambda resolved_type: graphene.Field(
+                resolved_type,
+                currency=graphene.String(
+                    description="Currency code to convert the price to"
+                ),
+                description=kwargs.get("description"),
+            ),
+        )
+
+    return Mixin
@@ -0,0 +1,127 @@
+import logging
+from decimal import Decimal
+
+import pandas as pd
+from django.db import transaction
+
+from imports.importers import ImportResult, check_columns, invalidate_imported_content
+from .currency import invalidate_exchange_rates
+from .models import ExchangeRate
+
+logger = logging.getLogger(__name__)
+
+EXPECTED_COLUMNS = ["Currency", "Rate"]
+
+# Fields rewritten when an uploaded rate matches a stored currency
+UPDATE_FIELDS = ["rate", "updated_at"]
+
+RATE_PLACES = Decimal("0.00000001")
+
+
+class ExchangeRateImportResult(ImportResult):
+    def __init__(self):
+        super().__init__()
+        self.updated = 0
+        self.unchanged = 0
+
+    def get_messages(self):
+        messages = []
+        if self.created > 0:
+            messages.append(["success", f"Added {self.created} exchange rates."])
+        if self.updated > 0:
+            messages.append(
+                ["success", f"Updated {self.updated} existing exchange rates."]
+            )
+        if not (self.created or self.updated):
+            if self.unchanged:
+                messages.append(
+                    [
+                        "info",
+                        f"All {self.unchanged} exchange rates are already up to date.",
+                    ]
+                )
+            else:
+                messages.append(["warning", "No exchange rates uploaded. Check data."])
+        if self.skipped_rows:
+            messages.append(
+                ["warning", f"Skipped rows {self.skipped_rows} due to invalid data."]
+            )
+        return messages
+
+
+def import_exchange_rates(df, progress=None):
+    """
+    Import exchange rates from an uploaded sheet.
+
+    Each row gives a currency code and how many units of it one unit of
+    settings.FARES_DEFAULT_CURRENCY buys. Rates that differ from the stored
+    ones are upserted on the currency code in a single statement; a currency
+    repeated in the sheet takes its last rate.
+
+    Args:
+        df (DataFrame): The uploaded sheet.
+        progress (callable): Called as ``progress(rows_processed, created,
+            skipped)`` once the rates are saved.
+
+    Returns:
+        ExchangeRateImportResult: Counts of created, updated and unchanged
+        rates and the skipped rows.
+
+    Raises:
+        InvalidSheet: If expected columns are missing.
+    """
+    check_columns(df, EXPECTED_COLUMNS)
+    result = ExchangeRateImportResult()
+
+    df["Currency"] = df["Currency"].astype("string").str.strip().str.upper()
+    df["Rate"] = pd.to_numeric(df["Rate"], errors="coerce")
+
+    max_length = ExchangeRate._meta.get_field("currency_code").max_length
+    invalid_rows = (
+        df["Currency"].isna()
+        | (df["Currency"].str.len() > max_length).fillna(False)
+        | df["Rate"].isna()
+        | (df["Rate"] <= 0)
+    )
+    for index in df.index[invalid_rows]:
+        result.skipped_rows.append(index)
+        logger.warning(f"Skipped row {index}: Invalid or missing currency or rate")
+
+    valid = df[~invalid_rows].drop_duplicates("Currency", keep="last")
+    existing = dict(
+        ExchangeRate.objects.filter(
+            currency_code__in=valid["Currency"].tolist()
+        ).values_list("currency_code", "rate")
+    )
+    rates = []
+    for currency, rate in zip(valid["Currency"], valid["Rate"]):
+        rate = Decimal(str(rate)).quantize(RATE_PLACES)
+        stored = existing.get(currency)
+        if stored == rate:
+            result.unchanged += 1
+            continue
+        if stored is None:
+            result.created += 1
+        else:
+            result.updated += 1
+        rates.append(ExchangeRate(currency_code=currency, rate=rate))
+
+    if rates:
+        with transaction.atomic():
+            ExchangeRate.objects.bulk_create(
+                rates,
+                update_conflicts=True,
+                unique_fields=["currency_code"],
+                update_fields=UPDATE_FIELDS,
+            )
+        invalidate_exchange_rates()
+        # Converted prices are cached with the responses
+        invalidate_imported_content()
+    logger.info(
+        f"Imported exchange rates: {result.created} added, {result.updated} updated, "
+        f"{result.unchanged} unchanged"
+    )
+    if progress:
+        progress(len(df), result.created, len(result.skipped_rows))
+
+    return result
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-18 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0041_alter_genericpage_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency_code', models.CharField(help_text='Currency code (e.g., AUD, USD)', max_length=10, unique=True)),
+                ('rate', models.DecimalField(decimal_places=8, help_text='Units of this currency per one unit of the base currency', max_digits=18)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Exchange Rate',
+                'verbose_name_plural': 'Exchange Rates',
+                'ordering': ['currency_code'],
+            },
+        ),
+    ]
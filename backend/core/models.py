@@ -313,6 +313,41 @@ class Currency(models.Model):
         verbose_name_plural = "Currencies"
 
 
+class ExchangeRate(models.Model):
+    """
+    How many units of a currency one unit of the base currency
+    (settings.FARES_DEFAULT_CURRENCY) buys, for converting fare prices.
+    """
+
+    currency_code = models.CharField(
+        max_length=10, unique=True, help_text="Currency code (e.g., AUD, USD)"
+    )
+    rate = models.DecimalField(
+        max_digits=18,
+        decimal_places=8,
+        help_text="Units of this currency per one unit of the base currency",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    panels = [
+        FieldPanel("currency_code"),
+        FieldPanel("rate"),
+    ]
+
+    def clean(self):
+        self.currency_code = self.currency_code.strip().upper()
+        if self.rate is not None and self.rate <= 0:
+            raise ValidationError({"rate": "The rate must be greater than zero."})
+
+    def __str__(self):
+        return f"{self.currency_code} {self.rate}"
+
+    class Meta:
+        verbose_name = "Exchange Rate"
+        verbose_name_plural = "Exchange Rates"
+        ordering = ["currency_code"]
+
+
 class AirportQuerySet(QuerySet):
     def search(self, query, **kwargs):
         """
@@ -453,6 +488,14 @@ class PortPair(index.Indexed, models.Model):
         GraphQLString("destination_port_name", name="destinationPortName"),
     ]
 
+    # The *_port_* properties dereference these FKs; prefetch them per request
+    graphql_prefetch = {
+        "origin_port_code": ["origin_port"],
+        "destination_port_code": ["destination_port"],
+        "origin_port_name": ["origin_port"],
+        "destination_port_name": ["destination_port"],
+    }
+
     objects = PortPairQuerySet.as_manager()
 
     def __str__(self):
@@ -0,0 +1,122 @@
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+from wagtail.search.backends import get_search_backends
+
+from api.cache import bump_cache_version, get_cache_version, invalidate_graphql_cache
+from .models import Airport, PortPair
+
+# Advanced whenever a PortPair or Airport changes (see core.signals)
+VERSION_KEY = "core:port_pairs:version"
+
+
+def invalidate_port_pairs():
+    bump_cache_version(VERSION_KEY)
+
+
+def build_port_pair_index():
+    """
+    Map each origin code to its port pairs, ordered by destination city.
+
+    Both airports are loaded with the pairs in a single joined query, so the
+    code and name properties never query again.
+
+    Returns:
+        dict: Origin code -> list of PortPair.
+    """
+    index = defaultdict(list)
+    port_pairs = PortPair.objects.select_related(
+        "origin_port", "destination_port"
+    ).order_by("destination_port__city", "destination_port__code")
+    for port_pair in port_pairs:
+        index[port_pair.origin_port.code.upper()].append(port_pair)
+    return dict(index)
+
+
+_index = None
+_index_version = None
+_lock = threading.Lock()
+
+
+def get_port_pair_index():
+    """Return this process's port pair index, rebuilding it after changes."""
+    global _index, _index_version
+
+    version = get_cache_version(VERSION_KEY)
+    if _index is not None and _index_version == version:
+        return _index
+
+    with _lock:
+        if _index is None or _index_version != version:
+            _index = build_port_pair_index()
+            _index_version = version
+        return _index
+
+
+def get_port_pairs_from(origin):
+    """Return the port pairs departing from an origin code."""
+    return get_port_pair_index().get(origin.upper(), [])
+
+
+def save_port_pairs(origin_codes, pairs):
+    """
+    Make the stored port pairs of some origins match the submitted ones.
+
+    Only the difference is written: one query resolves every airport code,
+    then stale pairs are deleted and new ones added with a single
+    bulk_create, inside one transaction. Unchanged pairs keep their primary
+    keys. New pairs are then added to the search index in bulk and the
+    caches invalidated.
+
+    Args:
+        origin_codes (iterable): The origins being edited. Pairs of other
+            origins are left alone.
+        pairs (iterable): The wanted (origin code, destination code) pairs.
+            Pairs of origins not in origin_codes, unknown codes and pairs
+            from a port to itself are ignored.
+
+    Returns:
+        tuple: The number of pairs created and deleted.
+    """
+    origin_codes = set(origin_codes)
+    codes = origin_codes | {code for pair in pairs for code in pair}
+    airports = Airport.objects.filter(code__in=codes).in_bulk(field_name="code")
+    wanted = {
+        (origin, destination)
+        for origin, destination in pairs
+        if origin in origin_codes
+        and origin != destination
+        and origin in airports
+        and destination in airports
+    }
+
+    with transaction.atomic():
+        existing = {
+            (origin, destination): pk
+            for pk, origin, destination in PortPair.objects.filter(
+                origin_port__code__in=origin_codes
+            ).values_list("pk", "origin_port__code", "destination_port__code")
+        }
+        stale = [pk for pair, pk in existing.items() if pair not in wanted]
+        new = [
+            PortPair(
+                origin_port=airports[origin], destination_port=airports[destination]
+            )
+            for origin, destination in wanted - existing.keys()
+        ]
+        if stale:
+            # delete() sends post_delete, which removes the pairs from the
+            # search index and invalidates the caches
+            PortPair.objects.filter(pk__in=stale).delete()
+        if new:
+            PortPair.objects.bulk_create(new)
+
+    # bulk_create() skips the signals that keep the search index current
+    if new:
+        for backend in get_search_backends():
+            backend.add_bulk(PortPair, new)
+    if stale or new:
+        invalidate_port_pairs()
+        invalidate_graphql_cache()
+    return len(new), len(stale)
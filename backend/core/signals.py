@@ -0,0 +1,59 @@
+from django.db.models.signals import post_delete, post_save
+
+from .airport_search import invalidate_airports
+from .currency import invalidate_exchange_rates
+from .models import Airport, ExchangeRate, PortPair
+from .port_pairs import invalidate_port_pairs
+
+
+def invalidate_port_pairs_on_change(sender, **kwargs):
+    invalidate_port_pairs()
+
+
+def invalidate_airports_on_change(sender, **kwargs):
+    invalidate_airports()
+
+
+def invalidate_exchange_rates_on_change(sender, **kwargs):
+    invalidate_exchange_rates()
+
+
+def register_signal_handlers():
+    """
+    Rebuild the port pair index whenever a port pair or airport changes, the
+    airport search index whenever an airport changes and reload the exchange
+    rates whenever one changes.
+    """
+    for model in [Airport, PortPair]:
+        post_save.connect(
+            invalidate_port_pairs_on_change,
+            sender=model,
+            dispatch_uid=f"port_pairs_save_{model._meta.label_lower}",
+        )
+        post_delete.connect(
+            invalidate_port_pairs_on_change,
+            sender=model,
+            dispatch_uid=f"port_pairs_delete_{model._meta.label_lower}",
+        )
+
+    post_save.connect(
+        invalidate_airports_on_change,
+        sender=Airport,
+        dispatch_uid="airports_save",
+    )
+    post_delete.connect(
+        invalidate_airports_on_change,
+        sender=Airport,
+        dispatch_uid="airports_delete",
+    )
+
+    post_save.connect(
+        invalidate_exchange_rates_on_change,
+        sender=ExchangeRate,
+        dispatch_uid="exchange_rates_save",
+    )
+    post_delete.connect(
+        invalidate_exchange_rates_on_change,
+        sender=ExchangeRate,
+        dispatch_uid="exchange_rates_delete",
+    )
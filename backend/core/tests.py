@@ -1,3 +1,169 @@
+import math
+from decimal import Decimal
+
+import pandas as pd
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from api.cache import get_cache_version, invalidate_graphql_cache
+from .airport_search import search_airports
+from .currency import convert_prices, get_rates
+from .importer import import_exchange_rates
+from .models import Airport, ExchangeRate, PortPair
+from .port_pairs import get_port_pairs_from, save_port_pairs
+
+
+class SavePortPairsTests(TestCase):
+    def setUp(self):
+        for code in ["HIR", "GZO", "MUA", "BNE"]:
+            Airport.objects.create(
+                code=code, name=code, city=code, country="Solomon Islands"
+            )
+        save_port_pairs(["HIR"], [("HIR", "GZO"), ("HIR", "MUA")])
+
+    def get_pairs(self):
+        return set(
+            PortPair.objects.values_list("origin_port__code", "destination_port__code")
+        )
+
+    def test_only_the_difference_is_written(self):
+        kept = PortPair.objects.get(destination_port__code="GZO").pk
+        created, deleted = save_port_pairs(
+            ["HIR"], [("HIR", "GZO"), ("HIR", "BNE"), ("HIR", "XXX"), ("GZO", "HIR")]
+        )
+        self.assertEqual((created, deleted), (1, 1))
+        self.assertEqual(self.get_pairs(), {("HIR", "GZO"), ("HIR", "BNE")})
+        self.assertTrue(PortPair.objects.filter(pk=kept).exists())
+
+    def test_index_sees_changes(self):
+        self.assertEqual(
+            {pair.destination_port_code for pair in get_port_pairs_from("HIR")},
+            {"GZO", "MUA"},
+        )
+        save_port_pairs(["HIR"], [("HIR", "BNE")])
+        self.assertEqual(
+            [pair.destination_port_code for pair in get_port_pairs_from("HIR")],
+            ["BNE"],
+        )
+
+
+class AirportSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        for code, city, name, country in [
+            ("HIR", "Honiara", "Honiara International", "Solomon Islands"),
+            ("HIN", "Apia", "Faleolo", "Samoa"),
+            ("ITO", "Hilo", "Hilo", "United States"),
+            ("AAA", "Zed", "Hibiscus Field", "Fiji"),
+            ("CNX", "Chiang Mai", "Chiang Mai", "Thailand"),
+            ("NOU", "Nouméa", "La Tontouta", "New Caledonia"),
+        ]:
+            Airport.objects.create(code=code, city=city, name=name, country=country)
+
+    def search(self, query, limit=10):
+        return [airport.code for airport in search_airports(query, limit)]
+
+    def test_tiers(self):
+        # Code prefixes (by city), city prefix, word prefix, then substring
+        self.assertEqual(self.search("hi"), ["HIN", "HIR", "ITO", "AAA", "CNX"])
+        self.assertEqual(self.search("HIR"), ["HIR"])
+        self.assertEqual(self.search("hi", limit=2), ["HIN", "HIR"])
+
+    def test_accents_are_folded(self):
+        self.assertEqual(self.search("noumea"), ["NOU"])
+        self.assertEqual(self.search("NOUMÉA"), ["NOU"])
+
+    def test_fuzzy_matches_need_enough_shared_trigrams(self):
+        # "honiarra" shares 7 of its 9 trigrams with "honiara", "honiqqq"
+        # only 4 of 8
+        self.assertEqual(self.search("honiarra"), ["HIR"])
+        self.assertEqual(self.search("honiqqq"), [])
+
+    def test_index_is_rebuilt_after_an_airport_changes(self):
+        self.assertEqual(self.search("kira"), [])
+        with self.assertNumQueries(0):
+            self.search("honiara")
+
+        Airport.objects.create(
+            code="IRA", city="Kirakira", name="Ngorangora", country="Solomon Islands"
+        )
+        self.assertEqual(self.search("kira"), ["IRA"])
+
+        airport = Airport.objects.get(code="HIN")
+        airport.city = "Kira"
+        airport.save()
+        self.assertEqual(self.search("kira"), ["HIN", "IRA"])
+
+
+def rate_sheet(*rows):
+    return pd.DataFrame(rows, columns=["Currency", "Rate"])
+
+
+class ExchangeRateImporterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        import_exchange_rates(rate_sheet(("AUD", 0.18), ("FJD", 0.27)))
+
+    def test_only_changed_rates_count_as_updated(self):
+        version = get_cache_version()
+        result = import_exchange_rates(
+            rate_sheet((" aud ", "0.18"), ("FJD", 0.28), ("USD", 0.12))
+        )
+        self.assertEqual((result.created, result.updated, result.unchanged), (1, 1, 1))
+        self.assertEqual(
+            dict(ExchangeRate.objects.values_list("currency_code", "rate")),
+            {"AUD": Decimal("0.18"), "FJD": Decimal("0.28"), "USD": Decimal("0.12")},
+        )
+        self.assertNotEqual(get_cache_version(), version)
+        self.assertEqual(get_rates()["FJD"], 0.28)
+
+    def test_unchanged_import(self):
+        version = get_cache_version()
+        result = import_exchange_rates(rate_sheet(("AUD", 0.18), ("FJD", 0.27)))
+        self.assertEqual((result.created, result.updated, result.unchanged), (0, 0, 2))
+        self.assertEqual(
+            result.get_messages(),
+            [["info", "All 2 exchange rates are already up to date."]],
+        )
+        self.assertEqual(get_cache_version(), version)
+
+    def test_invalid_rows(self):
+        result = import_exchange_rates(
+            rate_sheet(("AUD", 0), ("FJD", "n/a"), (None, 1), ("TOO LONG CODE", 1))
+        )
+        self.assertEqual(result.skipped_rows, [0, 1, 2, 3])
+        self.assertEqual(ExchangeRate.objects.count(), 2)
+
+
+class CurrencyTests(TestCase):
+    rates = {"SBD": 1.0, "AUD": 0.2, "FJD": 0.25, "USD": 0.0, "XPF": math.nan}
+
+    def setUp(self):
+        cache.clear()
+
+    def convert(self, prices, currencies, to_currency):
+        return convert_prices(prices, currencies, to_currency, self.rates).tolist()
+
+    def test_convert_prices(self):
+        self.assertEqual(
+            self.convert([100, Decimal("10.00"), 3], ["sbd", "AUD", "FJD"], "aud"),
+            [20.0, 10.0, 2.4],
+        )
+        self.assertEqual(self.convert([], [], "AUD"), [])
+
+    def test_missing_zero_and_nan_rates_convert_to_nan(self):
+        converted = self.convert([10, 10, 10, 10], ["SBD", "XXX", "USD", "XPF"], "FJD")
+        self.assertEqual(converted[0], 2.5)
+        self.assertTrue(all(math.isnan(price) for price in converted[1:]))
+        for to_currency in ["XXX", "USD"]:
+            self.assertTrue(math.isnan(self.convert([10], ["SBD"], to_currency)[0]))
+
+    def test_rates_are_reloaded_only_after_a_rate_changes(self):
+        ExchangeRate.objects.create(currency_code="AUD", rate=Decimal("0.2"))
+        self.assertEqual(get_rates(), {"AUD": 0.2, "SBD": 1.0})
+        invalidate_graphql_cache()
+        with self.assertNumQueries(0):
+            get_rates()
+
+        ExchangeRate.objects.get(currency_code="AUD").delete()
+        self.assertEqual(get_rates(), {"SBD": 1.0})
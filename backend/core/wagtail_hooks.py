@@ -1,14 +1,19 @@
 from wagtail import hooks
 from wagtail.admin.menu import MenuItem, Menu, SubmenuMenuItem
+from django.conf import settings
 from django.urls import path, reverse
 from django.shortcuts import render, redirect
+from django.contrib import messages
 from django.views.generic import View
 from wagtail.snippets.models import register_snippet
 from wagtail.snippets.views.snippets import SnippetViewSet
-from .models import HeaderMenu, FooterMenu, Currency, Airport, PortPair
+from .models import HeaderMenu, FooterMenu, Currency, ExchangeRate, Airport, PortPair
+from .port_pairs import save_port_pairs
 from home.models import CarouselSlide
 from fares.models import Fare
 from schedules.models import Schedule
+from imports.models import ImportJob
+from imports.views import EXCEL_EXTENSIONS, enqueue_import, get_recent_jobs
 
 
 # We'll register the menu items after the snippet admins are created
@@ -34,6 +39,12 @@ def get_menus_submenu():
             name="currencies",
             icon_name="cog",
         ),
+        MenuItem(
+            label="Exchange Rates",
+            url="/admin/snippets/core/exchangerate/",
+            name="exchange_rates",
+            icon_name="cog",
+        ),
     ])
     
     return SubmenuMenuItem(
@@ -113,7 +124,9 @@ class PortPairManagementView(View):
     
     def get(self, request):
         """Display the port pair management interface"""
-        
+        if request.GET.get('view') == 'matrix':
+            return self.get_matrix(request)
+
         # Get all airports directly from Airport model
         all_ports = list(Airport.objects.all().values_list('code', 'name', 'city', 'country'))
         
@@ -167,33 +180,57 @@ class PortPairManagementView(View):
         })
 
     def post(self, request):
-        """Handle port pair updates"""
-        selected_port = request.POST.get('port')
-        paired_destinations = request.POST.getlist('paired_destinations')
-        
-        if selected_port:
-            try:
-                origin_airport = Airport.objects.get(code=selected_port)
-                
-                # Remove all existing pairs for this origin port
-                PortPair.objects.filter(origin_port=origin_airport).delete()
-                
-                # Create new pairs for checked destinations
-                for dest_port_code in paired_destinations:
-                    try:
-                        dest_airport = Airport.objects.get(code=dest_port_code)
-                        PortPair.objects.get_or_create(
-                            origin_port=origin_airport,
-                            destination_port=dest_airport
-                        )
-                    except Airport.DoesNotExist:
-                        continue  # Skip if destination airport doesn't exist
-                        
-            except Airport.DoesNotExist:
-                pass  # Skip if origin airport doesn't exist
-            
-        
-        return redirect(f'{request.path}?port={selected_port}')
+        """Handle port pair updates for one origin, or for all from the matrix"""
+        if request.POST.get('matrix'):
+            origins = Airport.objects.values_list('code', flat=True)
+            pairs = [
+                tuple(value.split(':', 1))
+                for value in request.POST.getlist('pairs')
+                if ':' in value
+            ]
+            redirect_url = f'{request.path}?view=matrix'
+        else:
+            selected_port = request.POST.get('port')
+            origins = [selected_port] if selected_port else []
+            pairs = [
+                (selected_port, dest_port_code)
+                for dest_port_code in request.POST.getlist('paired_destinations')
+            ]
+            redirect_url = f'{request.path}?port={selected_port}'
+
+        if origins:
+            created, deleted = save_port_pairs(origins, pairs)
+            messages.success(
+                request, f'Port pairs saved: {created} added, {deleted} removed.'
+            )
+
+        return redirect(redirect_url)
+
+    def get_matrix(self, request):
+        """Display every origin against every destination in one grid"""
+        airports = list(Airport.objects.order_by('city').values_list('code', 'city'))
+        existing_pairs = set(
+            PortPair.objects.values_list('origin_port__code', 'destination_port__code')
+        )
+        rows = [
+            {
+                'code': origin_code,
+                'city': origin_city,
+                'cells': [
+                    {
+                        'value': f'{origin_code}:{dest_code}',
+                        'is_self': dest_code == origin_code,
+                        'is_paired': (origin_code, dest_code) in existing_pairs,
+                    }
+                    for dest_code, dest_city in airports
+                ],
+            }
+            for origin_code, origin_city in airports
+        ]
+        return render(request, 'explore/port_pair_matrix.html', {
+            'airports': airports,
+            'rows': rows,
+        })
 
 
 # Custom snippet admin classes that don't appear in snippets menu
@@ -209,6 +246,11 @@ class CurrencyAdmin(SnippetViewSet):
     model = Currency
     add_to_admin_menu = False  # Hide from snippets menu
 
+class ExchangeRateAdmin(SnippetViewSet):
+    model = ExchangeRate
+    add_to_admin_menu = False  # Hide from snippets menu
+    list_display = ["currency_code", "rate", "updated_at"]
+
 class CarouselSlideAdmin(SnippetViewSet):
     model = CarouselSlide
     add_to_admin_menu = False  # Hide from snippets menu
@@ -229,6 +271,7 @@ class AirportAdmin(SnippetViewSet):
 register_snippet(HeaderMenu, HeaderMenuAdmin)
 register_snippet(FooterMenu, FooterMenuAdmin) 
 register_snippet(Currency, CurrencyAdmin)
+register_snippet(ExchangeRate, ExchangeRateAdmin)
 register_snippet(CarouselSlide, CarouselSlideAdmin)
 register_snippet(Fare, FareAdmin)
 register_snippet(Schedule, ScheduleAdmin)
@@ -270,6 +313,34 @@ def register_port_pair_urls():
 
 hooks.register("register_admin_urls", register_port_pair_urls)
 
+
+class ExchangeRateUploadView(View):
+    def post(self, request):
+        return enqueue_import(
+            request,
+            ImportJob.KIND_EXCHANGE_RATES,
+            extensions=(".csv", *EXCEL_EXTENSIONS),
+        )
+
+    def get(self, request):
+        return render(request, 'explore/upload_exchange_rates.html', {
+            'base_currency': settings.FARES_DEFAULT_CURRENCY,
+            'exchange_rates': ExchangeRate.objects.all(),
+            'recent_jobs': get_recent_jobs(ImportJob.KIND_EXCHANGE_RATES),
+        })
+
+
+def register_exchange_rate_upload_urls():
+    return [
+        path(
+            "exchange-rate-upload/",
+            ExchangeRateUploadView.as_view(),
+            name="exchange_rate_upload",
+        ),
+    ]
+
+hooks.register("register_admin_urls", register_exchange_rate_upload_urls)
+
 # Register all menu items
 hooks.register("register_admin_menu_item", get_menus_submenu)
 hooks.register("register_admin_menu_item", get_travel_alerts_menu_item)
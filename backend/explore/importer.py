@@ -0,0 +1,440 @@
+import logging
+from decimal import Decimal
+
+import pandas as pd
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.text import slugify
+from wagtail.models import Page
+
+from core.models import Airport, Currency
+from imports.importers import ImportResult, check_columns, invalidate_imported_content
+from .models import Destination, Route, Special, SpecialRoute
+from .rankings import sync_route_rankings
+
+logger = logging.getLogger(__name__)
+
+EXPECTED_COLUMNS = [
+    "Special ID",
+    "Route",
+    "Starting Price",
+    "Trip Type",
+    "Currency",
+]
+
+TRIP_TYPES = ["one way", "return"]
+
+# Fields rewritten when an uploaded special fare matches a stored
+# (special, route)
+SPECIAL_ROUTE_UPDATE_FIELDS = ["starting_price", "trip_type", "currency"]
+
+CENT = Decimal("0.01")
+
+ROUTE_COLUMNS = ["Origin", "Destination"]
+
+# Accepted values of the optional "Flight Scope" column
+FLIGHT_SCOPES = {
+    "domestic": "domestic route",
+    "domestic route": "domestic route",
+    "international": "international route",
+    "international route": "international route",
+}
+
+
+class SpecialRouteImportResult(ImportResult):
+    def __init__(self):
+        super().__init__()
+        self.updated = 0
+        self.unchanged = 0
+        self.duplicate_special_routes = []
+
+    def get_messages(self):
+        messages = []
+        if self.created > 0:
+            messages.append(["success", f"Uploaded {self.created} special fares."])
+        if self.updated > 0:
+            messages.append(
+                ["success", f"Updated {self.updated} existing special fares."]
+            )
+        if not (self.created or self.updated):
+            if self.unchanged:
+                messages.append(
+                    [
+                        "info",
+                        f"All {self.unchanged} special fares are already up to date.",
+                    ]
+                )
+            else:
+                messages.append(["warning", "No special fares uploaded. Check data."])
+
+        if self.duplicate_special_routes:
+            messages.append(
+                [
+                    "error",
+                    f"Duplicate special fares found: {'; '.join(self.duplicate_special_routes)}. Each special must be unique for a given route.",
+                ]
+            )
+
+        if self.skipped_rows:
+            messages.append(
+                ["warning", f"Skipped rows {self.skipped_rows} due to invalid data."]
+            )
+        return messages
+
+
+def get_code(value):
+    """Return a sheet cell as a lookup code, so 1234.0 read by Excel is "1234"."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def import_special_routes(df, progress=None):
+    """
+    Import special fares from an uploaded sheet.
+
+    Specials, routes and currencies are each loaded once into a dictionary
+    and the sheet is validated column-wise. Special fares are then upserted
+    on their (special, route) key in a single statement inside a
+    transaction, so an uploaded price replaces the stored one. Invalid rows
+    and unknown specials, routes and currencies are reported per row as
+    before; rows repeating an earlier row's special and route are reported
+    as duplicates.
+
+    Args:
+        df (DataFrame): The uploaded sheet.
+        progress (callable): Called as ``progress(rows_processed, created,
+            skipped)`` once the special fares are saved.
+
+    Returns:
+        SpecialRouteImportResult: Counts of created, updated and unchanged
+        special fares, duplicates and skipped rows.
+
+    Raises:
+        InvalidSheet: If expected columns are missing.
+    """
+    check_columns(df, EXPECTED_COLUMNS)
+    result = SpecialRouteImportResult()
+
+    # Parse price as numeric
+    df["Starting Price"] = pd.to_numeric(df["Starting Price"], errors="coerce")
+    trip_types = df["Trip Type"].astype("string").str.strip().str.lower()
+
+    invalid = pd.DataFrame(index=df.index)
+    for column in EXPECTED_COLUMNS:
+        invalid[column] = df[column].isna()
+    invalid["Trip Type"] |= ~trip_types.isin(TRIP_TYPES)
+    invalid_rows = invalid.any(axis=1)
+    for index in df.index[invalid_rows]:
+        invalid_fields = invalid.columns[invalid.loc[index]].tolist()
+        result.skipped_rows.append(index)
+        logger.warning(
+            f"Skipped row {index}: Invalid or missing fields: {', '.join(invalid_fields)}"
+        )
+
+    valid = df[~invalid_rows]
+    special_codes = valid["Special ID"].map(get_code)
+    route_names = valid["Route"].map(get_code)
+    currency_codes = valid["Currency"].map(get_code)
+    specials = Special.objects.filter(special_code__in=set(special_codes)).in_bulk(
+        field_name="special_code"
+    )
+    routes = Route.objects.filter(name__in=set(route_names)).in_bulk(field_name="name")
+    currencies = {}
+    for currency in Currency.objects.filter(currency_code__in=set(currency_codes)):
+        # Codes are not unique; an ambiguous code cannot be resolved
+        currencies[currency.currency_code] = (
+            None if currency.currency_code in currencies else currency
+        )
+
+    special_routes = {}
+    for index, special_code, route_name, currency_code in zip(
+        valid.index, special_codes, route_names, currency_codes
+    ):
+        special = specials.get(special_code)
+        if special is None:
+            logger.error(f"Special with ID {special_code} does not exist")
+            result.skipped_rows.append(index)
+            continue
+        route = routes.get(route_name)
+        if route is None:
+            logger.error(f"Route {route_name} does not exist")
+            result.skipped_rows.append(index)
+            continue
+        currency = currencies.get(currency_code)
+        if currency is None:
+            logger.error(f"Currency code {currency_code} does not exist")
+            result.skipped_rows.append(index)
+            continue
+
+        if (special.pk, route.pk) in special_routes:
+            result.duplicate_special_routes.append(
+                f"{special.name} for route {route.name}"
+            )
+            logger.warning(
+                f"Duplicate special fare: {special.name} for route {route.name}"
+            )
+            continue
+
+        special_routes[(special.pk, route.pk)] = SpecialRoute(
+            special=special,
+            route=route,
+            starting_price=Decimal(str(df.at[index, "Starting Price"])).quantize(CENT),
+            trip_type=trip_types[index],
+            currency=currency,
+        )
+
+    existing = {}
+    stored_special_routes = SpecialRoute.objects.filter(
+        special__in={special_id for special_id, _ in special_routes}
+    ).values_list("special", "route", *SPECIAL_ROUTE_UPDATE_FIELDS)
+    for special_id, route_id, *values in stored_special_routes:
+        existing[(special_id, route_id)] = tuple(values)
+
+    changed = []
+    for key, special_route in special_routes.items():
+        values = (
+            special_route.starting_price,
+            special_route.trip_type,
+            special_route.currency_id,
+        )
+        stored = existing.get(key)
+        if stored == values:
+            result.unchanged += 1
+            continue
+        if stored is None:
+            result.created += 1
+            logger.info(
+                f"Created special fare: {special_route.special.name} {special_route.route.name}"
+            )
+        else:
+            result.updated += 1
+        changed.append(special_route)
+
+    if changed:
+        with transaction.atomic():
+            SpecialRoute.objects.bulk_create(
+                changed,
+                update_conflicts=True,
+                unique_fields=["special", "route"],
+                update_fields=SPECIAL_ROUTE_UPDATE_FIELDS,
+            )
+        invalidate_imported_content()
+    if progress:
+        progress(len(df), result.created, len(result.skipped_rows))
+
+    result.skipped_rows.sort()
+    return result
+
+
+class RouteImportResult(ImportResult):
+    def __init__(self):
+        super().__init__()
+        self.existing_routes = []
+        self.missing_destinations = set()
+
+    def get_messages(self):
+        messages = []
+        if self.created > 0:
+            messages.append(["success", f"Created {self.created} routes."])
+        else:
+            messages.append(["warning", "No routes created. Check data."])
+
+        if self.existing_routes:
+            messages.append(
+                [
+                    "info",
+                    f"{len(self.existing_routes)} routes already exist and were left unchanged.",
+                ]
+            )
+
+        if self.missing_destinations:
+            messages.append(
+                [
+                    "error",
+                    f"No destination page for: {', '.join(sorted(self.missing_destinations))}. Create the destination first.",
+                ]
+            )
+
+        if self.skipped_rows:
+            messages.append(
+                ["warning", f"Skipped rows {self.skipped_rows} due to invalid data."]
+            )
+        return messages
+
+
+def decode_path_step(step):
+    """Return the position encoded by one step of a treebeard page path."""
+    position = 0
+    for char in step:
+        position = position * len(Page.alphabet) + Page.alphabet.index(char)
+    return position
+
+
+def encode_path_step(position):
+    """Encode a child position as one step of a treebeard page path."""
+    chars = []
+    while position:
+        position, digit = divmod(position, len(Page.alphabet))
+        chars.append(Page.alphabet[digit])
+    return "".join(reversed(chars)).rjust(Page.steplen, Page.alphabet[0])
+
+
+def create_route_pages(routes):
+    """
+    Add new Route pages under their destinations in bulk.
+
+    Route.save() validates, looks up its parent and syncs the ranking tables
+    for every page, and Page.add_child() reads the parent's last child and
+    updates its child count for every page. Here tree paths are allocated
+    after one query per destination (a path is the parent's path plus the
+    child's position, see Page.alphabet and Page.steplen), pages are saved
+    without those per-page steps, each destination's child count is updated
+    once and the rankings of all new routes are synced together at the end.
+
+    The pages are published directly, without an initial revision, as pages
+    created in code usually are: the admin edits a page that has no revision
+    from its live fields, and the first save there creates one.
+
+    Args:
+        routes (list): Unsaved Route pages with their ports, name, flight
+            scope and destination_country set.
+    """
+    by_destination = {}
+    for route in routes:
+        by_destination.setdefault(route.destination_country, []).append(route)
+
+    now = timezone.now()
+    for parent, children in by_destination.items():
+        siblings = Page.objects.filter(
+            path__startswith=parent.path, depth=parent.depth + 1
+        ).values_list("path", "slug")
+        slugs = {slug for _, slug in siblings}
+        position = max(
+            (decode_path_step(path[-Page.steplen :]) for path, _ in siblings),
+            default=0,
+        )
+
+        for route in children:
+            position += 1
+            route.depth = parent.depth + 1
+            route.path = parent.path + encode_path_step(position)
+            route.locale_id = parent.locale_id
+            route.slug = base_slug = slugify(route.name)
+            suffix = 1
+            while route.slug in slugs:
+                suffix += 1
+                route.slug = f"{base_slug}-{suffix}"
+            slugs.add(route.slug)
+            route.title = route.draft_title = route.hero_title = route.name_full
+            route.first_published_at = route.last_published_at = now
+            # Page.save() without Route.save()'s validation and ranking sync
+            super(Route, route).save(clean=False)
+
+        Page.objects.filter(pk=parent.pk).update(numchild=F("numchild") + len(children))
+
+    sync_route_rankings(routes)
+    invalidate_imported_content()
+
+
+def import_routes(df, progress=None):
+    """
+    Create Route pages from a sheet of origin and destination port codes.
+
+    Each route is placed under the Destination page whose country matches
+    the destination airport's. The flight scope comes from the optional
+    "Flight Scope" column, or else from whether both airports are in the same
+    country. Routes that already exist are left alone. All pages are created
+    in one transaction and the ranking tables are populated once at the end.
+
+    Args:
+        df (DataFrame): The uploaded sheet.
+        progress (callable): Called as ``progress(rows_processed, created,
+            skipped)`` before each row.
+
+    Returns:
+        RouteImportResult: Counts of created routes, existing routes and
+        skipped rows.
+
+    Raises:
+        InvalidSheet: If expected columns are missing.
+    """
+    check_columns(df, ROUTE_COLUMNS)
+    result = RouteImportResult()
+
+    for column in ROUTE_COLUMNS:
+        df[column] = df[column].astype("string").str.strip().str.upper()
+    airports = Airport.objects.filter(
+        code__in=set(df["Origin"].dropna()) | set(df["Destination"].dropna())
+    ).in_bulk(field_name="code")
+    destinations = {
+        destination.country.strip().lower(): destination
+        for destination in Destination.objects.all()
+    }
+    existing_names = set(Route.objects.values_list("name", flat=True))
+
+    routes = []
+    for position, (index, row) in enumerate(df.iterrows()):
+        if progress:
+            progress(position, result.created, len(result.skipped_rows))
+
+        origin = airports.get(row["Origin"]) if pd.notna(row["Origin"]) else None
+        destination = (
+            airports.get(row["Destination"]) if pd.notna(row["Destination"]) else None
+        )
+        invalid_fields = []
+        if origin is None:
+            invalid_fields.append("Origin")
+        if destination is None or destination == origin:
+            invalid_fields.append("Destination")
+
+        flight_scope = None
+        if "Flight Scope" in df.columns and pd.notna(row["Flight Scope"]):
+            flight_scope = FLIGHT_SCOPES.get(str(row["Flight Scope"]).strip().lower())
+            if flight_scope is None:
+                invalid_fields.append("Flight Scope")
+
+        if invalid_fields:
+            result.skipped_rows.append(index)
+            logger.warning(
+                f"Skipped row {index}: Invalid or missing fields: {', '.join(invalid_fields)}"
+            )
+            continue
+
+        name = f"{origin.code}-{destination.code}"
+        if name in existing_names:
+            result.existing_routes.append(name)
+            continue
+
+        parent = destinations.get(destination.country.strip().lower())
+        if parent is None:
+            result.missing_destinations.add(destination.country)
+            result.skipped_rows.append(index)
+            continue
+
+        if flight_scope is None:
+            same_country = (
+                origin.country.strip().lower() == destination.country.strip().lower()
+            )
+            flight_scope = "domestic route" if same_country else "international route"
+
+        existing_names.add(name)
+        routes.append(
+            Route(
+                origin_port=origin,
+                destination_port=destination,
+                destination_country=parent,
+                flight_scope=flight_scope,
+                name=name,
+                name_full=f"{origin.city} to {destination.city}",
+            )
+        )
+
+    if routes:
+        with transaction.atomic():
+            create_route_pages(routes)
+        result.created = len(routes)
+        logger.info(f"Created {result.created} routes")
+
+    return result
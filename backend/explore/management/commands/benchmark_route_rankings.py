@@ -0,0 +1,107 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Airport
+from explore.importer import create_route_pages
+from explore.models import (
+    Destination,
+    DestinationRoute,
+    Route,
+    WhereWeFly,
+    WhereWeFlyDomesticRoute,
+    WhereWeFlyInternationalRoute,
+)
+
+# Benchmark routes share a destination port in groups of this size, so the
+# related route rankings grow linearly rather than quadratically.
+ROUTES_PER_PORT = 10
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time Destination and WhereWeFly page saves as the number of routes "
+        "grows. Everything is created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--counts",
+            default="50,100,200,400",
+            help="Comma-separated numbers of benchmark routes to measure at",
+        )
+
+    def handle(self, *args, **options):
+        counts = sorted(int(count) for count in options["counts"].split(","))
+        destination = Destination.objects.first()
+        if destination is None:
+            raise CommandError("Create a Destination page first.")
+        where_we_fly = WhereWeFly.objects.first()
+
+        self.stdout.write(f"{'routes':>8} {'destination':>20} {'where we fly':>20}")
+        try:
+            with transaction.atomic():
+                created = 0
+                for count in counts:
+                    create_route_pages(self.build_routes(destination, created, count))
+                    created = max(created, count)
+                    routes = list(Route.objects.filter(name__startswith="BM"))
+                    self.stdout.write(
+                        f"{len(routes):>8} "
+                        f"{self.measure(destination, routes):>20} "
+                        f"{self.measure(where_we_fly, routes) if where_we_fly else '-':>20}"
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+
+    def build_routes(self, destination, start, end):
+        routes = []
+        for number in range(start, end):
+            origin = self.get_airport(f"BM{number:04d}", destination.country)
+            port = self.get_airport(
+                f"BD{number // ROUTES_PER_PORT:04d}", destination.country
+            )
+            routes.append(
+                Route(
+                    origin_port=origin,
+                    destination_port=port,
+                    destination_country=destination,
+                    flight_scope="international route",
+                    name=f"{origin.code}-{port.code}",
+                    name_full=f"{origin.city} to {port.city}",
+                )
+            )
+        return routes
+
+    def get_airport(self, code, country):
+        airport, _ = Airport.objects.get_or_create(
+            code=code,
+            defaults={"name": code, "city": code, "country": country},
+        )
+        return airport
+
+    def measure(self, page, routes):
+        """
+        Remove the benchmark routes' rankings, so the save has to add all of
+        them back, and return the save's duration and query count.
+        """
+        for model in (
+            DestinationRoute,
+            WhereWeFlyDomesticRoute,
+            WhereWeFlyInternationalRoute,
+        ):
+            model.objects.filter(route__in=routes).delete()
+
+        page.refresh_from_db()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            page.save()
+            elapsed = time.perf_counter() - started
+        return f"{elapsed * 1000:.1f} ms / {len(queries)} q"
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from imports.importers import InvalidSheet, read_sheet
+from explore.importer import import_routes
+
+
+class Command(BaseCommand):
+    help = "Create Route pages from a CSV or Excel file of origin/destination codes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            help='File with "Origin" and "Destination" airport code columns and an '
+            'optional "Flight Scope" column (Domestic or International)',
+        )
+
+    def handle(self, *args, **options):
+        with open(options["path"], "rb") as f:
+            df = read_sheet(f, options["path"])
+
+        try:
+            result = import_routes(df)
+        except InvalidSheet as e:
+            raise CommandError(str(e))
+
+        styles = {
+            "success": self.style.SUCCESS,
+            "warning": self.style.WARNING,
+            "error": self.style.ERROR,
+        }
+        for level, text in result.get_messages():
+            self.stdout.write(styles.get(level, str)(text))
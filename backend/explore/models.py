@@ -1,3 +1,5 @@
+import graphene
+from core.currency import GraphQLConvertible
 from core.models import BasePage
 from wagtail.search import index
 from modelcluster.fields import ParentalManyToManyField, ParentalKey
@@ -101,10 +103,25 @@ class Destination(BasePage):
             GraphQLForeignKey, "ranked_routes", "explore.DestinationRoute"
         ),
         GraphQLString("country"),
+        GraphQLConvertible("lowest_fare", graphene.Float, source="get_lowest_fare"),
+        GraphQLConvertible(
+            "lowest_fare_currency", graphene.String, source="get_lowest_fare_currency"
+        ),
     ]
 
     parent_page_types = ["explore.DestinationIndexPage"]
 
+    def get_lowest_fare(self, info=None, currency=None):
+        """The lowest fare on a route to this destination ("fares from")."""
+        from fares.lowest_fares import DESTINATION, get_lowest_fare
+
+        return get_lowest_fare(DESTINATION, self.pk, currency).price
+
+    def get_lowest_fare_currency(self, info=None, currency=None):
+        from fares.lowest_fares import DESTINATION, get_lowest_fare
+
+        return get_lowest_fare(DESTINATION, self.pk, currency).currency
+
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
         # Auto-populate route rankings for all routes to this destination
@@ -112,31 +129,9 @@ class Destination(BasePage):
 
     def populate_route_rankings(self):
         """Auto-create DestinationRoute entries for all routes to this destination"""
-        # Get all routes that go to this destination
-        routes_to_destination = Route.objects.filter(destination_country=self)
-
-        # Create DestinationRoute entries for any missing routes
-        for index, route in enumerate(routes_to_destination):
-            destination_route, created = DestinationRoute.objects.get_or_create(
-                destination=self,
-                route=route,
-                defaults={
-                    "sort_order": DestinationRoute.objects.filter(
-                        destination=self
-                    ).count()
-                },
-            )
-            # If this is a new route ranking and we have existing ones,
-            # make sure sort_order is properly set
-            if created:
-                max_sort_order = (
-                    DestinationRoute.objects.filter(destination=self)
-                    .exclude(pk=destination_route.pk)
-                    .aggregate(max_order=models.Max("sort_order"))["max_order"]
-                    or -1
-                )
-                destination_route.sort_order = max_sort_order + 1
-                destination_route.save()
+        from .rankings import populate_destination_rankings
+
+        populate_destination_rankings(self)
 
     class Meta:
         verbose_name = "Destination Page"
@@ -381,10 +376,25 @@ class Route(BasePage):
             GraphQLForeignKey, "ranked_related_routes", "explore.RouteRelatedRoute"
         ),
         GraphQLString("flight_scope", name="flightScope"),
+        GraphQLConvertible("lowest_fare", graphene.Float, source="get_lowest_fare"),
+        GraphQLConvertible(
+            "lowest_fare_currency", graphene.String, source="get_lowest_fare_currency"
+        ),
     ]
 
     parent_page_types = ["explore.Destination"]
 
+    def get_lowest_fare(self, info=None, currency=None):
+        """The lowest fare or special fare on this route ("fares from")."""
+        from fares.lowest_fares import ROUTE, get_lowest_fare
+
+        return get_lowest_fare(ROUTE, self.pk, currency).price
+
+    def get_lowest_fare_currency(self, info=None, currency=None):
+        from fares.lowest_fares import ROUTE, get_lowest_fare
+
+        return get_lowest_fare(ROUTE, self.pk, currency).currency
+
     def clean(self):
         """
         Validate that the combination of origin and destination airports is unique before saving.
@@ -406,6 +416,8 @@ class Route(BasePage):
                 )
 
     def save(self, *args, **kwargs):
+        from .rankings import sync_route_rankings
+
         # Set destination_country to parent Destination page upon saving
         if not self.destination_country and self.get_parent():
             parent = self.get_parent().specific
@@ -421,138 +433,9 @@ class Route(BasePage):
         self.full_clean()
         super().save(*args, **kwargs)
 
-        # Auto-create DestinationRoute ranking if destination_country is set
-        if self.destination_country:
-            destination_route, created = DestinationRoute.objects.get_or_create(
-                destination=self.destination_country,
-                route=self,
-                defaults={"sort_order": 0},
-            )
-            # If this is a new route ranking, set proper sort_order
-            if created:
-                max_sort_order = (
-                    DestinationRoute.objects.filter(
-                        destination=self.destination_country
-                    )
-                    .exclude(pk=destination_route.pk)
-                    .aggregate(max_order=models.Max("sort_order"))["max_order"]
-                    or -1
-                )
-                destination_route.sort_order = max_sort_order + 1
-                destination_route.save()
-
-        # Auto-create WhereWeFly route rankings based on flight scope
-        try:
-            where_we_fly_page = WhereWeFly.objects.first()
-            if where_we_fly_page:
-                if self.flight_scope == "domestic route":
-                    # Remove from international rankings if it exists there
-                    WhereWeFlyInternationalRoute.objects.filter(
-                        where_we_fly=where_we_fly_page, route=self
-                    ).delete()
-
-                    # Create domestic route ranking
-                    domestic_route, created = (
-                        WhereWeFlyDomesticRoute.objects.get_or_create(
-                            where_we_fly=where_we_fly_page,
-                            route=self,
-                            defaults={"sort_order": 0},
-                        )
-                    )
-                    if created:
-                        max_sort_order = (
-                            WhereWeFlyDomesticRoute.objects.filter(
-                                where_we_fly=where_we_fly_page
-                            )
-                            .exclude(pk=domestic_route.pk)
-                            .aggregate(max_order=models.Max("sort_order"))["max_order"]
-                            or -1
-                        )
-                        domestic_route.sort_order = max_sort_order + 1
-                        domestic_route.save()
-
-                elif self.flight_scope == "international route":
-                    # Remove from domestic rankings if it exists there
-                    WhereWeFlyDomesticRoute.objects.filter(
-                        where_we_fly=where_we_fly_page, route=self
-                    ).delete()
-
-                    # Create international route ranking
-                    international_route, created = (
-                        WhereWeFlyInternationalRoute.objects.get_or_create(
-                            where_we_fly=where_we_fly_page,
-                            route=self,
-                            defaults={"sort_order": 0},
-                        )
-                    )
-                    if created:
-                        max_sort_order = (
-                            WhereWeFlyInternationalRoute.objects.filter(
-                                where_we_fly=where_we_fly_page
-                            )
-                            .exclude(pk=international_route.pk)
-                            .aggregate(max_order=models.Max("sort_order"))["max_order"]
-                            or -1
-                        )
-                        international_route.sort_order = max_sort_order + 1
-                        international_route.save()
-        except WhereWeFly.DoesNotExist:
-            # WhereWeFly page doesn't exist yet, skip auto-population
-            pass
-
-        # Auto-populate related routes rankings
-        self.populate_related_route_rankings()
-
-    def populate_related_route_rankings(self):
-        """Auto-create RouteRelatedRoute entries for all routes to the same destination"""
-        if self.destination_port:
-            # Get all routes that go to the same destination (excluding this route)
-            related_routes = Route.objects.filter(
-                destination_port=self.destination_port
-            ).exclude(pk=self.pk)
-
-            # Create RouteRelatedRoute entries for any missing related routes
-            for related_route in related_routes:
-                route_ranking, created = RouteRelatedRoute.objects.get_or_create(
-                    route=self,
-                    related_route=related_route,
-                    defaults={
-                        "sort_order": RouteRelatedRoute.objects.filter(
-                            route=self
-                        ).count()
-                    },
-                )
-                # If this is a new route ranking, set proper sort_order
-                if created:
-                    max_sort_order = (
-                        RouteRelatedRoute.objects.filter(route=self)
-                        .exclude(pk=route_ranking.pk)
-                        .aggregate(max_order=models.Max("sort_order"))["max_order"]
-                        or -1
-                    )
-                    route_ranking.sort_order = max_sort_order + 1
-                    route_ranking.save()
-
-            # Also add this route to other routes that go to the same destination
-            for related_route in related_routes:
-                reverse_ranking, created = RouteRelatedRoute.objects.get_or_create(
-                    route=related_route,
-                    related_route=self,
-                    defaults={
-                        "sort_order": RouteRelatedRoute.objects.filter(
-                            route=related_route
-                        ).count()
-                    },
-                )
-                if created:
-                    max_sort_order = (
-                        RouteRelatedRoute.objects.filter(route=related_route)
-                        .exclude(pk=reverse_ranking.pk)
-                        .aggregate(max_order=models.Max("sort_order"))["max_order"]
-                        or -1
-                    )
-                    reverse_ranking.sort_order = max_sort_order + 1
-                    reverse_ranking.save()
+        # Add the route to its destination, WhereWeFly and related route
+        # rankings
+        sync_route_rankings([self])
 
     class Meta:
         verbose_name = "Route Page"
@@ -765,14 +648,30 @@ class SpecialRoute(models.Model):
             return solomon_now > self.special.end_date
         return False
 
+    def get_starting_price(self, info=None, currency=None):
+        """The starting price, converted to ``currency`` if one is given."""
+        if not currency:
+            return self.starting_price
+        from fares.prices import get_converted_prices
+
+        price = get_converted_prices(currency)["special_routes"].get(self.pk)
+        return None if price is None else f"{price:.2f}"
+
     graphql_fields = [
-        GraphQLString("starting_price", name="startingPrice"),
+        GraphQLConvertible(
+            "starting_price", graphene.String, source="get_starting_price"
+        ),
         GraphQLForeignKey("currency", "core.Currency"),
         GraphQLForeignKey("route", "explore.Route"),
         GraphQLForeignKey("special", "explore.Special"),
         GraphQLString("is_expired", name="isExpired"),
     ]
 
+    # is_expired reads special.end_date
+    graphql_prefetch = {
+        "is_expired": ["special"],
+    }
+
     def __str__(self):
         return f"{self.special.name} - ({self.route.name_full}) at {self.currency.currency_code} {self.starting_price}"
 
@@ -854,8 +753,48 @@ class WhereWeFly(BasePage):
             "ranked_international_routes",
             "explore.WhereWeFlyInternationalRoute",
         ),
+        GraphQLConvertible(
+            "lowest_domestic_fare", graphene.Float, source="get_lowest_domestic_fare"
+        ),
+        GraphQLConvertible(
+            "lowest_domestic_fare_currency",
+            graphene.String,
+            source="get_lowest_domestic_fare_currency",
+        ),
+        GraphQLConvertible(
+            "lowest_international_fare",
+            graphene.Float,
+            source="get_lowest_international_fare",
+        ),
+        GraphQLConvertible(
+            "lowest_international_fare_currency",
+            graphene.String,
+            source="get_lowest_international_fare_currency",
+        ),
     ]
 
+    def get_lowest_domestic_fare(self, info=None, currency=None):
+        """The lowest fare on any domestic route ("fares from")."""
+        from fares.lowest_fares import SCOPE, get_lowest_fare
+
+        return get_lowest_fare(SCOPE, "domestic route", currency).price
+
+    def get_lowest_domestic_fare_currency(self, info=None, currency=None):
+        from fares.lowest_fares import SCOPE, get_lowest_fare
+
+        return get_lowest_fare(SCOPE, "domestic route", currency).currency
+
+    def get_lowest_international_fare(self, info=None, currency=None):
+        """The lowest fare on any international route ("fares from")."""
+        from fares.lowest_fares import SCOPE, get_lowest_fare
+
+        return get_lowest_fare(SCOPE, "international route", currency).price
+
+    def get_lowest_international_fare_currency(self, info=None, currency=None):
+        from fares.lowest_fares import SCOPE, get_lowest_fare
+
+        return get_lowest_fare(SCOPE, "international route", currency).currency
+
     parent_page_types = ["explore.ExploreIndexPage"]
 
     def save(self, *args, **kwargs):
@@ -866,57 +805,15 @@ class WhereWeFly(BasePage):
 
     def populate_domestic_route_rankings(self):
         """Auto-create WhereWeFlyDomesticRoute entries for all domestic routes"""
-        # Get all domestic routes
-        domestic_routes = Route.objects.filter(flight_scope="domestic route")
-
-        # Create WhereWeFlyDomesticRoute entries for any missing routes
-        for route in domestic_routes:
-            route_ranking, created = WhereWeFlyDomesticRoute.objects.get_or_create(
-                where_we_fly=self,
-                route=route,
-                defaults={
-                    "sort_order": WhereWeFlyDomesticRoute.objects.filter(
-                        where_we_fly=self
-                    ).count()
-                },
-            )
-            # If this is a new route ranking, set proper sort_order
-            if created:
-                max_sort_order = (
-                    WhereWeFlyDomesticRoute.objects.filter(where_we_fly=self)
-                    .exclude(pk=route_ranking.pk)
-                    .aggregate(max_order=models.Max("sort_order"))["max_order"]
-                    or -1
-                )
-                route_ranking.sort_order = max_sort_order + 1
-                route_ranking.save()
+        from .rankings import populate_where_we_fly_rankings
+
+        populate_where_we_fly_rankings(self, "domestic route")
 
     def populate_international_route_rankings(self):
         """Auto-create WhereWeFlyInternationalRoute entries for all international routes"""
-        # Get all international routes
-        international_routes = Route.objects.filter(flight_scope="international route")
-
-        # Create WhereWeFlyInternationalRoute entries for any missing routes
-        for route in international_routes:
-            route_ranking, created = WhereWeFlyInternationalRoute.objects.get_or_create(
-                where_we_fly=self,
-                route=route,
-                defaults={
-                    "sort_order": WhereWeFlyInternationalRoute.objects.filter(
-                        where_we_fly=self
-                    ).count()
-                },
-            )
-            # If this is a new route ranking, set proper sort_order
-            if created:
-                max_sort_order = (
-                    WhereWeFlyInternationalRoute.objects.filter(where_we_fly=self)
-                    .exclude(pk=route_ranking.pk)
-                    .aggregate(max_order=models.Max("sort_order"))["max_order"]
-                    or -1
-                )
-                route_ranking.sort_order = max_sort_order + 1
-                route_ranking.save()
+        from .rankings import populate_where_we_fly_rankings
+
+        populate_where_we_fly_rankings(self, "international route")
 
     class Meta:
         verbose_name = "Where We Fly Page"
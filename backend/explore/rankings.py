@@ -0,0 +1,200 @@
+from collections import defaultdict
+
+from django.db import transaction
+
+from api.cache import invalidate_graphql_cache
+from .models import (
+    DestinationRoute,
+    Route,
+    RouteRelatedRoute,
+    WhereWeFly,
+    WhereWeFlyDomesticRoute,
+    WhereWeFlyInternationalRoute,
+)
+
+# Ranking model for each flight scope, on the WhereWeFly page
+SCOPE_RANKINGS = {
+    "domestic route": WhereWeFlyDomesticRoute,
+    "international route": WhereWeFlyInternationalRoute,
+}
+
+
+def append_rankings(model, parent_field, child_field, wanted):
+    """
+    Add the missing rows of a ranking table after each parent's existing ones.
+
+    One query loads the existing rows of every parent involved, the missing
+    (parent, child) pairs are worked out in Python and inserted with a single
+    bulk_create. New rows keep the order they have in ``wanted`` and are
+    numbered on from the parent's highest sort_order, so rankings editors
+    have already arranged are left untouched.
+
+    Args:
+        model: The Orderable ranking model, e.g. DestinationRoute.
+        parent_field (str): The name of the foreign key to the ranking's owner.
+        child_field (str): The name of the foreign key to the ranked route.
+        wanted (iterable): (parent id, child id) pairs that should exist.
+
+    Returns:
+        int: The number of rows created.
+    """
+    wanted = list(dict.fromkeys(wanted))
+    if not wanted:
+        return 0
+
+    existing = set()
+    next_order = defaultdict(int)
+    rows = model.objects.filter(
+        **{f"{parent_field}__in": {parent_id for parent_id, _ in wanted}}
+    ).values_list(f"{parent_field}_id", f"{child_field}_id", "sort_order")
+    for parent_id, child_id, sort_order in rows:
+        existing.add((parent_id, child_id))
+        if sort_order is not None:
+            next_order[parent_id] = max(next_order[parent_id], sort_order + 1)
+
+    new = []
+    for parent_id, child_id in wanted:
+        if (parent_id, child_id) in existing:
+            continue
+        new.append(
+            model(
+                **{
+                    f"{parent_field}_id": parent_id,
+                    f"{child_field}_id": child_id,
+                    "sort_order": next_order[parent_id],
+                }
+            )
+        )
+        next_order[parent_id] += 1
+
+    if new:
+        model.objects.bulk_create(new)
+    return len(new)
+
+
+def populate_destination_rankings(destination):
+    """
+    Append the routes to a destination that are missing from its ranking.
+
+    Runs in at most three queries however many routes the destination has.
+    """
+    route_ids = (
+        Route.objects.filter(destination_country=destination)
+        .order_by("path")
+        .values_list("pk", flat=True)
+    )
+    created = append_rankings(
+        DestinationRoute,
+        "destination",
+        "route",
+        [(destination.pk, route_id) for route_id in route_ids],
+    )
+    if created:
+        invalidate_graphql_cache()
+    return created
+
+
+def populate_where_we_fly_rankings(where_we_fly, flight_scope):
+    """
+    Append the routes of a flight scope that are missing from the WhereWeFly
+    page's ranking for that scope.
+
+    Runs in at most three queries however many routes there are.
+    """
+    route_ids = (
+        Route.objects.filter(flight_scope=flight_scope)
+        .order_by("path")
+        .values_list("pk", flat=True)
+    )
+    created = append_rankings(
+        SCOPE_RANKINGS[flight_scope],
+        "where_we_fly",
+        "route",
+        [(where_we_fly.pk, route_id) for route_id in route_ids],
+    )
+    if created:
+        invalidate_graphql_cache()
+    return created
+
+
+def sync_route_rankings(routes):
+    """
+    Add saved routes to every ranking table they belong in.
+
+    Each route is appended to its destination's ranked routes, to the
+    WhereWeFly ranking matching its flight scope (and removed from the other
+    one), and related both ways to every route with the same destination
+    port. The whole sync runs in a fixed number of queries however many
+    routes are passed or already exist.
+
+    Args:
+        routes (iterable): Saved Route pages.
+
+    Returns:
+        int: The number of ranking rows created or removed.
+    """
+    routes = [route for route in routes if route.pk]
+    if not routes:
+        return 0
+
+    changed = 0
+    with transaction.atomic():
+        changed += append_rankings(
+            DestinationRoute,
+            "destination",
+            "route",
+            [
+                (route.destination_country_id, route.pk)
+                for route in routes
+                if route.destination_country_id
+            ],
+        )
+
+        where_we_fly_id = WhereWeFly.objects.values_list("pk", flat=True).first()
+        if where_we_fly_id:
+            for scope, model in SCOPE_RANKINGS.items():
+                # Rankings of routes whose scope is now the other one
+                stale = model.objects.filter(
+                    where_we_fly_id=where_we_fly_id,
+                    route__in=[
+                        route.pk
+                        for route in routes
+                        if route.flight_scope in SCOPE_RANKINGS
+                        and route.flight_scope != scope
+                    ],
+                )
+                changed += stale.delete()[0]
+                changed += append_rankings(
+                    model,
+                    "where_we_fly",
+                    "route",
+                    [
+                        (where_we_fly_id, route.pk)
+                        for route in routes
+                        if route.flight_scope == scope
+                    ],
+                )
+
+        routes_by_port = defaultdict(list)
+        ports = {route.destination_port_id for route in routes} - {None}
+        related = (
+            Route.objects.filter(destination_port__in=ports)
+            .order_by("path")
+            .values_list("pk", "destination_port_id")
+        )
+        for pk, port_id in related:
+            routes_by_port[port_id].append(pk)
+
+        pairs = []
+        for route in routes:
+            others = [
+                pk for pk in routes_by_port[route.destination_port_id] if pk != route.pk
+            ]
+            pairs.extend((route.pk, pk) for pk in others)
+            pairs.extend((pk, route.pk) for pk in others)
+        changed += append_rankings(RouteRelatedRoute, "route", "related_route", pairs)
+
+    # Bulk writes skip the signals that clear cached responses
+    if changed:
+        invalidate_graphql_cache()
+    return changed
@@ -1,3 +1,395 @@
+import datetime
+
+import pandas as pd
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from wagtail.models import Page
+
+from core.models import Airport, Currency
+from home.models import HomePage
+from .importer import import_routes, import_special_routes
+from .models import (
+    Destination,
+    DestinationIndexPage,
+    DestinationRoute,
+    ExploreIndexPage,
+    Route,
+    RouteRelatedRoute,
+    Special,
+    SpecialRoute,
+    WhereWeFly,
+    WhereWeFlyDomesticRoute,
+    WhereWeFlyInternationalRoute,
+)
+from .rankings import (
+    append_rankings,
+    populate_destination_rankings,
+    populate_where_we_fly_rankings,
+    sync_route_rankings,
+)
+
+
+def special_fare_row(route, price, special="1234", currency="SBD", **columns):
+    row = {
+        "Special ID": special,
+        "Route": route,
+        "Starting Price": price,
+        "Trip Type": "Return",
+        "Currency": currency,
+    }
+    row.update(columns)
+    return row
+
+
+def special_fare_sheet(*rows):
+    return pd.DataFrame(list(rows))
+
+
+class SpecialRouteImporterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        home = Page.get_first_root_node().add_child(instance=HomePage(title="Home"))
+        explore = home.add_child(
+            instance=ExploreIndexPage(title="Explore", hero_title="Explore")
+        )
+        index = explore.add_child(
+            instance=DestinationIndexPage(
+                title="Destinations", hero_title="Destinations"
+            )
+        )
+        destination = index.add_child(
+            instance=Destination(
+                title="Australia", hero_title="Australia", country="Australia"
+            )
+        )
+        airports = {
+            code: Airport.objects.create(code=code, name=code, city=code, country="")
+            for code in ["HIR", "BNE", "NAN"]
+        }
+        for origin, arrival in [("HIR", "BNE"), ("NAN", "BNE")]:
+            destination.add_child(
+                instance=Route(
+                    title=f"{origin} to {arrival}",
+                    hero_title=f"{origin} to {arrival}",
+                    origin_port=airports[origin],
+                    destination_port=airports[arrival],
+                )
+            )
+        self.special = home.add_child(
+            instance=Special(
+                title="Sale",
+                hero_title="Sale",
+                name="Sale",
+                special_code="1234",
+                discount="10%",
+                booking_class="Y",
+                trip_type="return",
+                start_date=datetime.date(2025, 1, 1),
+                end_date=datetime.date(2099, 1, 1),
+            )
+        )
+        for code in ["SBD", "FJD"]:
+            Currency.objects.create(
+                country_name=code,
+                country_code=code[:2],
+                currency_name=code,
+                currency_code=code,
+                currency_symbol="$",
+            )
+        import_special_routes(special_fare_sheet(special_fare_row("HIR-BNE", 99)))
+
+    def get_prices(self):
+        return dict(SpecialRoute.objects.values_list("route__name", "starting_price"))
+
+    def test_reimport_only_counts_changes(self):
+        result = import_special_routes(
+            special_fare_sheet(
+                # Excel reads numeric special codes as floats
+                special_fare_row("HIR-BNE", 99, special=1234.0),
+                special_fare_row("NAN-BNE", 149, currency="FJD"),
+            )
+        )
+        self.assertEqual((result.created, result.updated, result.unchanged), (1, 0, 1))
+        result = import_special_routes(
+            special_fare_sheet(special_fare_row("HIR-BNE", 89))
+        )
+        self.assertEqual((result.created, result.updated, result.unchanged), (0, 1, 0))
+        self.assertEqual(self.get_prices(), {"HIR-BNE": 89, "NAN-BNE": 149})
+        self.assertEqual(
+            SpecialRoute.objects.get(route__name="NAN-BNE").currency.currency_code,
+            "FJD",
+        )
+
+    def test_invalid_unknown_and_duplicate_rows(self):
+        result = import_special_routes(
+            special_fare_sheet(
+                special_fare_row("NAN-BNE", 149, **{"Trip Type": "Both"}),
+                special_fare_row("NAN-BNE", 149, special="9999"),
+                special_fare_row("HIR-NAN", 149),
+                special_fare_row("NAN-BNE", 149, currency="XXX"),
+                special_fare_row("NAN-BNE", 149),
+                special_fare_row("NAN-BNE", 159),
+            )
+        )
+        self.assertEqual(result.skipped_rows, [0, 1, 2, 3])
+        self.assertEqual(result.duplicate_special_routes, ["Sale for route NAN-BNE"])
+        self.assertEqual(self.get_prices(), {"HIR-BNE": 99, "NAN-BNE": 149})
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def count_queries(*rows):
+            with CaptureQueriesContext(connection) as queries:
+                import_special_routes(special_fare_sheet(*rows))
+            return len(queries)
+
+        self.assertEqual(
+            count_queries(
+                special_fare_row("HIR-BNE", 10), special_fare_row("NAN-BNE", 20)
+            ),
+            count_queries(special_fare_row("HIR-BNE", 30)),
+        )
+
+
+class RankingTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        home = Page.get_first_root_node().add_child(instance=HomePage(title="Home"))
+        explore = home.add_child(
+            instance=ExploreIndexPage(title="Explore", hero_title="Explore")
+        )
+        self.index = explore.add_child(
+            instance=DestinationIndexPage(
+                title="Destinations", hero_title="Destinations"
+            )
+        )
+        self.australia = self.add_destination("Australia")
+        self.where_we_fly = explore.add_child(
+            instance=WhereWeFly(title="Where We Fly", hero_title="Where We Fly")
+        )
+        self.airports = {
+            code: Airport.objects.create(code=code, name=code, city=code, country="")
+            for code in ["HIR", "GZO", "NAN", "BNE", "SYD", "MEL"]
+        }
+
+    def add_destination(self, country):
+        return self.index.add_child(
+            instance=Destination(title=country, hero_title=country, country=country)
+        )
+
+    def add_route(self, destination, name, flight_scope="international route"):
+        origin, arrival = name.split("-")
+        return destination.add_child(
+            instance=Route(
+                title=name,
+                hero_title=name,
+                origin_port=self.airports[origin],
+                destination_port=self.airports[arrival],
+                flight_scope=flight_scope,
+            )
+        )
+
+    def get_ranking(self, model, **filters):
+        return list(
+            model.objects.filter(**filters)
+            .order_by("sort_order")
+            .values_list("route__name", "sort_order")
+        )
+
+
+class RouteRankingSyncTests(RankingTestCase):
+    def test_saved_routes_join_their_rankings(self):
+        first = self.add_route(self.australia, "HIR-BNE")
+        second = self.add_route(self.australia, "NAN-BNE")
+        self.add_route(self.australia, "HIR-SYD")
+        self.assertEqual(
+            self.get_ranking(DestinationRoute, destination=self.australia),
+            [("HIR-BNE", 0), ("NAN-BNE", 1), ("HIR-SYD", 2)],
+        )
+        self.assertEqual(len(self.get_ranking(WhereWeFlyInternationalRoute)), 3)
+        self.assertEqual(
+            set(RouteRelatedRoute.objects.values_list("route", "related_route")),
+            {(first.pk, second.pk), (second.pk, first.pk)},
+        )
+
+    def test_query_count_does_not_grow_with_routes(self):
+        routes = [
+            self.add_route(self.australia, name)
+            for name in ["HIR-BNE", "NAN-BNE", "GZO-BNE", "HIR-SYD"]
+        ]
+        routes.append(self.add_route(self.add_destination("Fiji"), "HIR-NAN"))
+
+        def count_queries(routes):
+            for model in [
+                DestinationRoute,
+                RouteRelatedRoute,
+                WhereWeFlyInternationalRoute,
+            ]:
+                model.objects.all().delete()
+            with CaptureQueriesContext(connection) as queries:
+                sync_route_rankings(routes)
+            return len(queries)
+
+        self.assertEqual(count_queries(routes[:1]), count_queries(routes))
+        self.assertEqual(DestinationRoute.objects.count(), 5)
+        self.assertEqual(RouteRelatedRoute.objects.count(), 6)
+
+    def test_new_rows_follow_the_existing_order(self):
+        self.add_route(self.australia, "HIR-BNE")
+        self.add_route(self.australia, "NAN-BNE")
+        # An editor moved HIR-BNE to the end
+        DestinationRoute.objects.filter(route__name="HIR-BNE").update(sort_order=5)
+        self.add_route(self.australia, "HIR-SYD")
+        self.assertEqual(
+            self.get_ranking(DestinationRoute, destination=self.australia),
+            [("NAN-BNE", 1), ("HIR-BNE", 5), ("HIR-SYD", 6)],
+        )
+
+    def test_route_moves_between_scope_rankings(self):
+        route = self.add_route(self.australia, "HIR-BNE")
+        self.add_route(self.australia, "HIR-SYD", flight_scope="domestic route")
+        route.flight_scope = "domestic route"
+        route.save()
+        self.assertEqual(self.get_ranking(WhereWeFlyInternationalRoute), [])
+        self.assertEqual(
+            self.get_ranking(WhereWeFlyDomesticRoute),
+            [("HIR-SYD", 0), ("HIR-BNE", 1)],
+        )
+
+
+class RankingPopulationTests(RankingTestCase):
+    def setUp(self):
+        super().setUp()
+        # One route to Fiji (domestic, for the scope rankings), five to
+        # Australia
+        self.fiji = self.add_destination("Fiji")
+        self.add_route(self.fiji, "HIR-NAN", flight_scope="domestic route")
+        self.routes = [
+            self.add_route(self.australia, name)
+            for name in ["HIR-BNE", "NAN-BNE", "GZO-BNE", "HIR-SYD", "HIR-MEL"]
+        ]
+
+    def test_destination_rankings_in_constant_queries(self):
+        DestinationRoute.objects.all().delete()
+        for destination, count in [(self.fiji, 1), (self.australia, 5)]:
+            with self.assertNumQueries(3):
+                self.assertEqual(populate_destination_rankings(destination), count)
+            # Nothing is missing any more: the routes and the existing rows
+            with self.assertNumQueries(2):
+                self.assertEqual(populate_destination_rankings(destination), 0)
+
+    def test_where_we_fly_rankings_in_constant_queries(self):
+        WhereWeFlyDomesticRoute.objects.all().delete()
+        WhereWeFlyInternationalRoute.objects.all().delete()
+        for flight_scope, count in [
+            ("domestic route", 1),
+            ("international route", 5),
+        ]:
+            with self.assertNumQueries(3):
+                self.assertEqual(
+                    populate_where_we_fly_rankings(self.where_we_fly, flight_scope),
+                    count,
+                )
+
+    def test_new_rows_are_numbered_on_per_parent(self):
+        first, second, third = self.routes[:3]
+        DestinationRoute.objects.all().delete()
+        DestinationRoute.objects.create(
+            destination=self.australia, route=second, sort_order=7
+        )
+        with self.assertNumQueries(2):
+            created = append_rankings(
+                DestinationRoute,
+                "destination",
+                "route",
+                [
+                    (self.australia.pk, first.pk),
+                    (self.australia.pk, second.pk),
+                    (self.fiji.pk, third.pk),
+                    (self.australia.pk, third.pk),
+                    (self.australia.pk, first.pk),
+                ],
+            )
+        self.assertEqual(created, 3)
+        self.assertEqual(
+            self.get_ranking(DestinationRoute, destination=self.australia),
+            [("NAN-BNE", 7), ("HIR-BNE", 8), ("GZO-BNE", 9)],
+        )
+        self.assertEqual(
+            self.get_ranking(DestinationRoute, destination=self.fiji),
+            [("GZO-BNE", 0)],
+        )
+
+
+def route_sheet(*rows):
+    return pd.DataFrame(list(rows), columns=["Origin", "Destination"])
+
+
+class RouteImporterTests(RankingTestCase):
+    def setUp(self):
+        super().setUp()
+        for codes, country in [
+            (["HIR", "GZO"], "Solomon Islands"),
+            (["NAN"], "Fiji"),
+            (["BNE", "SYD", "MEL"], "Australia"),
+        ]:
+            Airport.objects.filter(code__in=codes).update(country=country)
+        self.solomon_islands = self.add_destination("Solomon Islands")
+        self.add_route(self.australia, "HIR-BNE")
+
+    def test_import(self):
+        result = import_routes(
+            route_sheet(
+                ("hir", "SYD"),
+                ("GZO", "BNE"),
+                ("HIR", "BNE"),
+                ("HIR", "SYD"),
+                ("HIR", "NAN"),
+                ("HIR", "XXX"),
+                ("HIR", "GZO"),
+            )
+        )
+        self.assertEqual(result.created, 3)
+        self.assertEqual(result.existing_routes, ["HIR-BNE", "HIR-SYD"])
+        self.assertEqual(result.missing_destinations, {"Fiji"})
+        self.assertEqual(result.skipped_rows, [4, 5])
+
+        route = Route.objects.get(name="HIR-SYD")
+        self.assertEqual(route.get_parent().pk, self.australia.pk)
+        self.assertEqual(route.url_path, f"{self.australia.url_path}hir-syd/")
+        self.assertEqual(route.flight_scope, "international route")
+        self.assertTrue(route.live)
+        domestic = Route.objects.get(name="HIR-GZO")
+        self.assertEqual(domestic.get_parent().pk, self.solomon_islands.pk)
+        self.assertEqual(domestic.flight_scope, "domestic route")
+
+    def test_page_tree_stays_consistent(self):
+        import_routes(route_sheet(("HIR", "SYD"), ("GZO", "BNE"), ("HIR", "GZO")))
+        self.assertEqual(Page.find_problems(), ([], [], [], [], []))
+        self.australia.refresh_from_db()
+        self.assertEqual(self.australia.numchild, 3)
+        self.assertEqual(
+            list(self.australia.get_children().values_list("route__name", flat=True)),
+            ["HIR-BNE", "HIR-SYD", "GZO-BNE"],
+        )
+
+        # Pages added the usual way go after the imported ones
+        self.add_route(self.australia, "GZO-SYD")
+        self.assertEqual(Page.find_problems(), ([], [], [], [], []))
 
-# Create your tests here.
+    def test_rankings_are_populated(self):
+        import_routes(route_sheet(("HIR", "SYD"), ("GZO", "BNE"), ("HIR", "GZO")))
+        self.assertEqual(
+            self.get_ranking(DestinationRoute, destination=self.australia),
+            [("HIR-BNE", 0), ("HIR-SYD", 1), ("GZO-BNE", 2)],
+        )
+        self.assertEqual(self.get_ranking(WhereWeFlyDomesticRoute), [("HIR-GZO", 0)])
+        self.assertEqual(len(self.get_ranking(WhereWeFlyInternationalRoute)), 3)
+        self.assertEqual(
+            set(
+                RouteRelatedRoute.objects.values_list(
+                    "route__name", "related_route__name"
+                )
+            ),
+            {("HIR-BNE", "GZO-BNE"), ("GZO-BNE", "HIR-BNE")},
+        )
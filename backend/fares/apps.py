@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class FaresConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'fares'
+
+    def ready(self):
+        from .signals import register_signal_handlers
+
+        register_signal_handlers()
@@ -0,0 +1,197 @@
+import logging
+from decimal import Decimal
+
+import pandas as pd
+from django.db import transaction
+
+from explore.models import Route
+from imports.importers import ImportResult, check_columns, invalidate_imported_content
+from .matrix import invalidate_fare_matrix
+from .models import Fare
+
+logger = logging.getLogger(__name__)
+
+EXPECTED_COLUMNS = [
+    "Fare Family",
+    "Price",
+    "Currency",
+    "Trip Type",
+    "Origin",
+    "Destination",
+]
+
+# Fields rewritten when an uploaded fare matches a stored (fare_family, route)
+UPDATE_FIELDS = ["price", "currency", "trip_type", "origin", "destination"]
+
+CENT = Decimal("0.01")
+
+
+class FareImportResult(ImportResult):
+    def __init__(self):
+        super().__init__()
+        self.updated = 0
+        self.unchanged = 0
+        self.duplicate_fares = []
+
+    def get_messages(self):
+        messages = []
+        if self.created > 0:
+            messages.append(["success", f"Uploaded {self.created} fares."])
+        if self.updated > 0:
+            messages.append(["success", f"Updated {self.updated} existing fares."])
+        if not (self.created or self.updated):
+            if self.unchanged:
+                messages.append(
+                    ["info", f"All {self.unchanged} fares are already up to date."]
+                )
+            else:
+                messages.append(["warning", "No fares uploaded. Check data."])
+
+        if self.duplicate_fares:
+            messages.append(
+                [
+                    "error",
+                    f"Duplicate fares found: {'; '.join(self.duplicate_fares)}. Each fare family must be unique for a given route.",
+                ]
+            )
+
+        if self.skipped_rows:
+            messages.append(
+                ["warning", f"Skipped rows {self.skipped_rows} due to invalid data."]
+            )
+        return messages
+
+
+def find_invalid_fields(df):
+    """
+    Validate every cell of the sheet at once.
+
+    Returns:
+        DataFrame: One boolean column per expected column, True where the
+        cell is invalid.
+    """
+    invalid = pd.DataFrame(index=df.index)
+    for column in EXPECTED_COLUMNS:
+        invalid[column] = df[column].isna()
+    invalid["Trip Type"] |= df["Trip Type"].astype(str).str.lower() != "one way"
+    for column in ["Fare Family", "Currency", "Origin", "Destination"]:
+        max_length = Fare._meta.get_field(column.lower().replace(" ", "_")).max_length
+        invalid[column] |= df[column].astype(str).str.len() > max_length
+    return invalid
+
+
+def import_fares(df, progress=None):
+    """
+    Import year round fares from an uploaded sheet.
+
+    The sheet is validated column-wise and every route name is resolved in
+    one query. Fares are then upserted on their (fare_family, route) key in a
+    single statement, so an uploaded price replaces the stored one. Rows
+    that repeat an earlier row's fare family and route are reported as
+    duplicates.
+
+    Args:
+        df (DataFrame): The uploaded sheet.
+        progress (callable): Called as ``progress(rows_processed, created,
+            skipped)`` once the fares are saved.
+
+    Returns:
+        FareImportResult: Counts of created, updated and unchanged fares,
+        duplicates and skipped rows.
+
+    Raises:
+        InvalidSheet: If expected columns are missing.
+    """
+    check_columns(df, EXPECTED_COLUMNS)
+    result = FareImportResult()
+
+    for column in ["Fare Family", "Currency", "Origin", "Destination"]:
+        df[column] = df[column].astype("string").str.strip()
+    # Parse price as numeric
+    df["Price"] = pd.to_numeric(df["Price"], errors="coerce")
+
+    invalid = find_invalid_fields(df)
+    invalid_rows = invalid.any(axis=1)
+    for index in df.index[invalid_rows]:
+        invalid_fields = invalid.columns[invalid.loc[index]].tolist()
+        result.skipped_rows.append(index)
+        logger.warning(
+            f"Skipped row {index}: Invalid or missing fields: {', '.join(invalid_fields)}"
+        )
+
+    valid = df[~invalid_rows]
+    route_names = valid["Origin"] + "-" + valid["Destination"]
+    routes = dict(
+        Route.objects.filter(name__in=set(route_names)).values_list("name", "pk")
+    )
+    route_ids = route_names.map(routes)
+    for index in valid.index[route_ids.isna()]:
+        logger.error(f"Route {route_names[index]} does not exist")
+        result.skipped_rows.append(index)
+
+    valid = valid[route_ids.notna()].assign(route_id=route_ids.astype("Int64"))
+    duplicated = valid.duplicated(["Fare Family", "route_id"])
+    for index in valid.index[duplicated]:
+        fare_family, route_name = valid.at[index, "Fare Family"], route_names[index]
+        result.duplicate_fares.append(
+            f"Row {index + 1}: {fare_family} for route {route_name}"
+        )
+        logger.warning(f"Duplicate fare: {fare_family} for route {route_name}")
+    valid = valid[~duplicated]
+
+    existing = {}
+    stored_fares = Fare.objects.filter(
+        route__in=set(valid["route_id"].tolist())
+    ).values_list("fare_family", "route", *UPDATE_FIELDS)
+    for fare_family, route_id, *values in stored_fares:
+        existing[(fare_family, route_id)] = tuple(values)
+
+    fares = []
+    changed_origins = set()
+    for fare_family, route_id, price, currency, origin, destination in zip(
+        valid["Fare Family"],
+        valid["route_id"].tolist(),
+        valid["Price"],
+        valid["Currency"],
+        valid["Origin"],
+        valid["Destination"],
+    ):
+        price = Decimal(str(price)).quantize(CENT)
+        values = (price, currency, "One way", origin, destination)
+        stored = existing.get((fare_family, route_id))
+        if stored == values:
+            result.unchanged += 1
+            continue
+        if stored is None:
+            result.created += 1
+        else:
+            result.updated += 1
+            changed_origins.add(stored[UPDATE_FIELDS.index("origin")])
+        changed_origins.add(origin)
+        fares.append(
+            Fare(
+                fare_family=fare_family,
+                route_id=route_id,
+                **dict(zip(UPDATE_FIELDS, values)),
+            )
+        )
+
+    if fares:
+        with transaction.atomic():
+            Fare.objects.bulk_create(
+                fares,
+                update_conflicts=True,
+                unique_fields=["fare_family", "route"],
+                update_fields=UPDATE_FIELDS,
+            )
+        invalidate_imported_content()
+        invalidate_fare_matrix(changed_origins)
+    logger.info(
+        f"Imported fares: {result.created} added, {result.updated} updated, "
+        f"{result.unchanged} unchanged"
+    )
+    if progress:
+        progress(len(df), result.created, len(result.skipped_rows))
+
+    result.skipped_rows.sort()
+    return result
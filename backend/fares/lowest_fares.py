@@ -0,0 +1,136 @@
+import math
+from collections import defaultdict, namedtuple
+
+import pytz
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from api.cache import get_cache_version
+from core.currency import convert_prices, get_rates
+from explore.models import SpecialRoute
+from .models import Fare
+
+# Kinds of key the lowest fares are indexed by
+ROUTE, DESTINATION, SCOPE = "route", "destination", "scope"
+
+LowestFare = namedtuple("LowestFare", ["price", "currency"])
+NO_FARE = LowestFare(None, None)
+
+
+def get_today():
+    """Return today's date in the Solomon Islands, as SpecialRoute.is_expired does."""
+    return timezone.now().astimezone(pytz.timezone("Pacific/Guadalcanal")).date()
+
+
+def choose_fare(prices):
+    """
+    Pick the "fares from" price out of the lowest price in each currency.
+
+    Prices in different currencies cannot be compared, so the lowest price in
+    settings.FARES_DEFAULT_CURRENCY wins, or else the one in the first
+    currency code alphabetically.
+    """
+    currency = settings.FARES_DEFAULT_CURRENCY
+    if currency not in prices:
+        currency = min(prices)
+    return LowestFare(prices[currency], currency)
+
+
+def build_lowest_fares(today, currency=None):
+    """
+    Work out the lowest fare of every route, destination and flight scope.
+
+    Year round fares and the special fares that have not expired by
+    ``today`` are read in two queries, from live routes only. Given a
+    currency, every price is first converted to it in one NumPy pass, so
+    fares quoted in different currencies are compared too; prices that
+    cannot be converted are left out.
+
+    Returns:
+        dict: (ROUTE, route id), (DESTINATION, destination id) or (SCOPE,
+        flight scope) -> LowestFare.
+    """
+    live_route = {"route__live": True}
+    rows = list(
+        Fare.objects.filter(**live_route).values_list(
+            "route",
+            "route__destination_country",
+            "route__flight_scope",
+            "price",
+            "currency",
+        )
+    )
+    rows += SpecialRoute.objects.filter(
+        Q(special__end_date__isnull=True) | Q(special__end_date__gte=today),
+        special__live=True,
+        currency__isnull=False,
+        **live_route,
+    ).values_list(
+        "route",
+        "route__destination_country",
+        "route__flight_scope",
+        "starting_price",
+        "currency__currency_code",
+    )
+
+    if currency:
+        converted = convert_prices(
+            [row[3] for row in rows], [row[4] for row in rows], currency
+        )
+        rows = [
+            (*row[:3], price, currency)
+            for row, price in zip(rows, converted.tolist())
+            if not math.isnan(price)
+        ]
+
+    prices = defaultdict(dict)
+    for route_id, destination_id, flight_scope, price, currency in rows:
+        keys = [(ROUTE, route_id), (SCOPE, flight_scope)]
+        if destination_id:
+            keys.append((DESTINATION, destination_id))
+        for key in keys:
+            if currency not in prices[key] or price < prices[key][currency]:
+                prices[key][currency] = price
+    return {key: choose_fare(currencies) for key, currencies in prices.items()}
+
+
+# The index this process last loaded for each currency (None for prices as
+# quoted), as currency -> (cache key, lowest fares)
+_loaded = {}
+
+
+def get_lowest_fares(currency=None):
+    """
+    Return the lowest fares, cached per currency until fares, special fares,
+    routes or exchange rates change (which all advance the GraphQL response
+    cache generation).
+
+    The index is also kept in this process, so the "fares from" fields of a
+    page listing do not each read it back from the cache.
+    """
+    currency = currency.upper() if currency else None
+    if currency and currency not in get_rates():
+        return {}
+
+    today = get_today()
+    key = f"fares:lowest:{get_cache_version()}:{today.isoformat()}:{currency}"
+    loaded_key, lowest_fares = _loaded.get(currency, (None, None))
+    if loaded_key == key:
+        return lowest_fares
+
+    lowest_fares = cache.get(key)
+    if lowest_fares is None:
+        lowest_fares = build_lowest_fares(today, currency)
+        cache.set(key, lowest_fares, timeout=settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT)
+    _loaded[currency] = (key, lowest_fares)
+    return lowest_fares
+
+
+def get_lowest_fare(kind, key, currency=None):
+    """
+    Return the LowestFare of a route, destination or flight scope, converted
+    to a currency if one is given.
+    """
+    return get_lowest_fares(currency).get((kind, key), NO_FARE)
@@ -0,0 +1,130 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import Upper
+
+from api.cache import bump_cache_version, get_cache_version
+from .models import Fare
+
+# Advanced whenever a fare changes (see fares.signals and fares.importer).
+# Only the assembled matrix is keyed on it; each origin's part is cached on
+# its own and dropped only when one of its fares changes.
+VERSION_KEY = "fares:matrix:version"
+ORIGIN_KEY_PREFIX = "fares:matrix:origin"
+
+
+def get_origin_key(origin):
+    return f"{ORIGIN_KEY_PREFIX}:{origin}"
+
+
+def invalidate_fare_matrix(origins):
+    """Drop the cached matrix parts of some origin codes (None is ignored)."""
+    origins = {origin.upper() for origin in origins if origin}
+    if origins:
+        cache.delete_many([get_origin_key(origin) for origin in origins])
+    bump_cache_version(VERSION_KEY)
+
+
+def build_origin_fares(origins):
+    """
+    Serialize the fares departing from some origins, in one query.
+
+    Each origin becomes a compact map of destination -> fare family ->
+    [price, currency]. Should two fares share an origin, destination and
+    fare family (e.g. fares not linked to a route), the lowest price is kept.
+
+    Args:
+        origins (iterable): Upper-case origin codes.
+
+    Returns:
+        dict: Origin code -> (JSON text of its map, ETag), for the origins
+        that have fares.
+    """
+    fares = (
+        Fare.objects.annotate(origin_code=Upper("origin"))
+        .filter(origin_code__in=list(origins))
+        .order_by("origin_code", "destination", "fare_family", "-price")
+        .values_list("origin_code", "destination", "fare_family", "price", "currency")
+    )
+    matrix = {}
+    for origin, destination, fare_family, price, currency in fares:
+        destinations = matrix.setdefault(origin, {})
+        destinations.setdefault(destination.upper(), {})[fare_family] = [
+            float(price),
+            currency,
+        ]
+
+    parts = {}
+    for origin, destinations in matrix.items():
+        text = json.dumps(destinations, separators=(",", ":"))
+        parts[origin] = (text, hashlib.sha256(text.encode()).hexdigest())
+    return parts
+
+
+def get_origin_fares(origins):
+    """
+    Return the serialized map and ETag of each origin that has fares.
+
+    Parts are read from the cache in one round trip and only the origins
+    missing from it are rebuilt, so a fare change costs one query for its
+    own origin rather than a rebuild of the whole matrix.
+    """
+    keys = {origin: get_origin_key(origin) for origin in origins}
+    cached = cache.get_many(keys.values())
+    parts = {origin: cached[key] for origin, key in keys.items() if key in cached}
+
+    missing = [origin for origin in keys if origin not in parts]
+    if missing:
+        built = build_origin_fares(missing)
+        cache.set_many(
+            {keys[origin]: part for origin, part in built.items()},
+            timeout=settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT,
+        )
+        parts.update(built)
+    return parts
+
+
+def get_fare_matrix():
+    """
+    Return the JSON body and ETag of the whole origin x destination matrix.
+
+    The body is cached until the next fare change. It is then put back
+    together from the cached origin parts, of which only the changed ones
+    are rebuilt.
+    """
+    key = f"fares:matrix:{get_cache_version(VERSION_KEY)}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    origins = sorted(
+        Fare.objects.annotate(origin_code=Upper("origin"))
+        .values_list("origin_code", flat=True)
+        .distinct()
+        .order_by()
+    )
+    parts = get_origin_fares(origins)
+    body = (
+        '{"origins":{'
+        + ",".join(
+            f"{json.dumps(origin)}:{parts[origin][0]}"
+            for origin in origins
+            if origin in parts
+        )
+        + "}}"
+    )
+    cached = (body, hashlib.sha256(body.encode()).hexdigest())
+    cache.set(key, cached, timeout=settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT)
+    return cached
+
+
+def get_origin_fare_matrix(origin):
+    """Return the JSON body and ETag of one origin's fares, or None."""
+    origin = origin.upper()
+    part = get_origin_fares([origin]).get(origin)
+    if part is None:
+        return None
+    text, etag = part
+    return f'{{"origin":{json.dumps(origin)},"destinations":{text}}}', etag
@@ -1,8 +1,11 @@
+import graphene
 from django.db import models
 from wagtail.snippets.models import register_snippet
-from grapple.models import GraphQLString, GraphQLFloat, GraphQLForeignKey
+from grapple.models import GraphQLString, GraphQLForeignKey
 from grapple.helpers import register_query_field
 
+from core.currency import GraphQLConvertible
+
 
 @register_query_field("fare")
 class Fare(models.Model):
@@ -25,7 +28,7 @@ class Fare(models.Model):
     # effective date
     graphql_fields = [
         GraphQLString("fare_family"),
-        GraphQLFloat("price"),
+        GraphQLConvertible("price", graphene.Float, source="get_price"),
         GraphQLString("currency"),
         GraphQLString("trip_type"),
         GraphQLString("origin"),
@@ -34,6 +37,14 @@ class Fare(models.Model):
         GraphQLForeignKey("route", "explore.Route"),
     ]
 
+    def get_price(self, info=None, currency=None):
+        """The price, converted to ``currency`` if one is given."""
+        if not currency:
+            return self.price
+        from .prices import get_converted_prices
+
+        return get_converted_prices(currency)["fares"].get(self.pk)
+
     # def __str__(self):
     #     return f"{self.fare_family} {self.route}: {self.price} {self.currency}"
     def __str__(self):
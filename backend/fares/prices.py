@@ -0,0 +1,69 @@
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.cache import get_cache_version
+from core.currency import convert_prices, get_rates
+from explore.models import SpecialRoute
+from .models import Fare
+
+# The converted prices this process last loaded for each currency, as
+# currency -> (cache key, prices)
+_loaded = {}
+
+
+def build_converted_prices(currency):
+    """
+    Convert every fare and special fare to one currency.
+
+    Each table is read in one query and converted in one NumPy pass (see
+    core.currency.convert_prices).
+
+    Returns:
+        dict: "fares" and "special_routes", each mapping primary key ->
+        converted price. Prices in a currency without a rate are left out.
+    """
+    tables = {
+        "fares": Fare.objects.values_list("pk", "price", "currency"),
+        "special_routes": SpecialRoute.objects.filter(
+            currency__isnull=False
+        ).values_list("pk", "starting_price", "currency__currency_code"),
+    }
+    converted_prices = {}
+    for name, rows in tables.items():
+        ids, prices, currencies = zip(*rows) if rows else ((), (), ())
+        converted = convert_prices(prices, currencies, currency)
+        converted_prices[name] = {
+            pk: price
+            for pk, price in zip(ids, converted.tolist())
+            if not math.isnan(price)
+        }
+    return converted_prices
+
+
+def get_converted_prices(currency):
+    """
+    Return every fare and special fare converted to a currency.
+
+    The converted sets are cached per currency under the GraphQL cache
+    generation, which fare, special fare and exchange rate changes advance.
+    Currencies without a rate convert nothing and are not cached.
+    """
+    currency = currency.upper()
+    if currency not in get_rates():
+        return {"fares": {}, "special_routes": {}}
+
+    key = f"fares:prices:{get_cache_version()}:{currency}"
+    loaded_key, converted_prices = _loaded.get(currency, (None, None))
+    if loaded_key == key:
+        return converted_prices
+
+    converted_prices = cache.get(key)
+    if converted_prices is None:
+        converted_prices = build_converted_prices(currency)
+        cache.set(
+            key, converted_prices, timeout=settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT
+        )
+    _loaded[currency] = (key, converted_prices)
+    return converted_prices
@@ -0,0 +1,37 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from .matrix import invalidate_fare_matrix
+from .models import Fare
+
+
+def remember_stored_origin(sender, instance, **kwargs):
+    """Note the origin a fare had before this save, in case it is changed."""
+    instance._stored_origin = (
+        Fare.objects.filter(pk=instance.pk).values_list("origin", flat=True).first()
+        if instance.pk
+        else None
+    )
+
+
+def invalidate_fare_matrix_on_change(sender, instance, **kwargs):
+    invalidate_fare_matrix(
+        [instance.origin, getattr(instance, "_stored_origin", None)]
+    )
+
+
+def register_signal_handlers():
+    """
+    Rebuild the fare matrix parts of the origins a saved or deleted fare
+    departs from (before and after the change).
+    """
+    pre_save.connect(
+        remember_stored_origin, sender=Fare, dispatch_uid="fare_matrix_pre_save"
+    )
+    post_save.connect(
+        invalidate_fare_matrix_on_change, sender=Fare, dispatch_uid="fare_matrix_save"
+    )
+    post_delete.connect(
+        invalidate_fare_matrix_on_change,
+        sender=Fare,
+        dispatch_uid="fare_matrix_delete",
+    )
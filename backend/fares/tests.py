@@ -1,3 +1,227 @@
+import datetime
+from decimal import Decimal
+
+import pandas as pd
+from django.core.cache import cache
 from django.test import TestCase
+from wagtail.models import Page
+
+from api.cache import get_cache_version
+from core.models import Airport, Currency, ExchangeRate
+from explore.models import (
+    Destination,
+    DestinationIndexPage,
+    ExploreIndexPage,
+    Route,
+    Special,
+    SpecialRoute,
+)
+from home.models import HomePage
+from .importer import import_fares
+from .lowest_fares import DESTINATION, ROUTE, SCOPE, LowestFare, build_lowest_fares
+from .matrix import get_origin_fare_matrix
+from .models import Fare
+
+
+def fare_row(fare_family, price, origin="HIR", destination="BNE", **columns):
+    row = {
+        "Fare Family": fare_family,
+        "Price": price,
+        "Currency": "SBD",
+        "Trip Type": "One way",
+        "Origin": origin,
+        "Destination": destination,
+    }
+    row.update(columns)
+    return row
+
+
+def fare_sheet(*rows):
+    return pd.DataFrame(list(rows))
+
+
+class FareImporterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        home = Page.get_first_root_node().add_child(instance=HomePage(title="Home"))
+        explore = home.add_child(
+            instance=ExploreIndexPage(title="Explore", hero_title="Explore")
+        )
+        index = explore.add_child(
+            instance=DestinationIndexPage(
+                title="Destinations", hero_title="Destinations"
+            )
+        )
+        destination = index.add_child(
+            instance=Destination(
+                title="Australia", hero_title="Australia", country="Australia"
+            )
+        )
+        airports = {
+            code: Airport.objects.create(code=code, name=code, city=code, country="")
+            for code in ["HIR", "BNE"]
+        }
+        self.route = destination.add_child(
+            instance=Route(
+                title="Honiara to Brisbane",
+                hero_title="Honiara to Brisbane",
+                origin_port=airports["HIR"],
+                destination_port=airports["BNE"],
+            )
+        )
+        import_fares(fare_sheet(fare_row("Economy", 100), fare_row("Business", 500)))
+
+    def get_prices(self):
+        return dict(self.route.fares.values_list("fare_family", "price"))
+
+    def test_import(self):
+        self.assertEqual(self.get_prices(), {"Economy": 100, "Business": 500})
+
+    def test_reimport_only_counts_changes(self):
+        version = get_cache_version()
+        result = import_fares(
+            fare_sheet(fare_row("Economy", 100), fare_row("Business", 450.5))
+        )
+        self.assertEqual((result.created, result.updated, result.unchanged), (0, 1, 1))
+        self.assertEqual(self.get_prices()["Business"], 450.5)
+        self.assertNotEqual(get_cache_version(), version)
+
+    def test_unchanged_import_keeps_the_cache(self):
+        version = get_cache_version()
+        result = import_fares(fare_sheet(fare_row("Economy", 100)))
+        self.assertEqual(result.get_messages()[0][0], "info")
+        self.assertEqual(get_cache_version(), version)
+
+    def test_invalid_unknown_and_duplicate_rows(self):
+        result = import_fares(
+            fare_sheet(
+                fare_row("Economy", "free"),
+                fare_row("Economy", 90, **{"Trip Type": "Return"}),
+                fare_row("Economy", 90, destination="SYD"),
+                fare_row("Premium", 300),
+                fare_row("Premium", 350),
+            )
+        )
+        self.assertEqual(result.skipped_rows, [0, 1, 2])
+        self.assertEqual(result.duplicate_fares, ["Row 5: Premium for route HIR-BNE"])
+        self.assertEqual(self.get_prices()["Premium"], 300)
+        self.assertEqual(Fare.objects.count(), 3)
+
+    def test_fare_matrix_sees_imported_prices(self):
+        self.assertIn('"Economy":[100.0,"SBD"]', get_origin_fare_matrix("HIR")[0])
+        import_fares(fare_sheet(fare_row("Economy", 120)))
+        self.assertIn('"Economy":[120.0,"SBD"]', get_origin_fare_matrix("HIR")[0])
+
+
+class LowestFareTests(TestCase):
+    today = datetime.date(2025, 6, 1)
+
+    def setUp(self):
+        cache.clear()
+        self.home = Page.get_first_root_node().add_child(
+            instance=HomePage(title="Home")
+        )
+        explore = self.home.add_child(
+            instance=ExploreIndexPage(title="Explore", hero_title="Explore")
+        )
+        index = explore.add_child(
+            instance=DestinationIndexPage(
+                title="Destinations", hero_title="Destinations"
+            )
+        )
+        self.australia = index.add_child(
+            instance=Destination(
+                title="Australia", hero_title="Australia", country="Australia"
+            )
+        )
+        airports = {
+            code: Airport.objects.create(code=code, name=code, city=code, country="")
+            for code in ["HIR", "BNE", "SYD"]
+        }
+        self.brisbane, self.sydney = [
+            self.australia.add_child(
+                instance=Route(
+                    title=f"HIR to {code}",
+                    hero_title=f"HIR to {code}",
+                    origin_port=airports["HIR"],
+                    destination_port=airports[code],
+                )
+            )
+            for code in ["BNE", "SYD"]
+        ]
+        self.currencies = {
+            code: Currency.objects.create(
+                country_name=code,
+                country_code=code[:2],
+                currency_name=code,
+                currency_code=code,
+                currency_symbol="$",
+            )
+            for code in ["SBD", "AUD"]
+        }
+        ExchangeRate.objects.create(currency_code="AUD", rate=Decimal("0.2"))
+        for route, fare_family, price, currency in [
+            (self.brisbane, "Economy", 1000, "SBD"),
+            (self.brisbane, "Saver", 150, "AUD"),
+            # No exchange rate for FJD
+            (self.sydney, "Economy", 300, "AUD"),
+            (self.sydney, "Saver", 100, "FJD"),
+        ]:
+            Fare.objects.create(
+                route=route,
+                fare_family=fare_family,
+                price=price,
+                currency=currency,
+                origin=route.origin_port.code,
+                destination=route.destination_port.code,
+            )
+
+    def add_special_fare(self, route, price, end_date):
+        special = self.home.add_child(
+            instance=Special(
+                title=f"Sale {price}",
+                hero_title="Sale",
+                name="Sale",
+                special_code=str(price),
+                discount="10%",
+                booking_class="Y",
+                trip_type="return",
+                start_date=datetime.date(2025, 1, 1),
+                end_date=end_date,
+            )
+        )
+        SpecialRoute.objects.create(
+            special=special,
+            route=route,
+            starting_price=price,
+            trip_type="return",
+            currency=self.currencies["SBD"],
+        )
+
+    def test_default_currency_is_preferred(self):
+        lowest_fares = build_lowest_fares(self.today)
+        self.assertEqual(lowest_fares[(ROUTE, self.brisbane.pk)], (1000, "SBD"))
+        # Without an SBD price, the first currency alphabetically
+        self.assertEqual(lowest_fares[(ROUTE, self.sydney.pk)], (300, "AUD"))
+        self.assertEqual(lowest_fares[(DESTINATION, self.australia.pk)], (1000, "SBD"))
+        self.assertEqual(lowest_fares[(SCOPE, "international route")], (1000, "SBD"))
+
+    def test_expired_special_fares_are_left_out(self):
+        self.add_special_fare(self.brisbane, 500, datetime.date(2025, 5, 31))
+        self.add_special_fare(self.sydney, 700, self.today)
+        lowest_fares = build_lowest_fares(self.today)
+        self.assertEqual(lowest_fares[(ROUTE, self.brisbane.pk)], (1000, "SBD"))
+        self.assertEqual(lowest_fares[(ROUTE, self.sydney.pk)], (700, "SBD"))
+        self.assertEqual(lowest_fares[(DESTINATION, self.australia.pk)], (700, "SBD"))
 
-# Create your tests here.
+    def test_prices_are_compared_in_one_currency(self):
+        lowest_fares = build_lowest_fares(self.today, "SBD")
+        # 150 AUD is 750 SBD; 100 FJD cannot be converted
+        self.assertEqual(
+            lowest_fares[(ROUTE, self.brisbane.pk)], LowestFare(750, "SBD")
+        )
+        self.assertEqual(lowest_fares[(ROUTE, self.sydney.pk)], (1500, "SBD"))
+        self.assertEqual(
+            build_lowest_fares(self.today, "AUD")[(ROUTE, self.brisbane.pk)],
+            (150, "AUD"),
+        )
@@ -1,3 +1,30 @@
-from django.shortcuts import render
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import condition, require_GET
 
-# Create your views here.
+from .matrix import get_fare_matrix, get_origin_fare_matrix
+
+
+def fare_matrix_etag(request):
+    return get_fare_matrix()[1]
+
+
+@require_GET
+@condition(etag_func=fare_matrix_etag)
+def fare_matrix(request):
+    """Return every origin's fares, by destination and fare family, as JSON."""
+    return HttpResponse(get_fare_matrix()[0], content_type="application/json")
+
+
+def origin_fare_matrix_etag(request, origin):
+    cached = get_origin_fare_matrix(origin)
+    return cached[1] if cached else None
+
+
+@require_GET
+@condition(etag_func=origin_fare_matrix_etag)
+def origin_fare_matrix(request, origin):
+    """Return one origin's fares, by destination and fare family, as JSON."""
+    cached = get_origin_fare_matrix(origin)
+    if cached is None:
+        raise Http404("No fares from this origin")
+    return HttpResponse(cached[0], content_type="application/json")
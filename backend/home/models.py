@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Prefetch
 from wagtail.models import Page
 from wagtail.admin.panels import FieldPanel
 from grapple.models import (
@@ -126,6 +127,13 @@ class AllYouNeedPage(models.Model):
         GraphQLImage("page_svg_icon", name="pageSvgIcon"),
     ]
 
+    # Every page_* property goes through self.page.specific, so the pages are
+    # prefetched as their specific types
+    graphql_prefetch = dict.fromkeys(
+        ["page_description", "page_url", "page_hero_title", "page_svg_icon"],
+        [Prefetch("page", queryset=Page.objects.specific())],
+    )
+
     class Meta:
         unique_together = ("homepage", "page")
 
@@ -0,0 +1,70 @@
+import abc
+
+import pandas as pd
+from django.utils.module_loading import import_string
+
+from api.cache import invalidate_graphql_cache
+from .models import ImportJob
+
+# Import function for each kind of job. Each takes the uploaded DataFrame, an
+# optional progress callback and the job's options, and returns an ImportResult.
+IMPORTERS = {
+    ImportJob.KIND_SCHEDULES: "schedules.importer.import_schedules",
+    ImportJob.KIND_FARES: "fares.importer.import_fares",
+    ImportJob.KIND_SPECIAL_ROUTES: "explore.importer.import_special_routes",
+    ImportJob.KIND_ROUTES: "explore.importer.import_routes",
+    ImportJob.KIND_EXCHANGE_RATES: "core.importer.import_exchange_rates",
+}
+
+
+class InvalidSheet(Exception):
+    """Raised when an uploaded sheet cannot be imported at all."""
+
+
+class ImportResult(abc.ABC):
+    """
+    Outcome of an import, shared by every kind of upload.
+
+    Subclasses add their own counters and implement get_messages() with the
+    summary shown to the editor.
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.skipped_rows = []
+
+    @abc.abstractmethod
+    def get_messages(self):
+        """Return the summary as a list of [level, text] pairs."""
+
+    def get_details(self):
+        """Return extra JSON-serializable detail to store on the job."""
+        return {}
+
+
+def check_columns(df, expected_columns):
+    missing_cols = [col for col in expected_columns if col not in df.columns]
+    if missing_cols:
+        raise InvalidSheet(f"Missing columns: {', '.join(missing_cols)}")
+
+
+def invalidate_imported_content():
+    """
+    Invalidate the cached GraphQL responses after an import has written.
+
+    Importers write with bulk_create(), bulk_update() and QuerySet.update(),
+    none of which send the post_save signals that normally clear the cache
+    (see api.signals). Each importer calls this once its writes are done.
+    """
+    invalidate_graphql_cache()
+
+
+def read_sheet(file, filename):
+    """Read an uploaded CSV file or Excel workbook into a DataFrame."""
+    if filename.lower().endswith(".csv"):
+        return pd.read_csv(file)
+    return pd.read_excel(file)
+
+
+def get_importer(kind):
+    return import_string(IMPORTERS[kind])
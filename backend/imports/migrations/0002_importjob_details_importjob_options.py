@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 08:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='details',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='options',
+            field=models.JSONField(blank=True, default=dict, help_text='Keyword arguments for the importer'),
+        ),
+    ]
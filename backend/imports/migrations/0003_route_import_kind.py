@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-10-18 08:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("imports", "0002_importjob_details_importjob_options"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="importjob",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("schedules", "Flight Schedules"),
+                    ("fares", "Year Round Fares"),
+                    ("special_routes", "Special Fares"),
+                    ("routes", "Routes"),
+                ],
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 08:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0003_route_import_kind'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='importjob',
+            name='kind',
+            field=models.CharField(choices=[('schedules', 'Flight Schedules'), ('fares', 'Year Round Fares'), ('special_routes', 'Special Fares'), ('routes', 'Routes'), ('exchange_rates', 'Exchange Rates')], max_length=20),
+        ),
+    ]
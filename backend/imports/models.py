@@ -0,0 +1,175 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.urls import reverse
+from django.utils import timezone
+
+# Progress is written back at most this often (in seconds), so a large sheet
+# does not turn into one cache write per row.
+PROGRESS_SAVE_INTERVAL = 1
+
+# Progress outlives a worker that died mid-import for at most this long
+PROGRESS_TIMEOUT = 60 * 60
+
+
+class ImportJob(models.Model):
+    """An uploaded Excel workbook or CSV file imported by a background worker."""
+
+    KIND_SCHEDULES = "schedules"
+    KIND_FARES = "fares"
+    KIND_SPECIAL_ROUTES = "special_routes"
+    KIND_ROUTES = "routes"
+    KIND_EXCHANGE_RATES = "exchange_rates"
+
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+
+    kind = models.CharField(
+        max_length=20,
+        choices=[
+            (KIND_SCHEDULES, "Flight Schedules"),
+            (KIND_FARES, "Year Round Fares"),
+            (KIND_SPECIAL_ROUTES, "Special Fares"),
+            (KIND_ROUTES, "Routes"),
+            (KIND_EXCHANGE_RATES, "Exchange Rates"),
+        ],
+    )
+    file = models.FileField(upload_to="imports/")
+    original_filename = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            (STATUS_QUEUED, "Queued"),
+            (STATUS_RUNNING, "Running"),
+            (STATUS_SUCCEEDED, "Succeeded"),
+            (STATUS_FAILED, "Failed"),
+        ],
+        default=STATUS_QUEUED,
+    )
+    rows_total = models.PositiveIntegerField(default=0)
+    rows_processed = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    options = models.JSONField(
+        default=dict, blank=True, help_text="Keyword arguments for the importer"
+    )
+    messages = models.JSONField(
+        default=list, blank=True, help_text="Result messages as [level, text] pairs"
+    )
+    details = models.JSONField(default=dict, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    # Admin page each kind of upload is made from
+    UPLOAD_URL_NAMES = {
+        KIND_SCHEDULES: "schedule_upload",
+        KIND_FARES: "fare_upload",
+        KIND_SPECIAL_ROUTES: "special_route_upload",
+        KIND_ROUTES: "route_upload",
+        KIND_EXCHANGE_RATES: "exchange_rate_upload",
+    }
+
+    _last_progress_save = 0
+
+    def __str__(self):
+        return f"{self.get_kind_display()} import of {self.original_filename}"
+
+    @property
+    def is_dry_run(self):
+        return bool(self.options.get("dry_run"))
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+    def get_upload_url(self):
+        return reverse(self.UPLOAD_URL_NAMES[self.kind])
+
+    def start(self, rows_total):
+        self.status = self.STATUS_RUNNING
+        self.rows_total = rows_total
+        self.started_at = timezone.now()
+        self.save(update_fields=["status", "rows_total", "started_at"])
+
+    def get_progress_cache_key(self):
+        return f"imports:job:{self.pk}:progress"
+
+    def report_progress(self, rows_processed, created, skipped):
+        """
+        Record how far the import has got.
+
+        Importers report progress from inside their transaction, where a
+        saved row would stay invisible to the job page until the import
+        commits (and a dry run would roll it back), so progress goes to the
+        cache instead. finish() and fail() save the final counts.
+        """
+        self.rows_processed = rows_processed
+        self.created_count = created
+        self.skipped_count = skipped
+        now = time.monotonic()
+        if now - self._last_progress_save < PROGRESS_SAVE_INTERVAL:
+            return
+        self._last_progress_save = now
+        cache.set(
+            self.get_progress_cache_key(),
+            {"rows_processed": rows_processed, "created": created, "skipped": skipped},
+            PROGRESS_TIMEOUT,
+        )
+
+    def finish(self, result):
+        self.status = self.STATUS_SUCCEEDED
+        self.rows_processed = self.rows_total
+        self.created_count = result.created
+        self.skipped_count = len(result.skipped_rows)
+        self.messages = result.get_messages()
+        self.details = result.get_details()
+        self.error_count = sum(1 for level, _ in self.messages if level == "error")
+        self.finished_at = timezone.now()
+        self.save()
+        cache.delete(self.get_progress_cache_key())
+
+    def fail(self, message):
+        self.status = self.STATUS_FAILED
+        self.messages = [["error", message]]
+        self.error_count = 1
+        self.finished_at = timezone.now()
+        self.save()
+        cache.delete(self.get_progress_cache_key())
+
+    def get_progress(self):
+        if self.status == self.STATUS_RUNNING:
+            reported = cache.get(self.get_progress_cache_key())
+            if reported:
+                self.rows_processed = reported["rows_processed"]
+                self.created_count = reported["created"]
+                self.skipped_count = reported["skipped"]
+        return {
+            "id": self.pk,
+            "kind": self.kind,
+            "status": self.status,
+            "finished": self.is_finished,
+            "rowsTotal": self.rows_total,
+            "rowsProcessed": self.rows_processed,
+            "created": self.created_count,
+            "skipped": self.skipped_count,
+            "errors": self.error_count,
+            "messages": self.messages,
+        }
+
+    class Meta:
+        verbose_name = "Import Job"
+        verbose_name_plural = "Import Jobs"
+        ordering = ["-created_at"]
@@ -0,0 +1,30 @@
+import logging
+
+from django_tasks import task
+
+from .importers import InvalidSheet, get_importer, read_sheet
+from .models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+
+@task(backend="imports")
+def run_import_job(job_id):
+    """Parse an uploaded file and import it, recording progress on the job."""
+    job = ImportJob.objects.get(pk=job_id)
+    try:
+        with job.file.open("rb") as uploaded_file:
+            df = read_sheet(uploaded_file, job.original_filename)
+        logger.info(f"Import job {job.pk}: columns {df.columns.tolist()}")
+
+        job.start(rows_total=len(df))
+        result = get_importer(job.kind)(df, progress=job.report_progress, **job.options)
+    except InvalidSheet as e:
+        logger.warning(f"Import job {job.pk} rejected: {str(e)}")
+        job.fail(str(e))
+    except Exception as e:
+        logger.error(f"Import job {job.pk} failed: {str(e)}")
+        job.fail(f"Error processing file: {str(e)}")
+    else:
+        logger.info(f"Import job {job.pk} finished: {result.created} rows created")
+        job.finish(result)
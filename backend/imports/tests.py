@@ -0,0 +1,33 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+
+from .models import ImportJob
+
+
+class ImportJobProgressTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.job = ImportJob.objects.create(
+            kind=ImportJob.KIND_SCHEDULES,
+            file="imports/schedules.csv",
+            original_filename="schedules.csv",
+        )
+        self.job.start(rows_total=10)
+
+    def test_progress_is_visible_before_the_import_commits(self):
+        with transaction.atomic():
+            self.job.report_progress(4, 3, 1)
+            progress = ImportJob.objects.get(pk=self.job.pk).get_progress()
+            transaction.set_rollback(True)
+        self.assertEqual(
+            (progress["rowsProcessed"], progress["created"], progress["skipped"]),
+            (4, 3, 1),
+        )
+
+    def test_failed_job_saves_its_last_progress(self):
+        self.job.report_progress(4, 3, 1)
+        self.job.fail("Error processing file")
+        job = ImportJob.objects.get(pk=self.job.pk)
+        self.assertEqual((job.rows_processed, job.created_count), (4, 3))
+        self.assertIsNone(cache.get(self.job.get_progress_cache_key()))
@@ -0,0 +1,78 @@
+from django.contrib import messages
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.generic import View
+
+from .models import ImportJob
+from .tasks import run_import_job
+
+RECENT_JOBS_LIMIT = 10
+
+EXCEL_EXTENSIONS = (".xlsx", ".xls")
+
+
+def enqueue_import(request, kind, options=None, extensions=EXCEL_EXTENSIONS):
+    """
+    Store an uploaded workbook and queue it for a background import.
+
+    Args:
+        request (HttpRequest): The upload request, with an ``excel_file``.
+        kind (str): One of the ImportJob kinds.
+        options (dict): Keyword arguments passed on to the importer.
+        extensions (tuple): The file extensions accepted for this kind.
+
+    Returns:
+        HttpResponse: A redirect to the job's progress page, or back to the
+        upload page if the file was rejected.
+    """
+    excel_file = request.FILES.get("excel_file")
+    if excel_file is None or not excel_file.name.lower().endswith(extensions):
+        messages.error(
+            request, f"Please upload a valid file ({' or '.join(extensions)})."
+        )
+        return redirect(request.path)
+
+    job = ImportJob.objects.create(
+        kind=kind,
+        file=excel_file,
+        original_filename=excel_file.name,
+        options=options or {},
+        created_by=request.user,
+    )
+    run_import_job.enqueue(job.pk)
+    return redirect("import_job", job_id=job.pk)
+
+
+def get_recent_jobs(kind):
+    return ImportJob.objects.filter(kind=kind)[:RECENT_JOBS_LIMIT]
+
+
+class ImportJobView(View):
+    def get(self, request, job_id):
+        job = get_object_or_404(ImportJob, pk=job_id)
+        return render(request, "imports/import_job.html", {"job": job})
+
+
+class ApplyImportJobView(View):
+    """Re-run a finished dry run against the same file, this time saving it."""
+
+    def post(self, request, job_id):
+        preview = get_object_or_404(ImportJob, pk=job_id)
+        if not (preview.is_dry_run and preview.status == ImportJob.STATUS_SUCCEEDED):
+            messages.error(request, "Only a completed preview can be applied.")
+            return redirect("import_job", job_id=preview.pk)
+
+        job = ImportJob.objects.create(
+            kind=preview.kind,
+            file=preview.file.name,
+            original_filename=preview.original_filename,
+            options={**preview.options, "dry_run": False},
+            created_by=request.user,
+        )
+        run_import_job.enqueue(job.pk)
+        return redirect("import_job", job_id=job.pk)
+
+
+def import_job_progress(request, job_id):
+    job = get_object_or_404(ImportJob, pk=job_id)
+    return JsonResponse(job.get_progress())
@@ -0,0 +1,23 @@
+from wagtail import hooks
+from django.urls import path
+
+from .views import ApplyImportJobView, ImportJobView, import_job_progress
+
+
+def register_import_job_urls():
+    return [
+        path("imports/<int:job_id>/", ImportJobView.as_view(), name="import_job"),
+        path(
+            "imports/<int:job_id>/apply/",
+            ApplyImportJobView.as_view(),
+            name="import_job_apply",
+        ),
+        path(
+            "imports/<int:job_id>/progress/",
+            import_job_progress,
+            name="import_job_progress",
+        ),
+    ]
+
+
+hooks.register("register_admin_urls", register_import_job_urls)
@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 08:06
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0020_alter_newsarticle_hero_image_and_more'),
+        ('wagtailcore', '0094_alter_page_locale'),
+    ]
+
+    # first_published_at lives on wagtailcore_page, so the composite index for
+    # keyset pagination over (first_published_at, id) has to be created by hand.
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX news_page_first_published_id_idx ON wagtailcore_page (first_published_at, id);',
+            reverse_sql='DROP INDEX news_page_first_published_id_idx;',
+        ),
+    ]
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class SchedulesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'schedules'
+
+    def ready(self):
+        from .signals import register_signal_handlers
+
+        register_signal_handlers()
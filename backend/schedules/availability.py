@@ -0,0 +1,98 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from api.cache import get_cache_version
+from core.models import PortPair
+from core.port_pairs import VERSION_KEY as PORT_PAIRS_VERSION_KEY
+from .models import Flight
+from .operating_dates import get_dates
+from .timetable import VERSION_KEY as TIMETABLE_VERSION_KEY
+
+
+def build_availability(today):
+    """
+    Index every port pair by origin with a bitset of the dates it has service.
+
+    Bit n of a pair's bitset is set when at least one flight operates the
+    route on ``today + n days``, according to the schedules that have not
+    ended yet. Port pairs with no upcoming service are left out.
+
+    Returns:
+        dict: Origin code -> list of (PortPair, bitset).
+    """
+    service = defaultdict(int)
+    routes = (
+        Flight.objects.filter(schedule__end_date__gte=today)
+        .values_list(
+            "departure_port",
+            "arrival_port",
+            "days",
+            "schedule__start_date",
+            "schedule__end_date",
+        )
+        .distinct()
+    )
+    for origin, destination, days, start_date, end_date in routes:
+        bits = 0
+        for date in get_dates(days, max(start_date, today), end_date):
+            bits |= 1 << (date - today).days
+        service[(origin.upper(), destination.upper())] |= bits
+
+    pairs = defaultdict(list)
+    port_pairs = PortPair.objects.select_related("origin_port", "destination_port")
+    for port_pair in port_pairs.order_by("destination_port__city"):
+        origin = port_pair.origin_port.code.upper()
+        bits = service.get((origin, port_pair.destination_port.code.upper()))
+        if bits:
+            pairs[origin].append((port_pair, bits))
+    return dict(pairs)
+
+
+def get_availability():
+    """
+    Return today's availability index, cached until flights, schedules, port
+    pairs or airports change.
+
+    The key combines the timetable and port pair generations (see
+    schedules.timetable and core.port_pairs), so page and fare edits leave
+    the index alone.
+    """
+    today = timezone.localdate()
+    key = (
+        f"schedules:availability:{get_cache_version(TIMETABLE_VERSION_KEY)}:"
+        f"{get_cache_version(PORT_PAIRS_VERSION_KEY)}:{today.isoformat()}"
+    )
+    availability = cache.get(key)
+    if availability is None:
+        availability = build_availability(today)
+        cache.set(key, availability, timeout=settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT)
+    return today, availability
+
+
+def get_available_port_pairs(origin, start_date, end_date=None):
+    """
+    Return the port pairs from an origin with service between two dates.
+
+    Args:
+        origin (str): The origin airport code.
+        start_date (date): The first date of the travel window.
+        end_date (date): The last date of the window; defaults to start_date.
+
+    Returns:
+        list: PortPair objects, with both airports loaded, by destination city.
+    """
+    today, availability = get_availability()
+    first = max((start_date - today).days, 0)
+    last = ((end_date or start_date) - today).days
+    if last < first:
+        return []
+
+    window = ((1 << (last - first + 1)) - 1) << first
+    return [
+        port_pair
+        for port_pair, bits in availability.get(origin.upper(), [])
+        if bits & window
+    ]
@@ -0,0 +1,109 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+
+from api.cache import get_cache_version
+from .models import Flight, Schedule, format_days, format_hhmm
+
+# Column order of the values_list() query below.
+FLIGHT_COLUMNS = [
+    ("id", "id"),
+    ("days", "day"),
+    ("aircraft", "aircraft"),
+    ("flight_number", "flightNumber"),
+    ("departure_port", "departurePort"),
+    ("arrival_port", "arrivalPort"),
+    ("departure_minutes", "departureTime"),
+    ("arrival_minutes", "arrivalTime"),
+    ("flight_scope", "flightScope"),
+]
+
+# Typed columns rendered in the same form as the Flight GraphQL fields.
+COLUMN_FORMATTERS = {
+    "day": format_days,
+    "departureTime": format_hhmm,
+    "arrivalTime": format_hhmm,
+}
+
+# Low-cardinality columns stored as indexes into a shared dictionary instead of
+# repeating the same strings on every row.
+DICTIONARY_COLUMNS = {
+    "day": "days",
+    "aircraft": "aircraft",
+    "departurePort": "ports",
+    "arrivalPort": "ports",
+    "flightScope": "flightScopes",
+}
+
+
+def build_columnar_schedule(schedule):
+    """
+    Serialize a schedule and all of its flights in column-major form.
+
+    Each flight field becomes one array, so N flights cost one array per field
+    rather than N objects repeating every key. Ports, aircraft, days and flight
+    scopes are dictionary-encoded: their columns hold indexes into the matching
+    list in ``dictionaries`` (e.g. ``dictionaries["ports"]``).
+
+    Args:
+        schedule (Schedule): The schedule to serialize.
+
+    Returns:
+        dict: JSON-serializable payload.
+    """
+    rows = (
+        Flight.objects.filter(schedule=schedule)
+        .order_by("id")
+        .values_list(*(field for field, _ in FLIGHT_COLUMNS))
+    )
+    columns = {
+        name: list(values) for (_, name), values in zip(FLIGHT_COLUMNS, zip(*rows))
+    }
+    if not columns:
+        columns = {name: [] for _, name in FLIGHT_COLUMNS}
+
+    for column, formatter in COLUMN_FORMATTERS.items():
+        columns[column] = [formatter(value) for value in columns[column]]
+
+    dictionaries = {}
+    for column, dictionary_name in DICTIONARY_COLUMNS.items():
+        index = dictionaries.setdefault(dictionary_name, {})
+        columns[column] = [
+            index.setdefault(value, len(index)) for value in columns[column]
+        ]
+
+    return {
+        "schedule": {
+            "id": schedule.pk,
+            "startDate": schedule.start_date.isoformat(),
+            "endDate": schedule.end_date.isoformat(),
+        },
+        "count": len(columns["id"]),
+        "dictionaries": {name: list(index) for name, index in dictionaries.items()},
+        "columns": columns,
+    }
+
+
+def get_columnar_schedule(schedule_id):
+    """
+    Return the serialized JSON body and ETag for a schedule, or None.
+
+    The result is cached under the current published-content generation, so it
+    is rebuilt the first time it is requested after any schedule or flight
+    change.
+    """
+    key = f"schedules:columnar:{get_cache_version()}:{schedule_id}"
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    schedule = Schedule.objects.filter(pk=schedule_id).first()
+    if schedule is None:
+        return None
+
+    body = json.dumps(build_columnar_schedule(schedule), separators=(",", ":"))
+    cached = (body, hashlib.sha256(body.encode()).hexdigest())
+    cache.set(key, cached, timeout=settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT)
+    return cached
@@ -0,0 +1,433 @@
+import logging
+from datetime import datetime, time
+
+import pandas as pd
+from django.db import transaction
+
+from core.models import Airport
+from imports.importers import ImportResult, check_columns, invalidate_imported_content
+from .models import Flight, Schedule, format_days, format_hhmm, parse_days
+from .operating_dates import generate_operating_dates
+from .timetable import invalidate_timetable
+
+logger = logging.getLogger(__name__)
+
+# Spreadsheet column -> Flight field
+FLIGHT_COLUMNS = {
+    "Day": "days",
+    "Aircraft": "aircraft",
+    "Flight Number": "flight_number",
+    "Departure Port": "departure_port",
+    "Arrival Port": "arrival_port",
+    "Departure Time": "departure_minutes",
+    "Arrival Time": "arrival_minutes",
+    "Flight Scope": "flight_scope",
+}
+
+EXPECTED_COLUMNS = ["Start Date", "End Date", *FLIGHT_COLUMNS]
+
+BULK_CREATE_BATCH_SIZE = 1000
+
+
+# Import modes. Both insert new flights and update changed ones; sync also
+# deletes stored flights that are missing from the uploaded schedule.
+MODE_MERGE = "merge"
+MODE_SYNC = "sync"
+
+# Flight fields identifying a flight within a schedule
+FLIGHT_KEY_FIELDS = ["flight_number", "days", "departure_port", "arrival_port"]
+FLIGHT_VALUE_FIELDS = [
+    *(field for field in FLIGHT_COLUMNS.values() if field not in FLIGHT_KEY_FIELDS),
+    "departure_airport_id",
+    "arrival_airport_id",
+]
+INTEGER_FIELDS = ["days", "departure_minutes", "arrival_minutes"]
+
+# Changes listed per kind in a preview
+PREVIEW_LIMIT = 100
+
+
+class ScheduleImportResult(ImportResult):
+    def __init__(self, dry_run=False):
+        super().__init__()
+        self.dry_run = dry_run
+        self.created_schedules = 0
+        self.updated = 0
+        self.deleted = 0
+        self.unchanged = 0
+        self.changes = {"inserted": [], "updated": [], "deleted": []}
+
+    @property
+    def created_flights(self):
+        return self.created
+
+    def add_change(self, kind, description):
+        if len(self.changes[kind]) < PREVIEW_LIMIT:
+            self.changes[kind].append(description)
+
+    def get_messages(self):
+        messages = []
+        changed = self.created_schedules or self.created or self.updated or self.deleted
+        summary = (
+            f"{self.created_schedules} new schedules, {self.created} flights added, "
+            f"{self.updated} updated, {self.deleted} removed and "
+            f"{self.unchanged} unchanged."
+        )
+        if self.dry_run:
+            messages.append(["info", f"Preview: {summary} No changes have been saved."])
+        elif changed:
+            messages.append(["success", f"Uploaded {summary}"])
+        else:
+            messages.append(
+                ["warning", "No schedules or flights changed. Check data formats."]
+            )
+        if self.skipped_rows:
+            messages.append(
+                ["warning", f"Skipped rows {self.skipped_rows} due to invalid data."]
+            )
+        return messages
+
+    def get_details(self):
+        return {"changes": self.changes}
+
+
+def describe_flight(key):
+    flight_number, days, departure_port, arrival_port = key
+    return f"{flight_number} {format_days(days)} {departure_port}-{arrival_port}"
+
+
+def describe_value(field, value):
+    if value is not None and field.endswith("_minutes"):
+        return format_hhmm(value)
+    return value
+
+
+def sync_schedule_flights(schedule, rows, result, mode):
+    """
+    Apply the difference between a schedule's stored and uploaded flights.
+
+    Flights are matched on FLIGHT_KEY_FIELDS. Only new flights are inserted
+    and only flights whose other fields changed are updated, so re-uploading a
+    corrected timetable touches just the rows that differ.
+
+    Args:
+        schedule (Schedule): The schedule being imported.
+        rows (dict): Uploaded flights, FLIGHT_KEY_FIELDS tuple -> dict of
+            FLIGHT_VALUE_FIELDS.
+        result (ScheduleImportResult): Receives the counts and changes.
+        mode (str): MODE_MERGE or MODE_SYNC.
+    """
+    existing = {}
+    for flight in Flight.objects.filter(schedule=schedule).values(
+        "id", *FLIGHT_KEY_FIELDS, *FLIGHT_VALUE_FIELDS
+    ):
+        key = tuple(flight[field] for field in FLIGHT_KEY_FIELDS)
+        existing[key] = flight
+
+    to_create = []
+    to_update = []
+    for key, values in rows.items():
+        stored = existing.get(key)
+        if stored is None:
+            to_create.append(
+                Flight(schedule=schedule, **dict(zip(FLIGHT_KEY_FIELDS, key)), **values)
+            )
+            result.add_change("inserted", describe_flight(key))
+            continue
+
+        changed = [
+            field for field in FLIGHT_VALUE_FIELDS if stored[field] != values[field]
+        ]
+        if not changed:
+            result.unchanged += 1
+            continue
+        to_update.append(Flight(pk=stored["id"], **values))
+        result.add_change(
+            "updated",
+            f"{describe_flight(key)}: "
+            + ", ".join(
+                f"{field} {describe_value(field, stored[field])} -> "
+                f"{describe_value(field, values[field])}"
+                for field in changed
+            ),
+        )
+
+    to_delete = []
+    if mode == MODE_SYNC:
+        for key, stored in existing.items():
+            if key not in rows:
+                to_delete.append(stored["id"])
+                result.add_change("deleted", describe_flight(key))
+
+    Flight.objects.bulk_create(to_create, batch_size=BULK_CREATE_BATCH_SIZE)
+    Flight.objects.bulk_update(
+        to_update, FLIGHT_VALUE_FIELDS, batch_size=BULK_CREATE_BATCH_SIZE
+    )
+    if to_delete:
+        Flight.objects.filter(pk__in=to_delete).delete()
+
+    result.created += len(to_create)
+    result.updated += len(to_update)
+    result.deleted += len(to_delete)
+
+
+# Text formats accepted for flight times, tried in order
+TIME_FORMATS = ["%H:%M", "%I:%M %p", "%H:%M:%S", "%I:%M:%S %p"]
+
+
+def parse_minutes_column(values):
+    """
+    Convert a column of flight times to minutes after midnight in a few
+    vectorized passes.
+
+    Accepts datetime.time and datetime values, Excel time serials (fractions
+    of a day), HHMM numbers or strings (e.g. 800, "0800") and the text formats
+    in TIME_FORMATS.
+
+    Args:
+        values (Series): The raw column from the uploaded sheet.
+
+    Returns:
+        tuple: The minutes (missing where parsing failed) and a boolean mask of
+        the non-empty cells that could not be parsed.
+    """
+    result = pd.Series(None, index=values.index, dtype=object)
+    pending = values.notna()
+
+    # datetime.time cells (openpyxl time-formatted cells) and full datetimes
+    is_time = pending & values.map(lambda value: isinstance(value, (time, datetime)))
+    if is_time.any():
+        result[is_time] = [value.hour * 60 + value.minute for value in values[is_time]]
+        pending &= ~is_time
+
+    # Excel time serials and HHMM numbers, including HHMM digit strings
+    numbers = pd.to_numeric(values.where(pending), errors="coerce")
+    is_serial = (numbers >= 0) & (numbers < 1)
+    minutes = (numbers[is_serial] * 24 * 60).round().astype(int) % (24 * 60)
+    result[is_serial] = minutes.tolist()
+
+    is_hhmm = (
+        (numbers >= 1)
+        & (numbers % 1 == 0)
+        & (numbers // 100 < 24)
+        & (numbers % 100 < 60)
+    )
+    hhmm = numbers[is_hhmm].astype(int)
+    result[is_hhmm] = (hhmm // 100 * 60 + hhmm % 100).tolist()
+    pending &= numbers.isna()
+
+    # Text formats; "8:00am" is normalized to "8:00 AM" for %p
+    text = values[pending].astype(str).str.strip().str.upper()
+    text = text.str.replace(r"\s*([AP])\.?M\.?$", r" \1M", regex=True)
+    for fmt in TIME_FORMATS:
+        if text.empty:
+            break
+        parsed = pd.to_datetime(text, format=fmt, errors="coerce")
+        matched = parsed.notna()
+        parsed = parsed[matched]
+        result[matched[matched].index] = (
+            parsed.dt.hour * 60 + parsed.dt.minute
+        ).tolist()
+        text = text[~matched]
+
+    failed = values.notna() & result.isna()
+    return result, failed
+
+
+def parse_days_column(values):
+    """
+    Convert a column of weekday names to Flight.days bitmasks.
+
+    Each distinct spelling is parsed once, so the cost depends on the number
+    of different values rather than the number of rows.
+
+    Returns:
+        tuple: The bitmasks (missing where parsing failed) and a boolean mask of
+        the non-empty cells that could not be parsed.
+    """
+    bitmasks = {value: parse_days(value) for value in values.dropna().unique()}
+    result = values.map(bitmasks).astype(object)
+    failed = values.notna() & result.isna()
+    return result, failed
+
+
+def prepare_dataframe(df):
+    """Parse the date, day and time columns of an uploaded schedule in place."""
+    # Parse dates in MM/DD/YYYY format
+    df["Start Date"] = pd.to_datetime(
+        df["Start Date"], format="%m/%d/%Y", errors="coerce"
+    ).dt.date
+    df["End Date"] = pd.to_datetime(
+        df["End Date"], format="%m/%d/%Y", errors="coerce"
+    ).dt.date
+
+    parsers = {
+        "Day": parse_days_column,
+        "Departure Time": parse_minutes_column,
+        "Arrival Time": parse_minutes_column,
+    }
+    for column, parser in parsers.items():
+        raw = df[column]
+        df[column], failed = parser(raw)
+        if failed.any():
+            logger.warning(
+                f"Failed to parse {column} in rows {failed[failed].index.tolist()}: "
+                f"{raw[failed].tolist()}"
+            )
+    return df
+
+
+def find_invalid_fields(df):
+    """
+    Validate every flight cell of the sheet at once.
+
+    Besides missing values, text longer than the Flight field allows is
+    flagged here, since it would otherwise only fail at INSERT time and abort
+    the whole import transaction.
+
+    Returns:
+        DataFrame: One boolean column per spreadsheet column, True where the
+        cell is invalid.
+    """
+    invalid = pd.DataFrame(index=df.index)
+    for column, field_name in FLIGHT_COLUMNS.items():
+        values = df[column]
+        invalid[column] = values.isna()
+        max_length = Flight._meta.get_field(field_name).max_length
+        if max_length:
+            invalid[column] |= values.astype(str).str.len() > max_length
+    return invalid
+
+
+def import_schedule(start_date, end_date, group, invalid, airports, result, mode):
+    """
+    Reconcile the rows of one (Start Date, End Date) group with its Schedule.
+
+    Args:
+        group (DataFrame): The group's rows of the prepared sheet.
+        invalid (DataFrame): find_invalid_fields() of the whole sheet.
+        airports (dict): Airport code -> id.
+        result (ScheduleImportResult): Receives the counts and changes.
+        mode (str): MODE_MERGE or MODE_SYNC.
+
+    Returns:
+        Schedule: The schedule, if any of its flights changed.
+    """
+    # Create or get Schedule
+    schedule, created = Schedule.objects.get_or_create(
+        start_date=start_date, end_date=end_date
+    )
+    if created:
+        result.created_schedules += 1
+        logger.info(f"Created schedule: {start_date} to {end_date}")
+
+    group_invalid = invalid.loc[group.index].any(axis=1)
+    for index in group.index[group_invalid]:
+        invalid_fields = invalid.columns[invalid.loc[index]].tolist()
+        result.skipped_rows.append(index)
+        logger.warning(
+            f"Skipped row {index}: Invalid or missing fields: {', '.join(invalid_fields)}"
+        )
+
+    valid = group.loc[~group_invalid, list(FLIGHT_COLUMNS)]
+    valid.columns = list(FLIGHT_COLUMNS.values())
+    # Cast to the stored types, so unchanged rows compare equal
+    valid = valid.astype(str).astype(dict.fromkeys(INTEGER_FIELDS, int))
+    for port_field in ["departure_port", "arrival_port"]:
+        valid[port_field.replace("port", "airport_id")] = [
+            airports.get(code) for code in valid[port_field]
+        ]
+    duplicated = valid.duplicated(FLIGHT_KEY_FIELDS)
+    for index in valid.index[duplicated]:
+        result.skipped_rows.append(index)
+        logger.warning(
+            f"Skipped row {index}: Duplicate flight {describe_flight(tuple(valid.loc[index, FLIGHT_KEY_FIELDS]))}"
+        )
+
+    valid = valid[~duplicated]
+    rows = dict(
+        zip(
+            valid[FLIGHT_KEY_FIELDS].itertuples(index=False, name=None),
+            valid[FLIGHT_VALUE_FIELDS].to_dict("records"),
+        )
+    )
+    changes = (result.created, result.updated, result.deleted)
+    sync_schedule_flights(schedule, rows, result, mode)
+    logger.info(
+        f"Imported schedule {start_date} to {end_date}: {result.created} added, "
+        f"{result.updated} updated, {result.deleted} removed so far"
+    )
+    if changes != (result.created, result.updated, result.deleted):
+        return schedule
+    return None
+
+
+def import_schedules(df, progress=None, mode=MODE_MERGE, dry_run=False):
+    """
+    Import the flights of an uploaded schedule sheet.
+
+    Every row is validated up front, then each (Start Date, End Date) group
+    resolves its Schedule once and is reconciled with the stored flights in
+    bulk (see sync_schedule_flights); schedules whose flights changed then
+    have their operating dates regenerated.
+
+    The import runs in a single transaction, so a failure leaves the existing
+    schedules untouched. A dry run performs the same work and rolls it back,
+    so its preview is exactly what an import would change. Progress is
+    reported from inside the transaction, so the callback must not record it
+    in the database (ImportJob.report_progress writes it to the cache).
+
+    Args:
+        df (DataFrame): The uploaded sheet.
+        progress (callable): Called as ``progress(rows_processed, created,
+            skipped)`` after each schedule group.
+        mode (str): MODE_MERGE or MODE_SYNC.
+        dry_run (bool): Compute the changes without saving them.
+
+    Returns:
+        ScheduleImportResult: Change counts, previews and skipped row indexes.
+
+    Raises:
+        InvalidSheet: If expected columns are missing.
+    """
+    check_columns(df, EXPECTED_COLUMNS)
+    result = ScheduleImportResult(dry_run=dry_run)
+    rows_processed = 0
+    df = prepare_dataframe(df)
+    invalid = find_invalid_fields(df)
+
+    # Link ports to their Airport records, where one exists, in one query
+    port_codes = set(df["Departure Port"].dropna().astype(str))
+    port_codes |= set(df["Arrival Port"].dropna().astype(str))
+    airports = dict(
+        Airport.objects.filter(code__in=port_codes).values_list("code", "id")
+    )
+
+    with transaction.atomic():
+        # Group by start_date and end_date
+        grouped = df.groupby(["Start Date", "End Date"], dropna=False)
+        for (start_date, end_date), group in grouped:
+            rows_processed += len(group)
+            if pd.isna(start_date) or pd.isna(end_date):
+                result.skipped_rows.extend(group.index.tolist())
+                logger.warning(
+                    f"Skipped rows {group.index.tolist()}: Invalid Start Date or End Date"
+                )
+            else:
+                schedule = import_schedule(
+                    start_date, end_date, group, invalid, airports, result, mode
+                )
+                if schedule and not dry_run:
+                    generate_operating_dates(schedule)
+            if progress:
+                progress(rows_processed, result.created, len(result.skipped_rows))
+
+        if dry_run:
+            transaction.set_rollback(True)
+
+    if not dry_run and (result.created or result.updated or result.deleted):
+        invalidate_timetable()
+        invalidate_imported_content()
+
+    result.skipped_rows.sort()
+    return result
@@ -0,0 +1,145 @@
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+
+from .timetable import MINUTES_PER_DAY
+
+MAX_STOPS = 2
+
+# One flight of an itinerary, with the date it departs on. Departure and
+# arrival are naive local datetimes; flights arriving before they depart land
+# the next day.
+Leg = namedtuple("Leg", ["flight", "date", "departure", "arrival"])
+
+
+class Itinerary:
+    def __init__(self, legs):
+        self.legs = legs
+
+    @property
+    def departure(self):
+        return self.legs[0].departure
+
+    @property
+    def arrival(self):
+        return self.legs[-1].arrival
+
+    @property
+    def duration_minutes(self):
+        return int((self.arrival - self.departure).total_seconds() // 60)
+
+    @property
+    def stops(self):
+        return len(self.legs) - 1
+
+    @property
+    def connections(self):
+        return [leg.flight.arrival_port for leg in self.legs[:-1]]
+
+
+def get_leg(flight, date):
+    departure = datetime.combine(date, time()) + timedelta(
+        minutes=flight.departure_minutes
+    )
+    duration = (flight.arrival_minutes - flight.departure_minutes) % MINUTES_PER_DAY
+    return Leg(flight, date, departure, departure + timedelta(minutes=duration))
+
+
+def get_onward_legs(timetable, port, arrival, min_connection, max_connection):
+    """
+    Return the legs leaving a port within the connection window after an
+    arrival, following the window into the next day if it crosses midnight.
+    """
+    earliest = arrival + min_connection
+    latest = arrival + max_connection
+    legs = []
+    date = earliest.date()
+    while date <= latest.date():
+        after, before = 0, MINUTES_PER_DAY
+        if date == earliest.date():
+            after = earliest.hour * 60 + earliest.minute
+        if date == latest.date():
+            before = latest.hour * 60 + latest.minute + 1
+        legs.extend(
+            get_leg(flight, date)
+            for flight in timetable.get_departures(port, date, after, before)
+        )
+        date += timedelta(days=1)
+    return legs
+
+
+def find_itineraries(
+    timetable,
+    origin,
+    destination,
+    date,
+    max_stops=MAX_STOPS,
+    min_connection_minutes=None,
+    limit=None,
+):
+    """
+    Find direct flights and connections from origin to destination departing
+    on a date, ranked by total journey time.
+
+    The search walks the timetable's time-expanded graph: after each arrival
+    only the departures inside the connection window are considered, found by
+    binary search, and only towards ports from which the destination can still
+    be reached with the stops left. No port is visited twice.
+
+    Args:
+        timetable (Timetable): The flight index to search.
+        origin (str): The departure port code.
+        destination (str): The arrival port code.
+        date (date): The date of the first departure.
+        max_stops (int): The most connections allowed, up to MAX_STOPS.
+        min_connection_minutes (int): The shortest layover allowed; defaults
+            to settings.ITINERARY_MIN_CONNECTION_MINUTES.
+        limit (int): The number of itineraries to return, if set.
+
+    Returns:
+        list: Itinerary objects, shortest journey first.
+    """
+    origin, destination = origin.upper(), destination.upper()
+    max_stops = max(0, min(max_stops, MAX_STOPS))
+    if min_connection_minutes is None:
+        min_connection_minutes = settings.ITINERARY_MIN_CONNECTION_MINUTES
+    min_connection = timedelta(minutes=min_connection_minutes)
+    max_connection = timedelta(minutes=settings.ITINERARY_MAX_CONNECTION_MINUTES)
+
+    # reach[n]: the ports from which the destination is at most n flights away
+    reach = [{destination}]
+    for _ in range(max_stops):
+        previous = reach[-1]
+        reach.append(
+            previous
+            | {port for target in previous for port in timetable.get_origins(target)}
+        )
+
+    itineraries = []
+
+    def search(legs, stops_left):
+        port = legs[-1].flight.arrival_port.upper()
+        if port == destination:
+            itineraries.append(Itinerary(legs))
+            return
+        if not stops_left:
+            return
+
+        visited = {origin, *(leg.flight.arrival_port.upper() for leg in legs)}
+        for leg in get_onward_legs(
+            timetable, port, legs[-1].arrival, min_connection, max_connection
+        ):
+            next_port = leg.flight.arrival_port.upper()
+            if next_port in reach[stops_left - 1] and next_port not in visited:
+                search([*legs, leg], stops_left - 1)
+
+    for flight in timetable.get_departures(origin, date):
+        port = flight.arrival_port.upper()
+        if port in reach[max_stops] and port != origin:
+            search([get_leg(flight, date)], max_stops)
+
+    itineraries.sort(
+        key=lambda itinerary: (itinerary.duration_minutes, itinerary.departure)
+    )
+    return itineraries[:limit] if limit else itineraries
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-18 08:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0005_flight_aircraft'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['schedule', 'id'], name='flight_schedule_id_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-18 08:13
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_flights(apps, schema_editor):
+    # Earlier imports appended a second copy of every flight on re-upload, so
+    # keep the oldest copy of each flight before adding the constraint.
+    Flight = apps.get_model('schedules', 'Flight')
+    key_fields = ['schedule', 'flight_number', 'day', 'departure_port', 'arrival_port']
+    duplicates = (
+        Flight.objects.values(*key_fields)
+        .annotate(first_id=Min('id'), copies=Count('id'))
+        .filter(copies__gt=1)
+    )
+    for duplicate in duplicates:
+        first_id = duplicate.pop('first_id')
+        duplicate.pop('copies')
+        Flight.objects.filter(**duplicate).exclude(pk=first_id).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0006_flight_schedule_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_flights, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='flight',
+            constraint=models.UniqueConstraint(fields=('schedule', 'flight_number', 'day', 'departure_port', 'arrival_port'), name='unique_schedule_flight'),
+        ),
+    ]
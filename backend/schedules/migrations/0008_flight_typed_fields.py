@@ -0,0 +1,119 @@
+# Generated by Django 5.2 on 2026-10-18 08:15
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+
+def parse_days(value):
+    """Return the Flight.days bitmask of weekday names, or None if there are none."""
+    days = 0
+    for token in re.split(r'[^a-z]+', (value or '').lower()):
+        for weekday, name in enumerate(WEEKDAYS):
+            if token and (token == name or token == name[:3]):
+                days |= 1 << weekday
+    return days or None
+
+
+def parse_minutes(value):
+    """Return the minutes after midnight of an HHMM string, or None if it is not one."""
+    match = re.fullmatch(r'(\d{1,2})(\d{2})', (value or '').strip())
+    if not match:
+        return None
+    hours, minutes = int(match[1]), int(match[2])
+    if hours > 23 or minutes > 59:
+        return None
+    return hours * 60 + minutes
+
+
+def convert_flights(apps, schema_editor):
+    Flight = apps.get_model('schedules', 'Flight')
+    Airport = apps.get_model('core', 'Airport')
+    airports = dict(Airport.objects.values_list('code', 'id'))
+
+    flights = []
+    duplicate_ids = []
+    invalid = []
+    seen = set()
+    for flight in Flight.objects.order_by('id'):
+        flight.days = parse_days(flight.day)
+        flight.departure_minutes = parse_minutes(flight.departure_time)
+        flight.arrival_minutes = parse_minutes(flight.arrival_time)
+        flight.departure_airport_id = airports.get(flight.departure_port)
+        flight.arrival_airport_id = airports.get(flight.arrival_port)
+
+        # 0009 drops the raw columns, so never guess a value for them
+        unparsed = [
+            f'{field}={getattr(flight, field)!r}'
+            for field, value in [
+                ('day', flight.days),
+                ('departure_time', flight.departure_minutes),
+                ('arrival_time', flight.arrival_minutes),
+            ]
+            if value is None
+        ]
+        if unparsed:
+            invalid.append(f'{flight.id} ({", ".join(unparsed)})')
+            continue
+
+        # Spellings such as "Mon" and "Monday" now share a key; keep the first
+        key = (flight.schedule_id, flight.flight_number, flight.days, flight.departure_port, flight.arrival_port)
+        if key in seen:
+            duplicate_ids.append(flight.id)
+        else:
+            seen.add(key)
+            flights.append(flight)
+
+    if invalid:
+        raise ValueError(
+            'Cannot convert the day or times of these flights; correct or delete '
+            'them, then migrate again: ' + '; '.join(invalid)
+        )
+
+    Flight.objects.filter(id__in=duplicate_ids).delete()
+    Flight.objects.bulk_update(
+        flights,
+        ['days', 'departure_minutes', 'arrival_minutes', 'departure_airport', 'arrival_airport'],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0041_alter_genericpage_content'),
+        ('schedules', '0007_flight_unique_schedule_flight'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='flight',
+            name='arrival_airport',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='arriving_flights', to='core.airport'),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='arrival_minutes',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='days',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='departure_airport',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='departing_flights', to='core.airport'),
+        ),
+        migrations.AddField(
+            model_name='flight',
+            name='departure_minutes',
+            field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.RunPython(convert_flights, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2 on 2026-10-18 08:15
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0008_flight_typed_fields'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='flight',
+            name='unique_schedule_flight',
+        ),
+        migrations.RemoveField(
+            model_name='flight',
+            name='arrival_time',
+        ),
+        migrations.RemoveField(
+            model_name='flight',
+            name='day',
+        ),
+        migrations.RemoveField(
+            model_name='flight',
+            name='departure_time',
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='arrival_minutes',
+            field=models.PositiveSmallIntegerField(help_text='Arrival time in minutes after midnight', validators=[django.core.validators.MaxValueValidator(1439)]),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='days',
+            field=models.PositiveSmallIntegerField(help_text='Weekdays operated as a bitmask: Monday = 1, Tuesday = 2, ... Sunday = 64', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(127)]),
+        ),
+        migrations.AlterField(
+            model_name='flight',
+            name='departure_minutes',
+            field=models.PositiveSmallIntegerField(help_text='Departure time in minutes after midnight', validators=[django.core.validators.MaxValueValidator(1439)]),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['departure_airport', 'arrival_airport', 'days'], name='flight_airports_days_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flight',
+            index=models.Index(fields=['departure_port', 'arrival_port', 'days'], name='flight_ports_days_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='flight',
+            constraint=models.UniqueConstraint(fields=('schedule', 'flight_number', 'days', 'departure_port', 'arrival_port'), name='unique_schedule_flight'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-18 08:24
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def generate_operating_dates(apps, schema_editor):
+    Schedule = apps.get_model('schedules', 'Schedule')
+    OperatingDate = apps.get_model('schedules', 'OperatingDate')
+
+    for schedule in Schedule.objects.all():
+        operating_dates = []
+        flights = schedule.flights.values_list('id', 'days', 'departure_port', 'arrival_port')
+        for flight_id, days, departure_port, arrival_port in flights:
+            date = schedule.start_date
+            while date <= schedule.end_date:
+                if days & (1 << date.weekday()):
+                    operating_dates.append(OperatingDate(
+                        schedule=schedule,
+                        flight_id=flight_id,
+                        date=date,
+                        departure_port=departure_port.upper(),
+                        arrival_port=arrival_port.upper(),
+                    ))
+                date += timedelta(days=1)
+        OperatingDate.objects.bulk_create(operating_dates, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schedules', '0009_flight_typed_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OperatingDate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('departure_port', models.CharField(max_length=20)),
+                ('arrival_port', models.CharField(max_length=20)),
+                ('flight', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='operating_dates', to='schedules.flight')),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='operating_dates', to='schedules.schedule')),
+            ],
+            options={
+                'verbose_name': 'Operating Date',
+                'verbose_name_plural': 'Operating Dates',
+                'indexes': [models.Index(fields=['departure_port', 'arrival_port', 'date'], name='operating_date_route_idx'), models.Index(fields=['date'], name='operating_date_date_idx')],
+            },
+        ),
+        migrations.RunPython(generate_operating_dates, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,10 @@
+import re
+
 from django.db import models
-from django.core.validators import RegexValidator
+from django.core.validators import MaxValueValidator, MinValueValidator
 from wagtail.snippets.models import register_snippet
 from grapple.models import (
+    GraphQLInt,
     GraphQLString,
     GraphQLForeignKey,
     GraphQLCollection,
@@ -29,29 +32,91 @@ class Schedule(models.Model):
         unique_together = ["start_date", "end_date"]
 
 
+WEEKDAYS = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+# Every day of the week in Flight.days
+ALL_DAYS = (1 << len(WEEKDAYS)) - 1
+
+
+def weekday_bit(weekday):
+    """Return the Flight.days bit for a date.weekday() number (Monday = 0)."""
+    return 1 << weekday
+
+
+def format_days(days):
+    """Turn a Flight.days bitmask back into weekday names, e.g. "Monday"."""
+    return ", ".join(
+        name for weekday, name in enumerate(WEEKDAYS) if days & weekday_bit(weekday)
+    )
+
+
+def parse_days(value):
+    """
+    Turn weekday names into a Flight.days bitmask, or None if none are found.
+
+    Accepts full or three-letter names in any case, separated by anything that
+    is not a letter, e.g. "Monday", "mon", "Mon, Wed & Fri".
+    """
+    days = 0
+    for token in re.split(r"[^a-z]+", str(value).lower()):
+        for weekday, name in enumerate(WEEKDAYS):
+            if token and token in (name.lower(), name[:3].lower()):
+                days |= weekday_bit(weekday)
+    return days or None
+
+
+def format_hhmm(minutes):
+    """Turn minutes after midnight into the HHMM string shown to users."""
+    return f"{minutes // 60:02d}{minutes % 60:02d}"
+
+
 class Flight(models.Model):
     schedule = models.ForeignKey(
         Schedule, on_delete=models.CASCADE, related_name="flights"
     )
-    day = models.CharField(max_length=10)
+    days = models.PositiveSmallIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(ALL_DAYS)],
+        help_text="Weekdays operated as a bitmask: Monday = 1, Tuesday = 2, ... Sunday = 64",
+    )
     aircraft = models.CharField(max_length=30)  # e.g., "Boeing 737"
     flight_number = models.CharField(max_length=10)
     departure_port = models.CharField(max_length=20)  # e.g., "JFK"
     arrival_port = models.CharField(max_length=20)  # e.g., "LAX"
-    departure_time = models.CharField(
-        max_length=4,
-        validators=[
-            RegexValidator(r"^\d{4}$", "Time must be in HHMM format (e.g., 0800).")
-        ],
+    # Linked when the port code matches an Airport
+    departure_airport = models.ForeignKey(
+        "core.Airport",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="departing_flights",
+    )
+    arrival_airport = models.ForeignKey(
+        "core.Airport",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="arriving_flights",
     )
-    arrival_time = models.CharField(
-        max_length=4,
-        validators=[
-            RegexValidator(r"^\d{4}$", "Time must be in HHMM format (e.g., 1100).")
-        ],
+    departure_minutes = models.PositiveSmallIntegerField(
+        validators=[MaxValueValidator(24 * 60 - 1)],
+        help_text="Departure time in minutes after midnight",
+    )
+    arrival_minutes = models.PositiveSmallIntegerField(
+        validators=[MaxValueValidator(24 * 60 - 1)],
+        help_text="Arrival time in minutes after midnight",
     )
     flight_scope = models.CharField(max_length=50)  # e.g., "Domestic", "International"
 
+    # day, departure_time and arrival_time keep the string shapes the API has
+    # always returned ("Monday", "0800").
     graphql_fields = [
         GraphQLString("day"),
         GraphQLString("aircraft"),
@@ -61,12 +126,90 @@ class Flight(models.Model):
         GraphQLString("departure_time"),
         GraphQLString("arrival_time"),
         GraphQLString("flight_scope"),
+        GraphQLInt("days"),
+        GraphQLInt("departure_minutes"),
+        GraphQLInt("arrival_minutes"),
+        GraphQLForeignKey("departure_airport", "core.Airport"),
+        GraphQLForeignKey("arrival_airport", "core.Airport"),
         GraphQLForeignKey("schedule", "schedules.Schedule"),
     ]
 
+    @property
+    def day(self):
+        return format_days(self.days)
+
+    @property
+    def departure_time(self):
+        return format_hhmm(self.departure_minutes)
+
+    @property
+    def arrival_time(self):
+        return format_hhmm(self.arrival_minutes)
+
+    def operates_on(self, weekday):
+        return bool(self.days & weekday_bit(weekday))
+
     def __str__(self):
         return f"{self.flight_number}: {self.departure_port} to {self.arrival_port}"
 
     class Meta:
         verbose_name = "Flight"
         verbose_name_plural = "Flights"
+        indexes = [
+            # Serves keyset pagination over (schedule_id, id)
+            models.Index(fields=["schedule", "id"], name="flight_schedule_id_idx"),
+            models.Index(
+                fields=["departure_airport", "arrival_airport", "days"],
+                name="flight_airports_days_idx",
+            ),
+            models.Index(
+                fields=["departure_port", "arrival_port", "days"],
+                name="flight_ports_days_idx",
+            ),
+        ]
+        constraints = [
+            # Schedule imports match flights on this key
+            models.UniqueConstraint(
+                fields=[
+                    "schedule",
+                    "flight_number",
+                    "days",
+                    "departure_port",
+                    "arrival_port",
+                ],
+                name="unique_schedule_flight",
+            ),
+        ]
+
+
+class OperatingDate(models.Model):
+    """
+    One date a flight operates on, expanded from its schedule period and
+    weekdays. Regenerated by schedule imports and whenever a flight or
+    schedule is saved (see schedules.operating_dates and schedules.signals).
+    """
+
+    schedule = models.ForeignKey(
+        Schedule, on_delete=models.CASCADE, related_name="operating_dates"
+    )
+    flight = models.ForeignKey(
+        Flight, on_delete=models.CASCADE, related_name="operating_dates"
+    )
+    date = models.DateField()
+    # Copied from the flight (upper-cased) so route lookups need no join
+    departure_port = models.CharField(max_length=20)
+    arrival_port = models.CharField(max_length=20)
+
+    def __str__(self):
+        return f"{self.flight_id} on {self.date}"
+
+    class Meta:
+        verbose_name = "Operating Date"
+        verbose_name_plural = "Operating Dates"
+        indexes = [
+            models.Index(
+                fields=["departure_port", "arrival_port", "date"],
+                name="operating_date_route_idx",
+            ),
+            models.Index(fields=["date"], name="operating_date_date_idx"),
+        ]
@@ -0,0 +1,107 @@
+import calendar
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import WEEKDAYS, OperatingDate, weekday_bit
+
+BULK_CREATE_BATCH_SIZE = 5000
+
+# The furthest ahead operating dates can be requested, in months
+MAX_MONTHS = 12
+
+
+def get_dates(days, start_date, end_date):
+    """
+    Expand a Flight.days bitmask over a period into the dates it covers.
+
+    Returns:
+        list: Sorted dates between start_date and end_date (inclusive).
+    """
+    dates = []
+    for weekday in range(len(WEEKDAYS)):
+        if not days & weekday_bit(weekday):
+            continue
+        date = start_date + timedelta(days=(weekday - start_date.weekday()) % 7)
+        while date <= end_date:
+            dates.append(date)
+            date += timedelta(days=7)
+    return sorted(dates)
+
+
+def generate_operating_dates(schedule, flight_ids=None):
+    """
+    Replace the operating dates of every flight in a schedule, or of only
+    some of its flights.
+
+    Runs one DELETE, one SELECT and batched INSERTs, regardless of how many
+    flights changed.
+
+    Args:
+        schedule (Schedule): The schedule whose period the dates cover.
+        flight_ids (list): Only regenerate these flights' dates, if set.
+
+    Returns:
+        int: The number of operating dates created.
+    """
+    stored = OperatingDate.objects.filter(schedule=schedule)
+    flights = schedule.flights.all()
+    if flight_ids is not None:
+        # Flights moved to this schedule take their old dates with them
+        stored = OperatingDate.objects.filter(flight_id__in=flight_ids)
+        flights = flights.filter(id__in=flight_ids)
+    stored.delete()
+    operating_dates = [
+        OperatingDate(
+            schedule=schedule,
+            flight_id=flight_id,
+            date=date,
+            departure_port=departure_port.upper(),
+            arrival_port=arrival_port.upper(),
+        )
+        for flight_id, days, departure_port, arrival_port in flights.values_list(
+            "id", "days", "departure_port", "arrival_port"
+        )
+        for date in get_dates(days, schedule.start_date, schedule.end_date)
+    ]
+    OperatingDate.objects.bulk_create(
+        operating_dates, batch_size=BULK_CREATE_BATCH_SIZE
+    )
+    return len(operating_dates)
+
+
+def add_months(date, months):
+    """Add calendar months to a date, clamping the day to the month's length."""
+    month = date.month - 1 + months
+    year = date.year + month // 12
+    month = month % 12 + 1
+    day = min(date.day, calendar.monthrange(year, month)[1])
+    return date.replace(year=year, month=month, day=day)
+
+
+def get_operating_dates(
+    origin=None, destination=None, flight_number=None, months=MAX_MONTHS
+):
+    """
+    Return the dates with at least one matching flight, from today up to
+    ``months`` months ahead.
+
+    Args:
+        origin (str): The departure port code, if filtering by route.
+        destination (str): The arrival port code, if filtering by route.
+        flight_number (str): Only dates this flight operates, if set.
+        months (int): How far ahead to look, capped at MAX_MONTHS.
+
+    Returns:
+        list: Sorted, distinct dates.
+    """
+    today = timezone.localdate()
+    end_date = add_months(today, max(1, min(months, MAX_MONTHS)))
+    queryset = OperatingDate.objects.filter(date__gte=today, date__lt=end_date)
+    if origin:
+        queryset = queryset.filter(departure_port=origin.upper())
+    if destination:
+        queryset = queryset.filter(arrival_port=destination.upper())
+    if flight_number:
+        queryset = queryset.filter(flight__flight_number=flight_number)
+    return list(queryset.order_by("date").values_list("date", flat=True).distinct())
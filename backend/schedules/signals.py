@@ -0,0 +1,54 @@
+from django.db.models.signals import post_delete, post_save
+
+from core.models import Airport
+from .models import Flight, Schedule
+from .operating_dates import generate_operating_dates
+from .timetable import invalidate_timetable
+
+
+def invalidate_timetable_on_change(sender, **kwargs):
+    invalidate_timetable()
+
+
+def regenerate_schedule_dates(sender, instance, created, raw=False, **kwargs):
+    # A new schedule has no flights yet
+    if not created and not raw:
+        generate_operating_dates(instance)
+
+
+def regenerate_flight_dates(sender, instance, raw=False, **kwargs):
+    if not raw:
+        generate_operating_dates(instance.schedule, flight_ids=[instance.pk])
+
+
+def register_signal_handlers():
+    """
+    Rebuild the timetable whenever a flight or schedule changes, or an
+    airport attached to its flights does.
+
+    Saving a schedule or flight (e.g. in the snippet admin) also regenerates
+    its operating dates; deleting one removes them by cascade. Imports write
+    in bulk without signals and regenerate the dates themselves.
+    """
+    post_save.connect(
+        regenerate_schedule_dates,
+        sender=Schedule,
+        dispatch_uid="operating_dates_save_schedule",
+    )
+    post_save.connect(
+        regenerate_flight_dates,
+        sender=Flight,
+        dispatch_uid="operating_dates_save_flight",
+    )
+
+    for model in [Airport, Flight, Schedule]:
+        post_save.connect(
+            invalidate_timetable_on_change,
+            sender=model,
+            dispatch_uid=f"timetable_save_{model._meta.label_lower}",
+        )
+        post_delete.connect(
+            invalidate_timetable_on_change,
+            sender=model,
+            dispatch_uid=f"timetable_delete_{model._meta.label_lower}",
+        )
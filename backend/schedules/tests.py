@@ -1,3 +1,480 @@
-from django.test import TestCase
+import datetime
+from unittest import mock
 
-# Create your tests here.
+import pandas as pd
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from api.cache import invalidate_graphql_cache
+from core.models import Airport, PortPair
+from .availability import get_available_port_pairs
+from .importer import MODE_SYNC, import_schedules, parse_minutes_column
+from .itineraries import find_itineraries
+from .models import WEEKDAYS, Flight, OperatingDate, Schedule, parse_days
+from .timetable import Timetable, get_timetable
+
+
+def create_flight(schedule, flight_number, departure_port, arrival_port, **fields):
+    fields.setdefault("days", parse_days("Monday"))
+    fields.setdefault("aircraft", "Dash 8")
+    fields.setdefault("departure_minutes", 8 * 60)
+    fields.setdefault("arrival_minutes", 9 * 60 + 30)
+    fields.setdefault("flight_scope", "Domestic")
+    return Flight.objects.create(
+        schedule=schedule,
+        flight_number=flight_number,
+        departure_port=departure_port,
+        arrival_port=arrival_port,
+        **fields,
+    )
+
+
+class ScheduleTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.schedule = Schedule.objects.create(
+            start_date=datetime.date(2025, 1, 1), end_date=datetime.date(2025, 3, 31)
+        )
+
+
+class ColumnarScheduleTests(ScheduleTestCase):
+    def test_flights_are_dictionary_encoded(self):
+        first = create_flight(self.schedule, "IE100", "HIR", "GZO")
+        second = create_flight(
+            self.schedule, "IE101", "GZO", "HIR", days=parse_days("Mon, Fri")
+        )
+        url = reverse("schedule_flights", args=[self.schedule.pk])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["count"], 2)
+        self.assertEqual(payload["columns"]["id"], [first.pk, second.pk])
+        self.assertEqual(payload["columns"]["departureTime"], ["0800", "0800"])
+        ports = payload["dictionaries"]["ports"]
+        self.assertEqual(
+            [ports[index] for index in payload["columns"]["departurePort"]],
+            ["HIR", "GZO"],
+        )
+        days = payload["dictionaries"]["days"]
+        self.assertEqual(
+            [days[index] for index in payload["columns"]["day"]],
+            ["Monday", "Monday, Friday"],
+        )
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+    def test_unknown_schedule(self):
+        url = reverse("schedule_flights", args=[self.schedule.pk + 1])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+def hhmm(value):
+    return int(value[:2]) * 60 + int(value[2:])
+
+
+class ItineraryTests(ScheduleTestCase):
+    # A Monday in the test schedule
+    date = datetime.date(2025, 1, 6)
+
+    def setUp(self):
+        super().setUp()
+        for flight_number, days, route, departure, arrival in [
+            ("IE100", "Monday", "HIR-GZO", "0800", "0930"),
+            ("IE200", "Monday", "HIR-MUA", "0700", "0800"),
+            ("IE201", "Monday", "MUA-GZO", "0820", "0920"),
+            ("IE202", "Monday", "MUA-GZO", "0900", "1000"),
+            ("IE300", "Monday", "HIR-RNL", "2200", "2330"),
+            ("IE301", "Tuesday", "RNL-GZO", "0030", "0130"),
+            ("IE400", "Monday", "HIR-AKS", "0600", "0630"),
+            ("IE401", "Monday", "AKS-MUA", "0715", "0745"),
+        ]:
+            departure_port, arrival_port = route.split("-")
+            create_flight(
+                self.schedule,
+                flight_number,
+                departure_port,
+                arrival_port,
+                days=parse_days(days),
+                departure_minutes=hhmm(departure),
+                arrival_minutes=hhmm(arrival),
+            )
+        self.timetable = Timetable.load()
+
+    def find(self, **kwargs):
+        return [
+            (itinerary.connections, itinerary.duration_minutes)
+            for itinerary in find_itineraries(
+                self.timetable, "hir", "gzo", self.date, **kwargs
+            )
+        ]
+
+    def test_direct_and_connecting_flights_shortest_first(self):
+        # IE201 leaves MUA too soon after IE200 and IE401 arrive
+        self.assertEqual(
+            self.find(),
+            [([], 90), (["MUA"], 180), (["RNL"], 210), (["AKS", "MUA"], 240)],
+        )
+
+    def test_overnight_connection(self):
+        itinerary = find_itineraries(self.timetable, "HIR", "GZO", self.date)[2]
+        self.assertEqual(
+            [leg.date for leg in itinerary.legs],
+            [self.date, self.date + datetime.timedelta(days=1)],
+        )
+        self.assertEqual(itinerary.arrival, datetime.datetime(2025, 1, 7, 1, 30))
+
+    def test_max_stops(self):
+        self.assertEqual(self.find(max_stops=0), [([], 90)])
+        self.assertEqual(len(self.find(max_stops=1)), 3)
+
+    def test_min_connection_and_limit(self):
+        self.assertEqual(
+            self.find(min_connection_minutes=15, limit=3),
+            [([], 90), (["MUA"], 140), (["MUA"], 180)],
+        )
+
+    def test_no_flights_outside_the_schedule(self):
+        self.assertEqual(
+            find_itineraries(self.timetable, "HIR", "GZO", datetime.date(2025, 4, 7)),
+            [],
+        )
+
+
+class TimetableTests(ScheduleTestCase):
+    def test_reused_until_flights_change(self):
+        create_flight(self.schedule, "IE100", "HIR", "GZO")
+        monday = datetime.date(2025, 1, 6)
+        timetable = get_timetable()
+        with self.assertNumQueries(0):
+            self.assertIs(get_timetable(), timetable)
+
+        create_flight(self.schedule, "IE101", "HIR", "GZO")
+        self.assertEqual(
+            [
+                flight.flight_number
+                for flight in get_timetable().get_flights("HIR", "GZO", monday)
+            ],
+            ["IE100", "IE101"],
+        )
+
+    def test_not_rebuilt_for_unrelated_content(self):
+        timetable = get_timetable()
+        invalidate_graphql_cache()
+        with self.assertNumQueries(0):
+            self.assertIs(get_timetable(), timetable)
+
+    def test_rebuilt_after_an_import(self):
+        # The sheet's schedule already exists, so only the bulk-created
+        # flights change
+        timetable = get_timetable()
+        import_schedules(schedule_sheet(schedule_row("IE100")))
+        self.assertIsNot(get_timetable(), timetable)
+
+
+class AvailabilityTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.localdate()
+        self.schedule = Schedule.objects.create(
+            start_date=self.today, end_date=self.today + datetime.timedelta(days=30)
+        )
+        honiara, gizo, munda = [
+            Airport.objects.create(code=code, name=city, city=city, country="SB")
+            for code, city in [("HIR", "Honiara"), ("GZO", "Gizo"), ("MUA", "Munda")]
+        ]
+        PortPair.objects.create(origin_port=honiara, destination_port=gizo)
+        PortPair.objects.create(origin_port=honiara, destination_port=munda)
+        create_flight(
+            self.schedule, "IE100", "HIR", "GZO", days=parse_days(WEEKDAYS[0])
+        )
+
+    def get_destinations(self, start_date, end_date=None):
+        return [
+            port_pair.destination_port.code
+            for port_pair in get_available_port_pairs("hir", start_date, end_date)
+        ]
+
+    def test_only_port_pairs_with_service_in_the_window(self):
+        monday = self.today + datetime.timedelta(days=-self.today.weekday() % 7)
+        self.assertEqual(self.get_destinations(monday), ["GZO"])
+        self.assertEqual(self.get_destinations(monday + datetime.timedelta(days=1)), [])
+        self.assertEqual(
+            self.get_destinations(self.today, self.today + datetime.timedelta(days=6)),
+            ["GZO"],
+        )
+
+    def test_cached_until_flights_change(self):
+        self.get_destinations(self.today)
+        invalidate_graphql_cache()
+        with self.assertNumQueries(0):
+            self.get_destinations(self.today)
+
+        create_flight(
+            self.schedule, "IE200", "HIR", "MUA", days=parse_days(", ".join(WEEKDAYS))
+        )
+        self.assertIn("MUA", self.get_destinations(self.today))
+
+
+class OperatingDateTests(ScheduleTestCase):
+    def get_dates(self, **filters):
+        return list(
+            OperatingDate.objects.filter(**filters)
+            .order_by("date")
+            .values_list("date", flat=True)
+        )
+
+    def test_dates_follow_flight_and_schedule_edits(self):
+        flight = create_flight(self.schedule, "IE100", "hir", "GZO")
+        dates = self.get_dates(flight=flight)
+        self.assertEqual(len(dates), 13)
+        self.assertEqual(dates[0], datetime.date(2025, 1, 6))
+        self.assertEqual(OperatingDate.objects.filter(departure_port="HIR").count(), 13)
+
+        flight.days = parse_days("Mon, Fri")
+        flight.save()
+        self.assertEqual(len(self.get_dates(flight=flight)), 26)
+
+        self.schedule.end_date = datetime.date(2025, 1, 31)
+        self.schedule.save()
+        self.assertEqual(self.get_dates(flight=flight)[-1], datetime.date(2025, 1, 31))
+        self.assertEqual(len(self.get_dates(flight=flight)), 9)
+
+    def test_saving_a_flight_leaves_the_others_alone(self):
+        first = create_flight(self.schedule, "IE100", "HIR", "GZO")
+        second = create_flight(self.schedule, "IE101", "GZO", "HIR")
+        stored = set(OperatingDate.objects.filter(flight=first).values_list("id"))
+        second.save()
+        self.assertEqual(
+            set(OperatingDate.objects.filter(flight=first).values_list("id")), stored
+        )
+
+    def test_moved_flight_takes_the_new_schedule_dates(self):
+        flight = create_flight(self.schedule, "IE100", "HIR", "GZO")
+        summer = Schedule.objects.create(
+            start_date=datetime.date(2025, 4, 1), end_date=datetime.date(2025, 4, 30)
+        )
+        flight.schedule = summer
+        flight.save()
+        dates = self.get_dates(flight=flight)
+        self.assertEqual(len(dates), 4)
+        self.assertEqual(dates[0], datetime.date(2025, 4, 7))
+        self.assertFalse(OperatingDate.objects.filter(schedule=self.schedule).exists())
+
+    def test_deleted_flight_loses_its_dates(self):
+        flight = create_flight(self.schedule, "IE100", "HIR", "GZO")
+        flight.delete()
+        self.assertFalse(OperatingDate.objects.exists())
+
+
+def schedule_row(flight_number, departure_time="08:00", **columns):
+    row = {
+        "Start Date": "01/01/2025",
+        "End Date": "03/31/2025",
+        "Day": "Monday",
+        "Aircraft": "Dash 8",
+        "Flight Number": flight_number,
+        "Departure Port": "HIR",
+        "Arrival Port": "GZO",
+        "Departure Time": departure_time,
+        "Arrival Time": "09:30",
+        "Flight Scope": "Domestic",
+    }
+    row.update(columns)
+    return row
+
+
+def schedule_sheet(*rows):
+    return pd.DataFrame(list(rows))
+
+
+class ScheduleImporterTests(TestCase):
+    def setUp(self):
+        self.honiara = Airport.objects.create(
+            code="HIR", name="Honiara", city="Honiara", country="Solomon Islands"
+        )
+
+    def test_import(self):
+        result = import_schedules(
+            schedule_sheet(
+                schedule_row("IE100"),
+                schedule_row("IE101", Day="mon & fri", **{"Arrival Port": "MUA"}),
+                schedule_row("IE102", departure_time="not a time"),
+            )
+        )
+        self.assertEqual(result.created_schedules, 1)
+        self.assertEqual(result.created, 2)
+        self.assertEqual(result.skipped_rows, [2])
+
+        flight = Flight.objects.get(flight_number="IE101")
+        self.assertEqual(flight.day, "Monday, Friday")
+        self.assertEqual(flight.departure_minutes, 8 * 60)
+        self.assertEqual(flight.departure_airport, self.honiara)
+        self.assertIsNone(flight.arrival_airport)
+        self.assertTrue(flight.operating_dates.exists())
+
+    def test_reimport_only_writes_changes(self):
+        import_schedules(schedule_sheet(schedule_row("IE100"), schedule_row("IE101")))
+        result = import_schedules(
+            schedule_sheet(
+                schedule_row("IE100"),
+                schedule_row("IE101", departure_time="8:15am"),
+                schedule_row("IE102"),
+            )
+        )
+        self.assertEqual((result.created, result.updated, result.unchanged), (1, 1, 1))
+        self.assertEqual(
+            result.changes["updated"],
+            ["IE101 Monday HIR-GZO: departure_minutes 0800 -> 0815"],
+        )
+        self.assertEqual(
+            Flight.objects.get(flight_number="IE101").departure_time, "0815"
+        )
+
+    def test_sync_deletes_missing_flights(self):
+        import_schedules(schedule_sheet(schedule_row("IE100"), schedule_row("IE101")))
+        result = import_schedules(schedule_sheet(schedule_row("IE100")), mode=MODE_SYNC)
+        self.assertEqual(result.deleted, 1)
+        self.assertQuerySetEqual(
+            Flight.objects.values_list("flight_number", flat=True), ["IE100"]
+        )
+
+    def test_dry_run_saves_nothing(self):
+        result = import_schedules(schedule_sheet(schedule_row("IE100")), dry_run=True)
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.get_messages()[0][0], "info")
+        self.assertFalse(Schedule.objects.exists())
+        self.assertFalse(Flight.objects.exists())
+
+    def test_progress_is_reported_after_each_schedule(self):
+        calls = []
+        import_schedules(
+            schedule_sheet(
+                schedule_row("IE100"),
+                schedule_row("IE101", **{"Start Date": "04/01/2025"}),
+            ),
+            progress=lambda *args: calls.append(args),
+        )
+        self.assertEqual(calls, [(1, 1, 0), (2, 2, 0)])
+
+    def test_failed_import_is_rolled_back(self):
+        import_schedules(schedule_sheet(schedule_row("IE100")))
+        sheet = schedule_sheet(
+            schedule_row("IE101"),
+            schedule_row("IE102", **{"Start Date": "04/01/2025"}),
+        )
+        # Fail on the second schedule, after the first has been imported
+        with mock.patch(
+            "schedules.importer.generate_operating_dates",
+            side_effect=[None, RuntimeError],
+        ):
+            with self.assertRaises(RuntimeError):
+                import_schedules(sheet)
+        self.assertQuerySetEqual(
+            Flight.objects.values_list("flight_number", flat=True), ["IE100"]
+        )
+        self.assertEqual(Schedule.objects.count(), 1)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        def count_queries(count):
+            rows = [schedule_row(f"IE{number}") for number in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                import_schedules(schedule_sheet(*rows))
+            Schedule.objects.all().delete()
+            return len(queries)
+
+        # Few enough operating dates for SQLite to insert them in one batch
+        self.assertEqual(count_queries(10), count_queries(2))
+
+
+class ParseMinutesColumnTests(TestCase):
+    def test_formats(self):
+        values = pd.Series(
+            [
+                datetime.time(8, 5),
+                datetime.datetime(2025, 1, 1, 13, 45),
+                0.5,
+                800,
+                "0930",
+                "7:15",
+                "7:15 pm",
+                "7:15p.m.",
+                "23:59:00",
+                None,
+                "soon",
+                2460,
+            ]
+        )
+        minutes, failed = parse_minutes_column(values)
+        self.assertEqual(
+            minutes.dropna().tolist(), [485, 825, 720, 480, 570, 435, 1155, 1155, 1439]
+        )
+        self.assertEqual(failed[failed].index.tolist(), [10, 11])
+
+
+class TypedFieldsMigrationTests(TransactionTestCase):
+    before = [("schedules", "0007_flight_unique_schedule_flight")]
+    after = [("schedules", "0008_flight_typed_fields")]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.before)
+        apps = executor.loader.project_state(self.before).apps
+        schedule = apps.get_model("schedules", "Schedule").objects.create(
+            start_date=datetime.date(2025, 1, 1), end_date=datetime.date(2025, 3, 31)
+        )
+        self.Flight = apps.get_model("schedules", "Flight")
+        self.flight_fields = {
+            "schedule": schedule,
+            "aircraft": "Dash 8",
+            "departure_port": "HIR",
+            "arrival_port": "GZO",
+            "flight_scope": "Domestic",
+        }
+
+    def tearDown(self):
+        self.Flight.objects.all().delete()
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def create_flight(self, flight_number, day, departure_time, arrival_time):
+        return self.Flight.objects.create(
+            flight_number=flight_number,
+            day=day,
+            departure_time=departure_time,
+            arrival_time=arrival_time,
+            **self.flight_fields,
+        )
+
+    def migrate(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.after)
+        return executor.loader.project_state(self.after).apps
+
+    def test_converts_flights(self):
+        flight = self.create_flight("IE100", "Mon, Fri", "0805", "930")
+        apps = self.migrate()
+        flight = apps.get_model("schedules", "Flight").objects.get(pk=flight.pk)
+        self.assertEqual(
+            (flight.days, flight.departure_minutes, flight.arrival_minutes),
+            (1 | 16, 8 * 60 + 5, 9 * 60 + 30),
+        )
+
+    def test_refuses_to_guess_unparseable_values(self):
+        self.create_flight("IE100", "Monday", "0800", "0930")
+        bad_day = self.create_flight("IE101", "Someday", "0800", "0930")
+        bad_time = self.create_flight("IE102", "Monday", "8am", "2460")
+        with self.assertRaises(ValueError) as raised:
+            self.migrate()
+        message = str(raised.exception)
+        self.assertIn(f"{bad_day.pk} (day='Someday')", message)
+        self.assertIn(
+            f"{bad_time.pk} (departure_time='8am', arrival_time='2460')", message
+        )
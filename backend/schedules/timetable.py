@@ -0,0 +1,155 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from heapq import merge
+
+from api.cache import bump_cache_version, get_cache_version
+from core.models import Airport
+from .models import WEEKDAYS, Flight, Schedule
+
+MINUTES_PER_DAY = 24 * 60
+
+# Advanced whenever a flight, schedule or airport changes (see
+# schedules.signals and schedules.importer)
+VERSION_KEY = "schedules:timetable:version"
+
+
+def invalidate_timetable():
+    bump_cache_version(VERSION_KEY)
+
+
+def departure_order(flight):
+    return (flight.departure_minutes, flight.id)
+
+
+class Timetable:
+    """
+    In-memory index of every stored flight, for answering "what flies from A
+    to B on this date" without touching the database.
+
+    Flights are bucketed by (schedule, origin, destination, weekday) and
+    sorted by departure time, so a lookup only reads the flights of one route
+    on one weekday in the schedules covering the date.
+
+    The departures of each port are also kept per schedule and weekday,
+    sorted by departure time: a time-expanded graph in which the onward
+    flights after a given arrival are found by binary search (see
+    schedules.itineraries).
+    """
+
+    def __init__(self, schedules, flights, version=None):
+        self.version = version
+        self._schedules = sorted(schedules, key=lambda schedule: schedule.start_date)
+        self._flights = defaultdict(list)
+        self._departures = defaultdict(list)
+        self._origins = defaultdict(set)
+        for flight in flights:
+            route = (flight.departure_port.upper(), flight.arrival_port.upper())
+            self._origins[route[1]].add(route[0])
+            for weekday in range(len(WEEKDAYS)):
+                if flight.operates_on(weekday):
+                    self._flights[(flight.schedule_id, *route, weekday)].append(flight)
+                    self._departures[(flight.schedule_id, route[0], weekday)].append(
+                        flight
+                    )
+
+        for flights in [*self._flights.values(), *self._departures.values()]:
+            flights.sort(key=departure_order)
+        self._departure_minutes = {
+            key: [flight.departure_minutes for flight in flights]
+            for key, flights in self._departures.items()
+        }
+
+    @classmethod
+    def load(cls, version=None):
+        """
+        Build a timetable from the database in three queries.
+
+        Schedules and airports are attached to their flights up front, so
+        resolving them later (e.g. in GraphQL) does not query per flight.
+        """
+        schedules = Schedule.objects.in_bulk()
+        airports = Airport.objects.in_bulk()
+        flights = list(Flight.objects.all())
+        for flight in flights:
+            flight.schedule = schedules[flight.schedule_id]
+            flight.departure_airport = airports.get(flight.departure_airport_id)
+            flight.arrival_airport = airports.get(flight.arrival_airport_id)
+        return cls(schedules.values(), flights, version=version)
+
+    def get_schedules(self, date):
+        """Return the schedules whose period covers a date."""
+        return [
+            schedule
+            for schedule in self._schedules
+            if schedule.start_date <= date <= schedule.end_date
+        ]
+
+    def get_flights(self, origin, destination, date):
+        """
+        Return the flights from origin to destination operating on a date.
+
+        Args:
+            origin (str): The departure port code.
+            destination (str): The arrival port code.
+            date (date): The travel date.
+
+        Returns:
+            list: Flight objects ordered by departure time.
+        """
+        route = (origin.upper(), destination.upper(), date.weekday())
+        return list(
+            merge(
+                *(
+                    self._flights.get((schedule.pk, *route), [])
+                    for schedule in self.get_schedules(date)
+                ),
+                key=departure_order,
+            )
+        )
+
+    def get_departures(self, port, date, after=0, before=MINUTES_PER_DAY):
+        """
+        Return the flights leaving a port on a date between ``after``
+        (inclusive) and ``before`` (exclusive) minutes after midnight, ordered
+        by departure time.
+        """
+        departures = []
+        for schedule in self.get_schedules(date):
+            key = (schedule.pk, port.upper(), date.weekday())
+            minutes = self._departure_minutes.get(key, [])
+            flights = self._departures[key] if minutes else []
+            departures.append(
+                flights[bisect_left(minutes, after) : bisect_left(minutes, before)]
+            )
+        return list(merge(*departures, key=departure_order))
+
+    def get_origins(self, port):
+        """Return the ports with a direct flight to a port on any day."""
+        return self._origins.get(port.upper(), set())
+
+
+_timetable = None
+_lock = threading.Lock()
+
+
+def get_timetable():
+    """
+    Return this process's timetable, rebuilding it if content has changed.
+
+    The timetable is tied to its own cache generation, which schedule imports
+    and flight, schedule and airport edits advance, so every process rebuilds
+    its copy on the first lookup after a change, and page or fare edits leave
+    it alone.
+    """
+    global _timetable
+
+    version = get_cache_version(VERSION_KEY)
+    timetable = _timetable
+    if timetable is not None and timetable.version == version:
+        return timetable
+
+    with _lock:
+        if _timetable is None or _timetable.version != version:
+            _timetable = Timetable.load(version=version)
+        return _timetable
@@ -1,3 +1,19 @@
-from django.shortcuts import render
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import condition, require_GET
 
-# Create your views here.
+from .columnar import get_columnar_schedule
+
+
+def schedule_flights_etag(request, schedule_id):
+    cached = get_columnar_schedule(schedule_id)
+    return cached[1] if cached else None
+
+
+@require_GET
+@condition(etag_func=schedule_flights_etag)
+def schedule_flights(request, schedule_id):
+    """Return every flight of a schedule in one columnar JSON response."""
+    cached = get_columnar_schedule(schedule_id)
+    if cached is None:
+        raise Http404("Schedule not found")
+    return HttpResponse(cached[0], content_type="application/json")
@@ -159,11 +159,12 @@ const BookATripForm = memo(function BookATripForm({
 
   // Memoized function to fetch arrival destinations
   const fetchArrivalsForOrigin = useCallback(
-    async (departureAirport: string) => {
+    async (departureAirport: string, departureDate?: Date) => {
       setIsLoadingArrivals(true);
       try {
         const arrivals = await fetchArrivalDestinationsForOrigin(
-          departureAirport
+          departureAirport,
+          departureDate
         );
         setArrivalAirports(arrivals);
 
@@ -189,12 +190,20 @@ const BookATripForm = memo(function BookATripForm({
     [selectedArrival?.arrivalAirport]
   );
 
-  // When selectedDeparture changes, fetch arrival airports for that origin
+  // When selectedDeparture or the departure date changes, fetch arrival
+  // airports with service from that origin (on that date, once picked)
   useEffect(() => {
     if (selectedDeparture?.departureAirportCode) {
-      fetchArrivalsForOrigin(selectedDeparture.departureAirportCode);
+      fetchArrivalsForOrigin(
+        selectedDeparture.departureAirportCode,
+        dateRange.from
+      );
     }
-  }, [selectedDeparture?.departureAirportCode, fetchArrivalsForOrigin]);
+  }, [
+    selectedDeparture?.departureAirportCode,
+    dateRange.from,
+    fetchArrivalsForOrigin,
+  ]);
 
   // Handle preselected airports when data is loaded
   useEffect(() => {
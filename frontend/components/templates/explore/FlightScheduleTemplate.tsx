@@ -110,13 +110,13 @@ export default function FlightScheduleTemplate({
     
     try {
       // Fetch flights for this schedule (all flights, filtered client-side)
-      const scheduleWithFlights = await fetchScheduleFlights(scheduleId);
+      const flights = await fetchScheduleFlights(scheduleId);
       
-      if (scheduleWithFlights) {
+      if (flights) {
         // Update the schedules array with the loaded flights
         setSchedules(prevSchedules => 
           prevSchedules.map(s => 
-            s.id === scheduleId ? scheduleWithFlights : s
+            s.id === scheduleId ? { ...s, flights } : s
           )
         );
         
@@ -163,11 +163,14 @@ export default function FlightScheduleTemplate({
     filteredSchedules.forEach((schedule) => {
       schedule.flights.forEach((flight) => {
         if (flight.flightScope === scopeType) {
-          const day = flight.day.toLowerCase();
-          if (!flightsByDay[day]) {
-            flightsByDay[day] = [];
-          }
-          flightsByDay[day].push(flight);
+          // A flight may operate on several days, e.g. "Monday, Friday"
+          flight.day.split(",").forEach((dayName) => {
+            const day = dayName.trim().toLowerCase();
+            if (!flightsByDay[day]) {
+              flightsByDay[day] = [];
+            }
+            flightsByDay[day].push(flight);
+          });
         }
       });
     });
@@ -42,14 +42,41 @@ export const GET_ALL_AIRPORTS_QUERY = gql`
 
 // Query to fetch destinations for a given port
 export const GET_DESTINATIONS_FOR_PORT_QUERY = gql`
-  query GetDestinationsForPort($searchQuery: String!) {
-    portPairs(searchQuery: $searchQuery, limit: 100) {
+  query GetDestinationsForPort($origin: String!) {
+    originPortPairs(origin: $origin) {
       destinationPortCode
       destinationPortName
     }
   }
 `;
 
+// Query to fetch destinations with flights from a port in a travel window
+export const GET_AVAILABLE_DESTINATIONS_FOR_PORT_QUERY = gql`
+  query GetAvailableDestinationsForPort(
+    $origin: String!
+    $startDate: Date!
+    $endDate: Date
+  ) {
+    availablePortPairs(
+      origin: $origin
+      startDate: $startDate
+      endDate: $endDate
+    ) {
+      destinationPortCode
+      destinationPortName
+    }
+  }
+`;
+
+/**
+ * Format a date as YYYY-MM-DD in local time, for GraphQL Date arguments
+ */
+function toDateString(date: Date): string {
+  const month = String(date.getMonth() + 1).padStart(2, "0");
+  const day = String(date.getDate()).padStart(2, "0");
+  return `${date.getFullYear()}-${month}-${day}`;
+}
+
 // Cache for airports data to avoid repeated API calls
 let airportsCache: AirportData[] = [];
 let airportsCacheTimestamp: number = 0;
@@ -89,19 +116,32 @@ async function getCachedAirports(): Promise<AirportData[]> {
 /**
  * Function to fetch arrival destinations for a given origin airport
  * @param departureAirport - The departure airport code
+ * @param departureDate - Optional travel date; when set, only destinations
+ * with a flight on that date are returned
  * @returns Promise with an array of arrival airports for the given origin
  */
 export async function fetchArrivalDestinationsForOrigin(
-  departureAirport: string
+  departureAirport: string,
+  departureDate?: Date
 ): Promise<ArrivalAirport[]> {
   try {
-    const { data } = await client.query({
-      query: GET_DESTINATIONS_FOR_PORT_QUERY,
-      variables: { searchQuery: departureAirport },
-      fetchPolicy: "cache-first",
-    });
-
-    const destinations = data.portPairs || [];
+    const { data } = departureDate
+      ? await client.query({
+          query: GET_AVAILABLE_DESTINATIONS_FOR_PORT_QUERY,
+          variables: {
+            origin: departureAirport,
+            startDate: toDateString(departureDate),
+          },
+          fetchPolicy: "cache-first",
+        })
+      : await client.query({
+          query: GET_DESTINATIONS_FOR_PORT_QUERY,
+          variables: { origin: departureAirport },
+          fetchPolicy: "cache-first",
+        });
+
+    const destinations =
+      (departureDate ? data.availablePortPairs : data.originPortPairs) || [];
 
     return destinations
       .map((destination: any) => ({
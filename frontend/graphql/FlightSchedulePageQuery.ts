@@ -1,5 +1,5 @@
 import { gql } from "@apollo/client";
-import client from "@/lib/apolloClient";
+import client, { getGraphQLUrl } from "@/lib/apolloClient";
 
 // Interface for the FlightSchedule query response
 export interface FlightSchedulePage {
@@ -72,33 +72,63 @@ export const GET_SCHEDULES_METADATA_QUERY = gql`
   }
 `;
 
-// Get flights for a specific schedule
-export const GET_SCHEDULE_FLIGHTS_QUERY = gql`
-  query GetScheduleFlights(
-    $scheduleId: ID!
-    $limit: PositiveInt
-    $offset: PositiveInt
-  ) {
-    schedules(id: $scheduleId) {
-      id
-      startDate
-      endDate
-      snippetType
-      contentType
-      flights(limit: $limit, offset: $offset) {
-        id
-        day
-        aircraft
-        flightNumber
-        departurePort
-        arrivalPort
-        departureTime
-        arrivalTime
-        flightScope
-      }
-    }
+// Column-major payload of GET /api/schedules/<id>/flights/. Dictionary
+// columns hold indexes into one of the payload's dictionaries.
+interface ColumnarSchedule {
+  count: number;
+  dictionaries: Record<string, string[]>;
+  columns: Record<string, (string | number | null)[]>;
+}
+
+const DICTIONARY_COLUMNS: Record<string, string> = {
+  day: "days",
+  aircraft: "aircraft",
+  departurePort: "ports",
+  arrivalPort: "ports",
+  flightScope: "flightScopes",
+};
+
+// The REST endpoints live next to the GraphQL one, e.g. /api/graphql/ ->
+// /api/schedules/<id>/flights/
+const GRAPHQL_PATH = /graphql\/?$/;
+
+function getScheduleFlightsUrl(scheduleId: string): string {
+  const graphqlUrl = getGraphQLUrl() || "";
+  if (!GRAPHQL_PATH.test(graphqlUrl)) {
+    throw new Error(
+      `Cannot derive the schedule flights URL from GraphQL URL "${graphqlUrl}"`
+    );
   }
-`;
+  return graphqlUrl.replace(
+    GRAPHQL_PATH,
+    `schedules/${encodeURIComponent(scheduleId)}/flights/`
+  );
+}
+
+function decodeColumnarFlights({
+  count,
+  dictionaries,
+  columns,
+}: ColumnarSchedule): Flight[] {
+  const value = (column: keyof Flight, row: number): string => {
+    const raw = columns[column][row];
+    const dictionary = DICTIONARY_COLUMNS[column];
+    const decoded = dictionary ? dictionaries[dictionary][raw as number] : raw;
+    return decoded == null ? "" : String(decoded);
+  };
+
+  return Array.from({ length: count }, (_, row) => ({
+    id: value("id", row),
+    day: value("day", row),
+    aircraft: value("aircraft", row),
+    flightNumber: value("flightNumber", row),
+    departurePort: value("departurePort", row),
+    arrivalPort: value("arrivalPort", row),
+    departureTime: value("departureTime", row),
+    arrivalTime: value("arrivalTime", row),
+    flightScope: value("flightScope", row),
+  }));
+}
 
 // Legacy query for backward compatibility
 export const GET_SCHEDULES_QUERY = gql`
@@ -139,62 +169,20 @@ export async function fetchSchedulesMetadata(): Promise<ScheduleMetadata[]> {
   }
 }
 
-// Fetch flights for a specific schedule with batching
+// Fetch all flights of a schedule in one request. The response carries an
+// ETag, so revisiting (or prefetching) a schedule only costs a 304.
 export async function fetchScheduleFlights(
   scheduleId: string,
   silent = false // For background prefetching
-): Promise<Schedule | null> {
+): Promise<Flight[] | null> {
   try {
-    const allFlights: Flight[] = [];
-    const batchSize = 100;
-    let offset = 0;
-    let hasMoreData = true;
-    let scheduleData = null;
-
-    while (hasMoreData) {
-      const result = await client.query({
-        query: GET_SCHEDULE_FLIGHTS_QUERY,
-        variables: {
-          scheduleId,
-          limit: batchSize,
-          offset: offset,
-        },
-        fetchPolicy: "cache-first",
-        errorPolicy: silent ? "ignore" : "none", // Ignore errors for background prefetch
-      });
-
-      const schedules = result.data.schedules;
-      const schedule = schedules && schedules.length > 0 ? schedules[0] : null;
-
-      if (!schedule) {
-        hasMoreData = false;
-        break;
-      }
-
-      // Store schedule metadata on first iteration
-      if (!scheduleData) {
-        scheduleData = {
-          id: schedule.id,
-          startDate: schedule.startDate,
-          endDate: schedule.endDate,
-          snippetType: schedule.snippetType,
-          contentType: schedule.contentType,
-          flights: [],
-        };
-      }
-
-      const flights = schedule.flights || [];
-      allFlights.push(...flights);
-
-      // Check if we got fewer results than requested
-      if (flights.length < batchSize) {
-        hasMoreData = false;
-      } else {
-        offset += batchSize;
-      }
+    const response = await fetch(getScheduleFlightsUrl(scheduleId), {
+      cache: "no-cache",
+    });
+    if (!response.ok) {
+      throw new Error(`HTTP ${response.status}`);
     }
-
-    return scheduleData ? { ...scheduleData, flights: allFlights } : null;
+    return decodeColumnarFlights(await response.json());
   } catch (error) {
     if (!silent) {
       console.error(
@@ -7,7 +7,7 @@ import {
 } from "@apollo/client";
 
 // Function to determine the GraphQL URL based on context
-const getGraphQLUrl = () => {
+export const getGraphQLUrl = () => {
   if (typeof window !== "undefined") {
     // Client-side: Use NEXT_PUBLIC_GRAPHQL_URL for browser requests
     return process.env.NEXT_PUBLIC_GRAPHQL_URL;